@@ -350,7 +350,7 @@ class DashboardWindow(QWidget):
             logging.error(f"Failed to retrieve project tags: {str(e)}")
             return []
 
-    def on_data_received(self, feature_name, tag_name, model_name, channel_index, values, sample_rate, frame_index):
+    def on_data_received(self, feature_name, tag_name, model_name, channel_index, values, sample_rate, frame_index, record=None):
         try:
             for key, feature_instance in self.feature_instances.items():
                 instance_feature, instance_model, instance_channel, _ = key
@@ -358,18 +358,17 @@ class DashboardWindow(QWidget):
                     (instance_channel is None or channel_index == -1 or
                      (instance_channel and f"Channel_{channel_index + 1}" == instance_channel))):
                     if hasattr(feature_instance, 'on_data_received'):
-                        QTimer.singleShot(0, lambda: self._update_feature(
-                            instance_feature, instance_model, instance_channel,
-                            feature_instance, tag_name, values, sample_rate, frame_index
+                        QTimer.singleShot(0, lambda f=instance_feature, m=instance_model, c=instance_channel, inst=feature_instance: self._update_feature(
+                            f, m, c, inst, tag_name, values, sample_rate, frame_index, record
                         ))
                         logging.debug(f"Processed data for {feature_name}/{model_name}/channel_{channel_index}, frame {frame_index}")
         except Exception as e:
             logging.error(f"Error in on_data_received for {feature_name}/{model_name}/channel_{channel_index}, frame {frame_index}: {str(e)}")
             self.console.append_to_console(f"Error processing data for {feature_name}: {str(e)}")
 
-    def _update_feature(self, feature_name, model_name, channel, feature_instance, tag_name, values, sample_rate, frame_index):
+    def _update_feature(self, feature_name, model_name, channel, feature_instance, tag_name, values, sample_rate, frame_index, record=None):
         try:
-            feature_instance.on_data_received(tag_name, model_name, values, sample_rate, frame_index)
+            feature_instance.on_data_received(tag_name, model_name, values, sample_rate, frame_index, record)
             logging.debug(f"Updated feature {feature_name}/{model_name}/{channel or 'No Channel'}, frame {frame_index}")
         except Exception as e:
             logging.error(f"Error updating feature {feature_name}/{model_name}/{channel or 'No Channel'}, frame {frame_index}: {str(e)}")
@@ -545,6 +544,7 @@ class DashboardWindow(QWidget):
             feature_instance = self.feature_instances.get(key)
             try:
                 feature_instance.start_saving()
+                self.start_fft_recordings(selected_model, feature_instance.current_filename)
                 self.is_saving = True
                 self.saving_state_changed.emit(True)
                 logging.info("Started saving data from existing TimeViewFeature")
@@ -562,6 +562,7 @@ class DashboardWindow(QWidget):
                 )
                 self.feature_instances[key] = feature_instance
                 feature_instance.start_saving()
+                self.start_fft_recordings(selected_model, feature_instance.current_filename)
                 self.is_saving = True
                 self.saving_state_changed.emit(True)
                 logging.info(f"Created new TimeViewFeature for saving data, key: {key}")
@@ -569,6 +570,14 @@ class DashboardWindow(QWidget):
                 logging.error(f"Failed to create and start saving with new TimeViewFeature: {str(e)}")
                 QMessageBox.warning(self, "Error", f"Failed to start saving: {str(e)}")
 
+    def start_fft_recordings(self, model_name, source_filename):
+        # FFT recordings only reference the Time View frames being saved.
+        if not source_filename:
+            return
+        for key, instance in self.feature_instances.items():
+            if key[0] == "FFT" and key[1] == model_name:
+                instance.start_saving(source_filename)
+
     def stop_saving(self):
         selected_model = self.tree_view.get_selected_model()
         if not selected_model:
@@ -581,6 +590,9 @@ class DashboardWindow(QWidget):
         key = max(time_view_keys, key=lambda k: k[3])
         feature_instance = self.feature_instances.get(key)
         try:
+            for fft_key, fft_instance in self.feature_instances.items():
+                if fft_key[0] == "FFT" and fft_key[1] == selected_model:
+                    fft_instance.stop_saving()
             feature_instance.stop_saving()
             self.is_saving = False
             self.saving_state_changed.emit(False)
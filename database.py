@@ -1,4 +1,4 @@
-from pymongo import MongoClient, ASCENDING
+from pymongo import MongoClient, ASCENDING, ReplaceOne, UpdateOne
 from bson.objectid import ObjectId
 import datetime
 import logging
@@ -18,6 +18,9 @@ class Database:
         self.timeview_collection = None
         self.tabularview_collection = None
         self.fftsettings_collection = None
+        self.fft_recordings_collection = None
+        self.spectrogram_tiles_collection = None
+        self.rollups_collection = None
         self.projects = []
         self.connect()
 
@@ -31,6 +34,9 @@ class Database:
             self.timeview_collection = self.db["timeview_messages"]
             self.tabularview_collection = self.db["TabularViewSettings"]
             self.fftsettings_collection = self.db["FFTSettings"]
+            self.fft_recordings_collection = self.db["fft_recordings"]
+            self.spectrogram_tiles_collection = self.db["spectrogram_tiles"]
+            self.rollups_collection = self.db["overall_rollups"]
             self._create_timeview_indexes()
             logging.info(f"Database initialized for {self.email}")
         except Exception as e:
@@ -65,6 +71,22 @@ class Database:
             logging.info("Indexes created for timeview_messages collection")
         except Exception as e:
             logging.error(f"Failed to create indexes for timeview_messages: {str(e)}")
+        try:
+            self.spectrogram_tiles_collection.create_index([
+                ("project_name", ASCENDING), ("model_name", ASCENDING), ("filename", ASCENDING),
+                ("level", ASCENDING), ("frameStart", ASCENDING)
+            ])
+            logging.info("Indexes created for spectrogram_tiles collection")
+        except Exception as e:
+            logging.error(f"Failed to create indexes for spectrogram_tiles: {str(e)}")
+        try:
+            self.rollups_collection.create_index([
+                ("project_name", ASCENDING), ("model_name", ASCENDING), ("email", ASCENDING),
+                ("interval", ASCENDING), ("bucket", ASCENDING)
+            ], unique=True)
+            logging.info("Indexes created for overall_rollups collection")
+        except Exception as e:
+            logging.error(f"Failed to create indexes for overall_rollups: {str(e)}")
 
     def close_connection(self):
         if self.client:
@@ -77,6 +99,9 @@ class Database:
                 self.timeview_collection = None
                 self.tabularview_collection = None
                 self.fftsettings_collection = None
+                self.fft_recordings_collection = None
+                self.spectrogram_tiles_collection = None
+                self.rollups_collection = None
                 logging.info("MongoDB connection closed")
             except Exception as e:
                 logging.error(f"Error closing MongoDB connection: {str(e)}")
@@ -314,6 +339,10 @@ class Database:
                     {"project_name": old_project_name, "email": self.email},
                     {"$set": {"project_name": new_project_name, "updatedAt": datetime.datetime.utcnow()}}
                 )
+                self.rollups_collection.update_many(
+                    {"project_name": old_project_name, "email": self.email},
+                    {"$set": {"project_name": new_project_name}}
+                )
                 if old_project_name in self.projects:
                     self.projects[self.projects.index(old_project_name)] = new_project_name
                 logging.info(f"Project renamed from '{old_project_name}' to '{new_project_name}'")
@@ -375,6 +404,7 @@ class Database:
             self.timeview_collection.delete_many({"project_name": project_name, "email": self.email})
             self.tabularview_collection.delete_many({"project_name": project_name, "email": self.email})
             self.fftsettings_collection.delete_many({"project_name": project_name, "email": self.email})
+            self.rollups_collection.delete_many({"project_name": project_name, "email": self.email})
             if project_name in self.projects:
                 self.projects.remove(project_name)
             logging.info(f"Project '{project_name}' deleted")
@@ -643,6 +673,204 @@ class Database:
             logging.error(f"Error fetching timeview messages: {str(e)}")
             return []
 
+    def get_timeview_frames(self, project_name, model_name, filename, frame_start=None, frame_end=None, topic=None, limit=None):
+        query = {"project_name": project_name, "email": self.email, "model_name": model_name, "filename": filename}
+        if topic:
+            query["topic"] = topic
+        if frame_start is not None or frame_end is not None:
+            query["frameIndex"] = {}
+            if frame_start is not None:
+                query["frameIndex"]["$gte"] = frame_start
+            if frame_end is not None:
+                query["frameIndex"]["$lte"] = frame_end
+        try:
+            cursor = self.timeview_collection.find(query).sort("frameIndex", 1)
+            if limit:
+                cursor = cursor.limit(limit)
+            frames = list(cursor)
+            logging.debug(f"Retrieved {len(frames)} timeview frames for {filename} ({frame_start}-{frame_end})")
+            return frames
+        except Exception as e:
+            logging.error(f"Error fetching timeview frames: {str(e)}")
+            return []
+
+    def get_timeview_time_span(self, project_name, model_name, filename):
+        """Summary of a recording without loading any payload.
+
+        Returns a dict with the first/last ``createdAt`` (``start``/``end``), the
+        frame count and the first frame's samplingRate, samplingSize and
+        numberOfChannels, or None.
+        """
+        query = {"project_name": project_name, "email": self.email, "model_name": model_name, "filename": filename}
+        pipeline = [
+            {"$match": query},
+            {"$group": {"_id": None, "start": {"$min": "$createdAt"}, "end": {"$max": "$createdAt"}, "frames": {"$sum": 1},
+                        "samplingRate": {"$first": "$samplingRate"}, "samplingSize": {"$first": "$samplingSize"},
+                        "numberOfChannels": {"$first": "$numberOfChannels"}}},
+        ]
+        try:
+            result = next(self.timeview_collection.aggregate(pipeline), None)
+            if not result:
+                return None
+            result.pop("_id", None)
+            return result
+        except Exception as e:
+            logging.error(f"Error fetching time span for {filename}: {str(e)}")
+            return None
+
+    def save_fft_recording(self, project_name, model_name, recording):
+        if not self.get_project_data(project_name):
+            logging.error(f"Project {project_name} not found!")
+            return False, "Project not found!"
+        recording["project_name"] = project_name
+        recording["model_name"] = model_name
+        recording["email"] = self.email
+        recording.setdefault("createdAt", datetime.datetime.utcnow())
+        try:
+            result = self.fft_recordings_collection.update_one(
+                {"project_name": project_name, "model_name": model_name, "email": self.email, "filename": recording["filename"]},
+                {"$set": recording},
+                upsert=True
+            )
+            logging.info(f"Saved FFT recording {recording['filename']} for {project_name}/{model_name}")
+            return True, result.upserted_id
+        except Exception as e:
+            logging.error(f"Error saving FFT recording: {str(e)}")
+            return False, f"Failed to save FFT recording: {str(e)}"
+
+    def get_fft_recordings(self, project_name, model_name=None, filename=None):
+        query = {"project_name": project_name, "email": self.email}
+        if model_name:
+            query["model_name"] = model_name
+        if filename:
+            query["filename"] = filename
+        try:
+            return list(self.fft_recordings_collection.find(query).sort("createdAt", 1))
+        except Exception as e:
+            logging.error(f"Error fetching FFT recordings: {str(e)}")
+            return []
+
+    def save_spectrogram_tiles(self, project_name, model_name, filename, tiles):
+        if not tiles:
+            return True, "No tiles to save"
+        requests = []
+        for tile in tiles:
+            tile["project_name"] = project_name
+            tile["model_name"] = model_name
+            tile["email"] = self.email
+            tile["filename"] = filename
+            tile.setdefault("createdAt", datetime.datetime.utcnow())
+            key = {"project_name": project_name, "model_name": model_name, "email": self.email,
+                   "filename": filename, "level": tile["level"], "tileIndex": tile["tileIndex"]}
+            requests.append(ReplaceOne(key, tile, upsert=True))
+        try:
+            self.spectrogram_tiles_collection.bulk_write(requests, ordered=False)
+            logging.debug(f"Saved {len(tiles)} spectrogram tiles for {filename} in {project_name}/{model_name}")
+            return True, f"Saved {len(tiles)} spectrogram tiles"
+        except Exception as e:
+            logging.error(f"Error saving spectrogram tiles: {str(e)}")
+            return False, f"Failed to save spectrogram tiles: {str(e)}"
+
+    def get_spectrogram_tiles(self, project_name, model_name, filename, level, frame_start=None, frame_end=None):
+        query = {"project_name": project_name, "model_name": model_name, "email": self.email,
+                 "filename": filename, "level": level}
+        if frame_end is not None:
+            query["frameStart"] = {"$lte": frame_end}
+        if frame_start is not None:
+            query["frameEnd"] = {"$gte": frame_start}
+        try:
+            return list(self.spectrogram_tiles_collection.find(query).sort("frameStart", 1))
+        except Exception as e:
+            logging.error(f"Error fetching spectrogram tiles: {str(e)}")
+            return []
+
+    def get_spectrogram_tile_span(self, project_name, model_name, filename):
+        """Return (frame_start, frame_end) covered by a recording's finest tiles, or None."""
+        query = {"project_name": project_name, "model_name": model_name, "email": self.email, "filename": filename}
+        try:
+            first = self.spectrogram_tiles_collection.find_one(query, {"frameStart": 1}, sort=[("frameStart", 1)])
+            last = self.spectrogram_tiles_collection.find_one(query, {"frameEnd": 1}, sort=[("frameEnd", -1)])
+            if not first or not last:
+                return None
+            return first["frameStart"], last["frameEnd"]
+        except Exception as e:
+            logging.error(f"Error fetching spectrogram tile span: {str(e)}")
+            return None
+
+    def get_spectrogram_tile_progress(self, project_name, model_name, level, lines):
+        """How far each recording of a model has been tiled.
+
+        Returns {filename: {"frameEnd": last tiled frame, "complete": [tileIndex, frameEnd]
+        of the last full ``lines``-line tile at ``level``, or None}}.
+        """
+        query = {"project_name": project_name, "model_name": model_name, "email": self.email}
+        full_tile = {"$and": [{"$eq": ["$level", level]}, {"$eq": ["$lines", lines]}]}
+        pipeline = [
+            {"$match": query},
+            {"$group": {"_id": "$filename", "frameEnd": {"$max": "$frameEnd"},
+                        "complete": {"$max": {"$cond": [full_tile, ["$tileIndex", "$frameEnd"], None]}}}},
+        ]
+        try:
+            return {doc["_id"]: {"frameEnd": doc["frameEnd"], "complete": doc.get("complete")}
+                    for doc in self.spectrogram_tiles_collection.aggregate(pipeline)}
+        except Exception as e:
+            logging.error(f"Error fetching spectrogram tile progress: {str(e)}")
+            return {}
+
+    def get_timeview_last_frame_index(self, project_name, model_name, filename):
+        query = {"project_name": project_name, "email": self.email, "model_name": model_name, "filename": filename}
+        try:
+            last = self.timeview_collection.find_one(query, {"frameIndex": 1}, sort=[("frameIndex", -1)])
+            return last["frameIndex"] if last else None
+        except Exception as e:
+            logging.error(f"Error fetching last frame index for {filename}: {str(e)}")
+            return None
+
+    def get_tiled_filenames(self, project_name, model_name=None):
+        query = {"project_name": project_name, "email": self.email}
+        if model_name:
+            query["model_name"] = model_name
+        try:
+            return self.spectrogram_tiles_collection.distinct("filename", query)
+        except Exception as e:
+            logging.error(f"Error fetching tiled filenames: {str(e)}")
+            return []
+
+    def save_rollups(self, project_name, model_name, rollups):
+        """Merge RollupRecorder output into the per-minute/per-hour rollup buckets."""
+        if not rollups:
+            return True, "No rollups to save"
+        requests = []
+        for rollup in rollups:
+            key = {"project_name": project_name, "model_name": model_name, "email": self.email,
+                   "interval": rollup["interval"], "bucket": rollup["bucket"]}
+            update = {op: rollup[op] for op in ("$min", "$max", "$inc") if rollup[op]}
+            update["$set"] = {"channels": rollup["channels"]}
+            requests.append(UpdateOne(key, update, upsert=True))
+        try:
+            self.rollups_collection.bulk_write(requests, ordered=False)
+            logging.debug(f"Saved {len(rollups)} rollups for {project_name}/{model_name}")
+            return True, f"Saved {len(rollups)} rollups"
+        except Exception as e:
+            logging.error(f"Error saving rollups: {str(e)}")
+            return False, f"Failed to save rollups: {str(e)}"
+
+    def get_rollups(self, project_name, model_name, interval, start, end, channel=None):
+        """Rollup buckets of one interval between two UTC datetimes, oldest first.
+
+        With ``channel`` only that channel's metrics (plus count and RPM) are returned.
+        """
+        query = {"project_name": project_name, "model_name": model_name, "email": self.email,
+                 "interval": interval, "bucket": {"$gte": start, "$lte": end}}
+        projection = None
+        if channel is not None:
+            projection = {"_id": 0, "bucket": 1, "count": 1, "rpm": 1, f"c{channel}": 1}
+        try:
+            return list(self.rollups_collection.find(query, projection).sort("bucket", 1))
+        except Exception as e:
+            logging.error(f"Error fetching rollups: {str(e)}")
+            return []
+
     def get_distinct_filenames(self, project_name, model_name=None):
         if not self.get_project_data(project_name):
             logging.error(f"Project {project_name} not found!")
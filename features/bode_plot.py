@@ -1,14 +1,106 @@
 import numpy as np
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QProgressBar
-from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QPushButton
+from PyQt5.QtCore import QTimer, QThread, QObject, pyqtSignal
 import pyqtgraph as pg
-from pymongo import MongoClient
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 import logging
+import os
 from datetime import datetime
 import math
+from processing.harmonics import revolution_vectors, batch_revolution_vectors, SpeedBinnedAccumulator
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
+class BodeHistoryWorker(QObject):
+    progress = pyqtSignal(int)
+    revolutions = pyqtSignal(object, object, list)
+    finished = pyqtSignal(int, int)
+    error = pyqtSignal(str)
+
+    def __init__(self, db, query, channel_indices, channel_names, scaling_factor, batch_frames=25, max_workers=None):
+        super().__init__()
+        self.db = db
+        self.query = query
+        self.channel_indices = list(channel_indices)
+        self.channel_names = list(channel_names)
+        self.scaling_factor = scaling_factor
+        self.batch_frames = batch_frames
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def projection(self):
+        # Only the channels being plotted and the two tacho blocks leave the server.
+        projection = {"_id": 0, "frameIndex": 1, "message.tacho_freq": 1, "message.tacho_trigger": 1}
+        if len(self.channel_indices) == 1:
+            projection["message.channel_data"] = {"$slice": [self.channel_indices[0], 1]}
+        else:
+            projection["message.channel_data"] = 1
+        return projection
+
+    def frame_arrays(self, document):
+        message = document.get("message") or {}
+        channel_data = message.get("channel_data") or []
+        local_indices = [0] if len(self.channel_indices) == 1 else self.channel_indices
+        if not channel_data or max(local_indices) >= len(channel_data) or not message.get("tacho_trigger"):
+            return None
+        data = np.asarray([channel_data[i] for i in local_indices], dtype=np.float64) * self.scaling_factor
+        frequency = np.asarray(message.get("tacho_freq") or np.zeros(data.shape[1]), dtype=np.float64)
+        return data, frequency, np.asarray(message["tacho_trigger"], dtype=np.float64)
+
+    def emit_results(self, futures):
+        for future in futures:
+            frequencies, phasors = future.result()
+            if len(frequencies):
+                self.revolutions.emit(frequencies, phasors[:, 0, :], self.channel_names)
+
+    def run(self):
+        processed = 0
+        total = 0
+        try:
+            collection = self.db.timeview_collection
+            total = collection.count_documents(self.query)
+            if total == 0:
+                return
+            max_in_flight = self.max_workers * 2
+            executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            try:
+                pending = set()
+                batch = []
+                cursor = collection.find(self.query, self.projection(), batch_size=self.batch_frames * 4).sort("frameIndex", 1)
+                for document in cursor:
+                    if self.cancelled:
+                        break
+                    frame = self.frame_arrays(document)
+                    processed += 1
+                    if frame is not None:
+                        batch.append(frame)
+                    if len(batch) >= self.batch_frames:
+                        pending.add(executor.submit(batch_revolution_vectors, batch))
+                        batch = []
+                        self.progress.emit(int(processed * 100 / total))
+                    if len(pending) >= max_in_flight:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        self.emit_results(done)
+                cursor.close()
+                if batch and not self.cancelled:
+                    pending.add(executor.submit(batch_revolution_vectors, batch))
+                while pending and not self.cancelled:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self.emit_results(done)
+            finally:
+                # A cancelled run drops its queued batches and does not wait for the ones in flight.
+                executor.shutdown(wait=not self.cancelled, cancel_futures=True)
+            if not self.cancelled:
+                self.progress.emit(100)
+        except Exception as e:
+            self.error.emit(f"Error processing historical data: {str(e)}")
+        finally:
+            self.finished.emit(processed, total)
+
+
 class BodePlotFeature:
     def __init__(self, parent, db, project_name, channel=None, model_name=None, console=None):
         self.parent = parent
@@ -20,7 +112,12 @@ class BodePlotFeature:
         self.widget = None
         self.plot_widgets = {}  # Dictionary to store plot widgets per channel
         self.plots = {}  # Dictionary to store plot items per channel
-        self.data = {}  # Dictionary to store frequencies, amplitudes, phases per channel
+        self.data = {}  # Speed-binned 1X accumulators per channel
+        self.speed_bin_width = 0.01
+        self.history_worker = None
+        self.history_thread = None
+        self.history_threads = []  # Every history thread still running, cancelled ones included
+        self.smoothing_window = 7
         self.tag_name = None
         self.channel_names = []
         self.channel_indices = {}  # Map channel names to indices
@@ -58,11 +155,7 @@ class BodePlotFeature:
                 return
             # Initialize data storage for each channel
             for ch_name in self.channel_names:
-                self.data[ch_name] = {
-                    'frequencies': [],
-                    'amplitudes': [],
-                    'phases': []
-                }
+                self.data[ch_name] = SpeedBinnedAccumulator(self.speed_bin_width)
             self.log_info(f"Initialized BodePlotFeature for Model: {self.model_name}, Tag: {self.tag_name}, Channels: {self.channel_names}")
             # Set initial selected channel if provided
             if self.selected_channel and self.selected_channel in self.channel_names:
@@ -84,9 +177,27 @@ class BodePlotFeature:
         main_layout.addWidget(header_label)
 
         # Progress bar for historical data processing
+        progress_layout = QHBoxLayout()
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
-        main_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.progress_bar)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setStyleSheet("""
+            QPushButton {
+                background-color: #f44336;
+                color: white;
+                border: none;
+                padding: 6px 12px;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #e53935;
+            }
+        """)
+        self.cancel_button.setVisible(False)
+        self.cancel_button.clicked.connect(self.on_cancel_clicked)
+        progress_layout.addWidget(self.cancel_button)
+        main_layout.addLayout(progress_layout)
 
         # Plot container widget
         self.plot_container = QWidget()
@@ -185,7 +296,7 @@ class BodePlotFeature:
         self.error_label.setText(message)
         self.error_label.setVisible(True)
 
-    def on_data_received(self, tag_name, model_name, values, sample_rate):
+    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index=None, record=None):
         if self.model_name != model_name or self.tag_name != tag_name:
             self.log_info(f"Ignoring data for tag: {tag_name}, model: {model_name}")
             return
@@ -195,7 +306,7 @@ class BodePlotFeature:
             # Fallback synthetic data for testing
             if not values or not values[0]:
                 self.log_info("No valid data received; generating synthetic data for testing")
-                values = [[np.sin(np.linspace(0, 10, 1000)) + i for i in range(len(self.channel_names))]]
+                values = [np.sin(np.linspace(0, 10, 1000)) + i for i in range(len(self.channel_names))]
                 values.append([100.0 + i * 0.1 for i in range(1000)])  # Frequency data
                 values.append([1 if i % 100 == 0 else 0 for i in range(1000)])  # Trigger data
                 self.log_info(f"Synthetic data: {len(values)} channels, first channel length: {len(values[0])}")
@@ -212,137 +323,33 @@ class BodePlotFeature:
             trigger_data = values[expected_channels + 1] if len(values) > expected_channels + 1 else [1 if i % 100 == 0 else 0 for i in range(len(main_data[0]))]
             self.log_info(f"Main data channels: {len(main_data)}, Freq data length: {len(freq_data)}, Trigger data length: {len(trigger_data)}")
 
-            # Process only the selected channel if set, otherwise process all
-            if self.selected_channel:
-                ch_idx = self.channel_indices.get(self.selected_channel)
-                if ch_idx is not None:
-                    channel_data = [float(v) * self.scaling_factor for v in main_data[ch_idx]]
-                    self.process_data(channel_data, freq_data, trigger_data, self.selected_channel)
-                else:
-                    self.log_error(f"Invalid channel index for {self.selected_channel}")
-            else:
-                for ch_idx, ch_name in enumerate(self.channel_names):
-                    channel_data = [float(v) * self.scaling_factor for v in main_data[ch_idx]]
-                    self.process_data(channel_data, freq_data, trigger_data, ch_name)
+            main_data = np.asarray(main_data, dtype=np.float64) * self.scaling_factor
+            tacho = record.tacho if record is not None else None
+            bounds = tacho.bounds if tacho is not None and tacho.length == main_data.shape[1] else None
+            self.process_data(main_data, freq_data, trigger_data, self.channel_names, bounds)
 
             self.update_plots()
         except Exception as e:
             self.log_error(f"Error processing data: {str(e)}")
 
-    def process_data(self, channel_data, frequency_data, trigger_data, channel_name):
+    def process_data(self, channel_data, frequency_data, trigger_data, channel_names, bounds=None):
+        """Add every revolution's 1X vector of each channel in ``channel_data`` (channels x samples, volts)."""
         try:
-            # Validate inputs with relaxed checks
-            if not channel_data:
-                self.log_error(f"Empty channel data for {channel_name}")
+            channel_data = np.atleast_2d(np.asarray(channel_data, dtype=np.float64))
+            if channel_data.size == 0:
+                self.log_error(f"Empty channel data for {channel_names}")
                 return
-            if len(channel_data) != len(frequency_data) or len(channel_data) != len(trigger_data):
-                min_length = min(len(channel_data), len(frequency_data), len(trigger_data))
-                channel_data = channel_data[:min_length]
-                frequency_data = frequency_data[:min_length]
-                trigger_data = trigger_data[:min_length]
-                self.log_info(f"Truncated arrays to length {min_length} for {channel_name}")
-
-            # Log sample data
-            self.log_info(f"Sample channel data for {channel_name}: {channel_data[:5]}")
-            self.log_info(f"Sample frequency data for {channel_name}: {frequency_data[:5]}")
-            self.log_info(f"Sample trigger data for {channel_name}: {trigger_data[:5]}")
-
-            # Find trigger indices
-            trigger_indices = [i for i, v in enumerate(trigger_data) if v == 1]
-            min_distance = 5
-            filtered_triggers = [trigger_indices[0]] if trigger_indices else []
-            for idx in trigger_indices[1:]:
-                if idx - filtered_triggers[-1] >= min_distance:
-                    filtered_triggers.append(idx)
-            trigger_indices = filtered_triggers
-
-            # Relaxed trigger requirement: allow plotting with at least one segment
-            if len(trigger_indices) < 1:
-                self.log_info(f"No trigger points for {channel_name}; using entire data as one segment")
-                trigger_indices = [0, len(channel_data)]
-
-            # Process trigger segments
-            temp_freq = []
-            temp_amp = []
-            temp_phase = []
-            for i in range(len(trigger_indices) - 1):
-                start_idx = trigger_indices[i]
-                end_idx = trigger_indices[i + 1]
-                segment_length = end_idx - start_idx
-                if segment_length <= 0 or start_idx < 0 or end_idx > len(channel_data):
-                    self.log_info(f"Skipping invalid segment for {channel_name}: start={start_idx}, end={end_idx}")
-                    continue
-
-                # Calculate DFT components
-                sine_sum = 0.0
-                cosine_sum = 0.0
-                N = segment_length
-                for n in range(segment_length):
-                    theta = (2 * np.pi * n) / N
-                    sine_sum += channel_data[start_idx + n] * np.sin(theta)
-                    cosine_sum += channel_data[start_idx + n] * np.cos(theta)
-                sine_component = sine_sum / N
-                cosine_component = cosine_sum / N
-                amplitude = np.sqrt(sine_component**2 + cosine_component**2) * 4
-                phase = np.arctan2(cosine_component, sine_component) * (180.0 / np.pi)
-                if phase < 0:
-                    phase += 360
-
-                # Average frequency for segment
-                count = min(end_idx - start_idx, len(frequency_data) - start_idx)
-                frequency = np.mean(frequency_data[start_idx:start_idx + count]) if count > 0 else 0.0
-                if count <= 0:
-                    self.log_info(f"No valid frequency data for segment in {channel_name}")
-                    continue
-
-                if not (np.isnan(amplitude) or np.isinf(amplitude) or np.isnan(phase) or np.isinf(phase) or np.isnan(frequency) or np.isinf(frequency)):
-                    temp_freq.append(frequency)
-                    temp_amp.append(amplitude)
-                    temp_phase.append(phase)
-
-            # Group by frequency and average
-            if temp_freq:
-                freq_groups = {}
-                for f, a, p in zip(temp_freq, temp_amp, temp_phase):
-                    freq_key = round(f, 2)
-                    if freq_key not in freq_groups:
-                        freq_groups[freq_key] = []
-                    freq_groups[freq_key].append((a, p))
-
-                sorted_data = []
-                for freq_key in sorted(freq_groups.keys()):
-                    amps, phases = zip(*freq_groups[freq_key])
-                    sorted_data.append({
-                        'f': freq_key,
-                        'a': np.mean(amps),
-                        'p': np.mean(phases)
-                    })
-
-                # Apply moving average (window size 7)
-                window_size = 7
-                smoothed_freq = []
-                smoothed_amp = []
-                smoothed_phase = []
-                for i in range(len(sorted_data)):
-                    start_idx = max(0, i - window_size // 2)
-                    end_idx = min(len(sorted_data), i + window_size // 2 + 1)
-                    window = sorted_data[start_idx:end_idx]
-                    avg_freq = np.mean([x['f'] for x in window])
-                    avg_amp = np.mean([x['a'] for x in window])
-                    avg_phase = np.mean([x['p'] for x in window])
-                    smoothed_freq.append(avg_freq)
-                    smoothed_amp.append(avg_amp)
-                    smoothed_phase.append(avg_phase)
-
-                # Update data for channel
-                self.data[channel_name]['frequencies'] = smoothed_freq
-                self.data[channel_name]['amplitudes'] = smoothed_amp
-                self.data[channel_name]['phases'] = smoothed_phase
-                self.log_info(f"Processed {len(smoothed_freq)} data points for {channel_name}: freq={smoothed_freq[:5]}, amp={smoothed_amp[:5]}, phase={smoothed_phase[:5]}")
-            else:
-                self.log_info(f"No valid data points processed for {channel_name}")
+            frequencies, phasors = revolution_vectors(channel_data, frequency_data, trigger_data, (1,), bounds)
+            self.add_revolutions(frequencies, phasors[:, 0, :], channel_names)
+            self.log_info(f"Processed {len(frequencies)} revolutions for {len(channel_names)} channels")
         except Exception as e:
-            self.log_error(f"Error processing data for {channel_name}: {str(e)}")
+            self.log_error(f"Error processing data for {channel_names}: {str(e)}")
+
+    def add_revolutions(self, frequencies, phasors, channel_names):
+        # Bode amplitude is peak-to-peak: twice the 0-peak phasor magnitude.
+        for ch_idx, ch_name in enumerate(channel_names):
+            if ch_name in self.data:
+                self.data[ch_name].add(frequencies, 2.0 * phasors[ch_idx])
 
     def update_plots(self):
         try:
@@ -356,9 +363,7 @@ class BodePlotFeature:
                 return
 
             ch_name = self.selected_channel
-            freq = np.array(self.data[ch_name]['frequencies'], dtype=float)
-            amp = np.array(self.data[ch_name]['amplitudes'], dtype=float)
-            phase = np.array(self.data[ch_name]['phases'], dtype=float)
+            freq, amp, phase = self.data[ch_name].curve(self.smoothing_window)
             self.log_info(f"Updating plots for {ch_name}: {len(freq)} data points, freq={freq[:5].tolist()}, amp={amp[:5].tolist()}, phase={phase[:5].tolist()}")
 
             # Ensure plot widget is visible
@@ -406,117 +411,101 @@ class BodePlotFeature:
             self.error_label.setText(f"Plotting error for {ch_name}: {str(e)}")
             self.error_label.setVisible(True)
 
-    def process_historical_data(self, filename, frame_index):
+    def process_historical_data(self, filename, frame_index=None):
         try:
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(0)
-            client = MongoClient("mongodb://localhost:27017")
-            database = client["changed_db"]
-            history_collection = database["timeview_messages"]
-
-            # Get total frames
+            self.cancel_historical_data()
+            if self.selected_channel:
+                channel_names = [self.selected_channel]
+            else:
+                channel_names = list(self.channel_names)
+            channel_indices = [self.channel_indices[name] for name in channel_names if name in self.channel_indices]
+            if not channel_indices:
+                self.log_error(f"No channels to process for filename: {filename}")
+                return
+            for ch_name in channel_names:
+                self.data[ch_name].clear()
             query = {
                 "project_name": self.project_name,
                 "model_name": self.model_name,
+                "email": self.db.email,
                 "topic": self.tag_name,
                 "filename": filename
             }
-            total_frames = history_collection.count_documents(query)
-            self.log_info(f"Found {total_frames} frames for filename: {filename}")
-
-            if total_frames == 0:
-                self.log_error(f"No historical data found for filename: {filename}")
-                self.progress_bar.setVisible(False)
-                return
-
-            # Initialize data storage for selected channel or all channels
-            if self.selected_channel:
-                self.data[self.selected_channel] = {'frequencies': [], 'amplitudes': [], 'phases': []}
-            else:
-                for ch_name in self.channel_names:
-                    self.data[ch_name] = {'frequencies': [], 'amplitudes': [], 'phases': []}
-
-            # Process in batches
-            max_frames = 1500
-            batch_size = 50
-            sampling_interval = max(1, total_frames // max_frames)
-            processed_count = 0
-            cursor = history_collection.find(query).sort("frameIndex", 1)
-
-            for history_data in cursor:
-                if processed_count % sampling_interval != 0:
-                    processed_count += 1
-                    continue
-                if not self.is_valid_history_data(history_data):
-                    processed_count += 1
-                    continue
-
-                main_channels = history_data.get("numberOfChannels", 0)
-                samples_per_channel = history_data.get("samplingRate", 0)
-                taco_channels = history_data.get("tacoChannelCount", 0)
-                freq_start_idx = main_channels * samples_per_channel
-                trigger_start_idx = freq_start_idx + samples_per_channel
-
-                if self.selected_channel:
-                    ch_idx = self.channel_indices.get(self.selected_channel)
-                    if ch_idx is not None and ch_idx < main_channels:
-                        channel_data = [history_data["message"][i * main_channels + ch_idx] * self.scaling_factor
-                                       for i in range(samples_per_channel)]
-                        freq_data = [history_data["message"][freq_start_idx + i]
-                                     for i in range(samples_per_channel) if freq_start_idx + i < len(history_data["message"])]
-                        trigger_data = [history_data["message"][trigger_start_idx + i]
-                                        for i in range(samples_per_channel) if trigger_start_idx + i < len(history_data["message"])]
-                        self.log_info(f"Processing historical data for {self.selected_channel}: {len(channel_data)} samples")
-                        self.process_data(channel_data, freq_data, trigger_data, self.selected_channel)
-                    else:
-                        self.log_error(f"Invalid channel index {ch_idx} for {self.selected_channel}")
-                else:
-                    for ch_idx, ch_name in enumerate(self.channel_names):
-                        if ch_idx >= main_channels:
-                            continue
-                        channel_data = [history_data["message"][i * main_channels + ch_idx] * self.scaling_factor
-                                       for i in range(samples_per_channel)]
-                        freq_data = [history_data["message"][freq_start_idx + i]
-                                     for i in range(samples_per_channel) if freq_start_idx + i < len(history_data["message"])]
-                        trigger_data = [history_data["message"][trigger_start_idx + i]
-                                        for i in range(samples_per_channel) if trigger_start_idx + i < len(history_data["message"])]
-                        self.log_info(f"Processing historical data for {ch_name}: {len(channel_data)} samples")
-                        self.process_data(channel_data, freq_data, trigger_data, ch_name)
-
-                processed_count += 1
-                self.progress_bar.setValue(int((processed_count / total_frames) * 100))
-                if processed_count % batch_size == 0:
-                    self.update_plots()
-
-            self.update_plots()
-            self.progress_bar.setVisible(False)
-            self.log_info(f"Processed {processed_count}/{total_frames} frames for {filename}")
-            client.close()
+            self.progress_bar.setValue(0)
+            self.progress_bar.setVisible(True)
+            self.cancel_button.setVisible(True)
+            # Signals still queued from a cancelled worker are told apart by comparing the worker.
+            self.history_worker = worker = BodeHistoryWorker(self.db, query, channel_indices, channel_names, self.scaling_factor)
+            self.history_thread = thread = QThread()
+            self.history_threads.append(thread)
+            worker.moveToThread(thread)
+            thread.started.connect(worker.run)
+            worker.revolutions.connect(lambda frequencies, phasors, names, worker=worker: self.on_historical_revolutions(worker, frequencies, phasors, names))
+            worker.progress.connect(lambda value, worker=worker: self.on_historical_progress(worker, value))
+            worker.error.connect(self.log_error)
+            worker.finished.connect(lambda processed, total, name=filename, worker=worker: self.on_historical_data_finished(worker, name, processed, total))
+            worker.finished.connect(thread.quit)
+            worker.finished.connect(worker.deleteLater)
+            thread.finished.connect(lambda thread=thread: self.on_history_thread_finished(thread))
+            thread.finished.connect(thread.deleteLater)
+            thread.start()
+            self.log_info(f"Started historical Bode processing for filename: {filename}")
         except Exception as e:
             self.log_error(f"Error processing historical data: {str(e)}")
             self.progress_bar.setVisible(False)
-
-    def is_valid_history_data(self, history_data):
-        try:
-            main_channels = history_data.get("numberOfChannels", 0)
-            samples_per_channel = history_data.get("samplingRate", 0)
-            taco_channels = history_data.get("tacoChannelCount", 0)
-            message = history_data.get("message", [])
-            valid = (main_channels > 0 and
-                     samples_per_channel > 0 and
-                     len(message) >= (main_channels + taco_channels) * samples_per_channel)
-            if not valid:
-                self.log_error(f"Invalid history data: channels={main_channels}, samples={samples_per_channel}, message_len={len(message)}")
-            return valid
-        except Exception as e:
-            self.log_error(f"Error validating history data: {str(e)}")
-            return False
+            self.cancel_button.setVisible(False)
+
+    def cancel_historical_data(self, wait=False):
+        """Abandon the current history run without blocking; its thread winds down on its own.
+
+        With ``wait`` every history thread is stopped before returning, for ``cleanup``.
+        """
+        if self.history_worker is not None:
+            self.history_worker.cancel()
+        self.history_worker = None
+        if wait:
+            for thread in self.history_threads:
+                thread.quit()
+                thread.wait()
+
+    def on_cancel_clicked(self):
+        self.cancel_historical_data()
+        self.progress_bar.setVisible(False)
+        self.cancel_button.setVisible(False)
+        self.log_info("Cancelled historical Bode processing")
+
+    def on_historical_revolutions(self, worker, frequencies, phasors, channel_names):
+        if worker is self.history_worker:
+            self.add_revolutions(frequencies, phasors, channel_names)
+
+    def on_historical_progress(self, worker, value):
+        if worker is self.history_worker:
+            self.progress_bar.setValue(value)
+
+    def on_history_thread_finished(self, thread):
+        if thread in self.history_threads:
+            self.history_threads.remove(thread)
+        if thread is self.history_thread:
+            self.history_thread = None
+
+    def on_historical_data_finished(self, worker, filename, processed, total):
+        if worker is not self.history_worker:
+            return  # A cancelled run
+        self.history_worker = None
+        self.progress_bar.setVisible(False)
+        self.cancel_button.setVisible(False)
+        self.update_plots()
+        if total == 0:
+            self.log_error(f"No historical data found for filename: {filename}")
+        else:
+            self.log_info(f"Processed {processed}/{total} frames for {filename}")
 
     def get_widget(self):
         return self.widget
 
     def cleanup(self):
         self.update_timer.stop()
+        self.cancel_historical_data(wait=True)
         for ch_name in self.channel_names:
             self.data[ch_name].clear()
         self.plots.clear()
@@ -3,6 +3,7 @@ from PyQt5.QtCore import QTimer, Qt
 import pyqtgraph as pg
 import numpy as np
 import logging
+from processing.ring_buffer import RingBuffer
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -17,8 +18,10 @@ class CenterLineFeature:
         self.widget = None
         self.plot_widget = None
         self.plot_item = None
-        self.primary_gap_values = []
-        self.secondary_gap_values = []
+        self.history_points = 5000
+        self.gap_ring = RingBuffer(2, self.history_points, 1.0)
+        self.pending_points = 0
+        self.bounds = None
         self.channel_names = []
         self.channel_index = None
         self.secondary_channel_index = None
@@ -29,8 +32,7 @@ class CenterLineFeature:
         self.update_interval = 200  # ms
         self.initUI()
         self.cache_channel_data()
-        # Add dummy data to test plotting
-        self.add_dummy_data()
+        self.reset_plot()
         logging.debug(f"Initialized CenterLineFeature with project_name: {project_name}, model_name: {model_name}, channel: {channel}")
 
     def initUI(self):
@@ -75,15 +77,14 @@ class CenterLineFeature:
         self.plot_widget.setLabel('left', 'Secondary Channel Gap', color='black')
         self.plot_widget.setLabel('bottom', 'Primary Channel Gap', color='black')
         self.plot_widget.showGrid(x=True, y=True)
-        self.plot_item = self.plot_widget.plot(
-            x=[], y=[],
+        self.plot_item = pg.ScatterPlotItem(
             symbol='o',
-            symbolSize=5,
-            pen=None,
-            symbolPen=pg.mkPen(color=(0, 128, 0), width=2),  # Green, matching C# ScottPlot.Color(0, 128, 0)
-            symbolBrush=pg.mkBrush(color=(0, 128, 0)),
+            size=5,
+            pen=pg.mkPen(color=(0, 128, 0), width=2),  # Green, matching C# ScottPlot.Color(0, 128, 0)
+            brush=pg.mkBrush(color=(0, 128, 0)),
             name="Gap Data"
         )
+        self.plot_widget.addItem(self.plot_item)
         main_layout.addWidget(self.plot_widget)
 
         # Waiting message label
@@ -94,17 +95,6 @@ class CenterLineFeature:
 
         self.update_timer.start(self.update_interval)
 
-    def add_dummy_data(self):
-        """Add dummy data to test plotting functionality."""
-        if not self.primary_gap_values and not self.secondary_gap_values:
-            self.primary_gap_values = [1.0, 2.0, 3.0, 4.0, 5.0]
-            self.secondary_gap_values = [2.0, 3.0, 4.0, 5.0, 6.0]
-            logging.debug("Added dummy data for testing plot")
-            if self.console:
-                self.console.append_to_console("Added dummy data for testing plot")
-            self.waiting_message.setVisible(False)
-            self.update_plot()
-
     def cache_channel_data(self):
         try:
             if not self.db.is_connected():
@@ -191,25 +181,19 @@ class CenterLineFeature:
     def get_widget(self):
         return self.widget
 
-    def on_data_received(self, tag_name, model_name, values, sample_rate):
+    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index, record=None):
         if self.model_name != model_name or self.tag_name != tag_name:
             logging.debug(f"Ignoring data for model {model_name}/tag {tag_name}, expected {self.model_name}/{self.tag_name}")
             return
+        if self.channel_index is None or self.channel_index < 0 or self.secondary_channel_index is None:
+            return
 
         try:
-            logging.debug(f"Received data: tag_name={tag_name}, model_name={model_name}, values_length={len(values)}")
-            if len(values) < 200:  # Minimum 100 ushort values (200 bytes) for header
-                logging.warning("Received invalid MQTT payload: too short.")
-                if self.console:
-                    self.console.append_to_console("Received invalid MQTT payload: too short.")
+            header = record.header if record is not None else None
+            if header is None or len(header) < 10 + self.main_channels:
+                logging.warning(f"No frame header with gap values for {tag_name}, frame {frame_index}")
                 return
 
-            # Parse header (100 ushort values)
-            header = np.frombuffer(values[:200], dtype=np.uint16)
-            logging.debug(f"Raw bytes for header[10]: [{values[20]}, {values[21]}], header[11]: [{values[22]}, {values[23]}], "
-                         f"header[12]: [{values[24]}, {values[25]}], header[13]: [{values[26]}, {values[27]}]")
-            logging.debug(f"Header values [10-13]: {header[10:14].tolist()}")
-
             main_channels = header[2]
             if main_channels != self.main_channels:
                 logging.warning(f"Mismatch in channel count: expected {self.main_channels}, got {main_channels}")
@@ -229,27 +213,12 @@ class CenterLineFeature:
                     self.console.append_to_console(f"Ignoring unreasonable gap values - Primary: {primary_gap}, Secondary: {secondary_gap}")
                 return
 
-            # Append gap values
-            self.primary_gap_values.append(primary_gap)
-            self.secondary_gap_values.append(secondary_gap)
+            self.gap_ring.append([[primary_gap], [secondary_gap]])
+            self.pending_points = min(self.pending_points + 1, self.gap_ring.capacity)
             self.waiting_message.setVisible(False)
 
             logging.debug(f"Received data for {tag_name}: Primary Gap ({self.channel_names[self.channel_index]}): {primary_gap}, "
-                         f"Secondary Gap ({self.channel_names[self.secondary_channel_index]}): {secondary_gap}")
-            if self.console:
-                self.console.append_to_console(f"Received: Primary Gap ({self.channel_names[self.channel_index]}): {primary_gap}, "
-                                             f"Secondary Gap ({self.channel_names[self.secondary_channel_index]}): {secondary_gap}")
-
-            # Clear dummy data if present
-            if len(self.primary_gap_values) > 5 and self.primary_gap_values[:5] == [1.0, 2.0, 3.0, 4.0, 5.0]:
-                self.primary_gap_values = self.primary_gap_values[5:]
-                self.secondary_gap_values = self.secondary_gap_values[5:]
-                logging.debug("Cleared dummy data after receiving real data")
-                if self.console:
-                    self.console.append_to_console("Cleared dummy data after receiving real data")
-
-            # Immediate plot update
-            self.update_plot()
+                         f"Secondary Gap ({self.channel_names[self.secondary_channel_index]}): {secondary_gap}, frame {frame_index}")
 
         except Exception as e:
             logging.error(f"Error in on_data_received: {str(e)}")
@@ -258,44 +227,53 @@ class CenterLineFeature:
             self.waiting_message.setText("Error processing data.")
 
     def update_plot(self):
+        """Redraw the scatter from the gap ring if points arrived since the last tick.
+
+        The scatter always shows exactly the ring's contents, so it never holds
+        more than ``history_points`` points, and it is redrawn at most once per
+        timer tick however fast frames arrive.  The view range is moved only
+        when new points fall outside the current data bounds.
+        """
         try:
-            if not self.primary_gap_values or not self.secondary_gap_values:
-                logging.debug("No data to plot")
+            if self.pending_points == 0:
                 return
+            shown = self.gap_ring.view()
+            self.plot_item.setData(x=shown[0], y=shown[1])
+            points = self.gap_ring.view(self.pending_points)
+            self.pending_points = 0
 
-            # Ensure data is in NumPy arrays
-            x_data = np.array(self.primary_gap_values, dtype=np.float64)
-            y_data = np.array(self.secondary_gap_values, dtype=np.float64)
+            low, high = points.min(axis=1), points.max(axis=1)
+            if self.bounds is None or np.any(low < self.bounds[0]) or np.any(high > self.bounds[1]):
+                if self.bounds is not None:
+                    low, high = np.minimum(low, self.bounds[0]), np.maximum(high, self.bounds[1])
+                self.bounds = (low, high)
+                self.plot_widget.setRange(xRange=(low[0], high[0]), yRange=(low[1], high[1]), padding=0.05)
 
-            # Update the scatter plot
-            self.plot_item.setData(x=x_data, y=y_data)
-            self.plot_widget.setTitle(f"{self.channel_names[self.channel_index]} vs {self.channel_names[self.secondary_channel_index]}")
-            self.plot_widget.setLabel('bottom', f"{self.channel_names[self.channel_index]} Gap")
-            self.plot_widget.setLabel('left', f"{self.channel_names[self.secondary_channel_index]} Gap")
-            self.plot_widget.getPlotItem().autoRange()
-
-            logging.debug(f"Updated plot with {len(self.primary_gap_values)} points: "
-                         f"Primary Gaps = {self.primary_gap_values[:5]}, Secondary Gaps = {self.secondary_gap_values[:5]}")
-            if self.console:
-                self.console.append_to_console(f"Updated plot with {len(self.primary_gap_values)} points")
+            logging.debug(f"Centerline plot holds {shown.shape[1]} points")
 
         except Exception as e:
             logging.error(f"Error updating Centerline plot: {str(e)}")
             if self.console:
                 self.console.append_to_console(f"Error updating Centerline plot: {str(e)}")
 
+    def reset_plot(self):
+        self.gap_ring.clear()
+        self.pending_points = 0
+        self.bounds = None
+        self.plot_item.clear()
+        if self.channel_names and self.channel_index is not None and self.channel_index >= 0 and self.secondary_channel_index is not None:
+            self.plot_widget.setTitle(f"{self.channel_names[self.channel_index]} vs {self.channel_names[self.secondary_channel_index]}")
+            self.plot_widget.setLabel('bottom', f"{self.channel_names[self.channel_index]} Gap")
+            self.plot_widget.setLabel('left', f"{self.channel_names[self.secondary_channel_index]} Gap")
+
     def secondary_channel_changed(self):
         try:
             selected_channel = self.secondary_channel_combo.currentText()
             if selected_channel:
                 self.secondary_channel_index = self.channel_names.index(selected_channel)
-                self.primary_gap_values.clear()
-                self.secondary_gap_values.clear()
-                self.plot_item.clear()
+                self.reset_plot()
                 self.waiting_message.setVisible(True)
                 self.waiting_message.setText("Waiting for data...")
-                # Add dummy data to ensure plot is visible
-                self.add_dummy_data()
                 logging.debug(f"Secondary channel changed to {selected_channel}. Plot data reset.")
                 if self.console:
                     self.console.append_to_console(f"Secondary channel changed to {selected_channel}. Plot data reset.")
@@ -306,9 +284,7 @@ class CenterLineFeature:
 
     def cleanup(self):
         self.update_timer.stop()
-        self.primary_gap_values.clear()
-        self.secondary_gap_values.clear()
-        self.plot_item.clear()
+        self.reset_plot()
         logging.debug("Cleaned up CenterLineFeature resources")
         if self.console:
             self.console.append_to_console("Cleaned up Centerline View resources")
\ No newline at end of file
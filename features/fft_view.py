@@ -4,9 +4,10 @@ from PyQt5.QtCore import QTimer, Qt
 import pyqtgraph as pg
 import numpy as np
 import logging
-from scipy.fft import fft
-from scipy.signal import get_window
 from datetime import datetime
+from processing.spectrum import SpectrumAverager, band_slice, frame_spectrum, frequency_axis, next_pow2, peak_indices
+from processing.zoom_fft import ZoomFFT
+from processing.stft import StreamingWelch
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -22,6 +23,7 @@ class FFTSettings:
         self.number_of_averages = 10
         self.weighting_mode = "Linear"
         self.linear_mode = "Continuous"
+        self.fft_mode = "Full Band"
         self.updated_at = datetime.utcnow()
 
 class FFTViewFeature:
@@ -48,13 +50,18 @@ class FFTViewFeature:
         self.mongo_client = self.db.client  # Use existing client from db
         self.project_id = None
         self.settings = FFTSettings(None)
-        self.data_buffer = []
+        self.averager = SpectrumAverager(self.settings.averaging_mode, self.settings.number_of_averages)
+        self.nfft = None
+        self.zoom_fft = None
+        self.zoom_frequencies = None
+        self.welch = None
         self.settings_panel = None
         self.settings_button = None
         self.channel_count = channel_count
         self.last_frame_index = -1
         self.is_saving = False
         self.current_filename = None
+        self.recording = None
         self.initUI()
         self.initialize_async()
         if self.console:
@@ -145,7 +152,7 @@ class FFTViewFeature:
         settings_labels = [
             "Window Type", "Start Frequency (Hz)", "Stop Frequency (Hz)",
             "Number of Lines", "Overlap Percentage (%)", "Averaging Mode",
-            "Number of Averages", "Weighting Mode", "Linear Mode"
+            "Number of Averages", "Weighting Mode", "Linear Mode", "FFT Mode"
         ]
         self.settings_widgets = {}
 
@@ -306,6 +313,26 @@ class FFTViewFeature:
         settings_layout.addWidget(linear_combo, 8, 1)
         self.settings_widgets["LinearMode"] = linear_combo
 
+        fft_mode_label = QLabel("FFT Mode")
+        fft_mode_label.setStyleSheet("font-size: 14px;")
+        settings_layout.addWidget(fft_mode_label, 9, 0)
+        fft_mode_combo = QComboBox()
+        fft_mode_combo.addItems(["Full Band", "Zoom", "Welch"])
+        fft_mode_combo.setCurrentText(self.settings.fft_mode)
+        fft_mode_combo.setToolTip("Zoom: band-selective FFT giving Number of Lines between the start and stop frequencies\n"
+                                  "Welch: overlapped segments of 2.56 x Number of Lines samples across frame boundaries")
+        fft_mode_combo.setStyleSheet("""
+            QComboBox {
+                padding: 5px;
+                border: 1px solid #d0d0d0;
+                border-radius: 4px;
+                background-color: white;
+                min-width: 100px;
+            }
+        """)
+        settings_layout.addWidget(fft_mode_combo, 9, 1)
+        self.settings_widgets["FFTMode"] = fft_mode_combo
+
         save_button = QPushButton("Save")
         save_button.setStyleSheet("""
             QPushButton {
@@ -346,8 +373,8 @@ class FFTViewFeature:
         """)
         close_button.clicked.connect(self.close_settings)
 
-        settings_layout.addWidget(save_button, 9, 0)
-        settings_layout.addWidget(close_button, 9, 1)
+        settings_layout.addWidget(save_button, 10, 0)
+        settings_layout.addWidget(close_button, 10, 1)
 
         main_layout.addWidget(self.settings_panel)
 
@@ -421,6 +448,8 @@ class FFTViewFeature:
                 self.settings.number_of_averages = int(setting.get("numberOfAverages", 10))
                 self.settings.weighting_mode = setting.get("weightingMode", "Linear")
                 self.settings.linear_mode = setting.get("linearMode", "Continuous")
+                self.settings.fft_mode = setting.get("fftMode", "Full Band")
+                self.averager.configure(self.settings.averaging_mode, self.settings.number_of_averages)
                 
                 self.settings_widgets["WindowType"].setCurrentText(self.settings.window_type)
                 self.settings_widgets["StartFrequency"].setText(str(self.settings.start_frequency))
@@ -431,6 +460,7 @@ class FFTViewFeature:
                 self.settings_widgets["NumberOfAverages"].setText(str(self.settings.number_of_averages))
                 self.settings_widgets["WeightingMode"].setCurrentText(self.settings.weighting_mode)
                 self.settings_widgets["LinearMode"].setCurrentText(self.settings.linear_mode)
+                self.settings_widgets["FFTMode"].setCurrentText(self.settings.fft_mode)
                 
                 self.magnitude_plot_widget.setXRange(self.settings.start_frequency, self.settings.stop_frequency, padding=0.02)
                 self.phase_plot_widget.setXRange(self.settings.start_frequency, self.settings.stop_frequency, padding=0.02)
@@ -452,19 +482,7 @@ class FFTViewFeature:
         try:
             database = self.mongo_client.get_database("changed_db")
             settings_collection = database.get_collection("FFTSettings")
-            setting = {
-                "projectId": self.project_id,
-                "windowType": self.settings.window_type,
-                "startFrequency": self.settings.start_frequency,
-                "stopFrequency": self.settings.stop_frequency,
-                "numberOfLines": self.settings.number_of_lines,
-                "overlapPercentage": self.settings.overlap_percentage,
-                "averagingMode": self.settings.averaging_mode,
-                "numberOfAverages": self.settings.number_of_averages,
-                "weightingMode": self.settings.weighting_mode,
-                "linearMode": self.settings.linear_mode,
-                "updatedAt": datetime.utcnow()
-            }
+            setting = {"projectId": self.project_id, **self.settings_document(), "updatedAt": datetime.utcnow()}
             result = settings_collection.update_one(
                 {"projectId": self.project_id},
                 {"$set": setting},
@@ -481,14 +499,54 @@ class FFTViewFeature:
             if self.console:
                 self.console.append_to_console(f"Error saving FFT settings: {str(e)}")
 
-    def start_saving(self):
+    def settings_document(self):
+        return {
+            "windowType": self.settings.window_type,
+            "startFrequency": self.settings.start_frequency,
+            "stopFrequency": self.settings.stop_frequency,
+            "numberOfLines": self.settings.number_of_lines,
+            "overlapPercentage": self.settings.overlap_percentage,
+            "averagingMode": self.settings.averaging_mode,
+            "numberOfAverages": self.settings.number_of_averages,
+            "weightingMode": self.settings.weighting_mode,
+            "linearMode": self.settings.linear_mode,
+            "fftMode": self.settings.fft_mode
+        }
+
+    def find_timeview_recording(self):
+        for key, instance in getattr(self.parent, "feature_instances", {}).items():
+            if key[0] == "Time View" and key[1] == self.model_name and getattr(instance, "is_saving", False):
+                return instance.current_filename
+        return None
+
+    def start_saving(self, source_filename=None):
         if self.is_saving:
             return
         try:
-            self.current_filename = datetime.utcnow().strftime("%Y%m%d_%H%M%S_FFT.bin")
+            source_filename = source_filename or self.find_timeview_recording()
+            if not source_filename:
+                self.log_and_set_status("Cannot record FFT: start a Time View recording for this model first")
+                return
+            self.current_filename = datetime.utcnow().strftime("%Y%m%d_%H%M%S_FFT")
+            self.recording = {
+                "filename": self.current_filename,
+                "sourceFilename": source_filename,
+                "topic": None,
+                "projectId": self.project_id,
+                "channelIndex": self.channel_index,
+                "channelName": self.channel_name,
+                "frameStart": None,
+                "frameEnd": None,
+                "settings": self.settings_document(),
+                "createdAt": datetime.utcnow()
+            }
+            success, result = self.db.save_fft_recording(self.project_name, self.model_name, dict(self.recording))
+            if not success:
+                self.log_and_set_status(f"Error starting FFT recording: {result}")
+                return
             self.is_saving = True
             if self.console:
-                self.console.append_to_console(f"Started saving FFT data to {self.current_filename}")
+                self.console.append_to_console(f"Started FFT recording {self.current_filename} referencing Time View recording {source_filename}")
         except Exception as e:
             self.log_and_set_status(f"Error starting FFT data saving: {str(e)}")
 
@@ -497,33 +555,63 @@ class FFTViewFeature:
             return
         try:
             self.is_saving = False
+            self.recording["updatedAt"] = datetime.utcnow()
+            success, result = self.db.save_fft_recording(self.project_name, self.model_name, dict(self.recording))
+            if not success:
+                self.log_and_set_status(f"Error finalizing FFT recording: {result}")
+            elif self.console:
+                self.console.append_to_console(
+                    f"Stopped FFT recording {self.current_filename}: frames {self.recording['frameStart']}-{self.recording['frameEnd']}"
+                )
             self.current_filename = None
-            if self.console:
-                self.console.append_to_console("Stopped saving FFT data")
+            self.recording = None
         except Exception as e:
             self.log_and_set_status(f"Error stopping FFT data saving: {str(e)}")
 
-    def save_data_to_database(self, tag_name, values, sample_rate, frame_index):
+    def track_recorded_frame(self, tag_name, frame_index):
+        """Extend the recorded frame range; the samples themselves live in the Time View recording."""
+        self.recording["topic"] = tag_name
+        if self.recording["frameStart"] is None:
+            self.recording["frameStart"] = frame_index
+        self.recording["frameEnd"] = frame_index
+
+    def get_recorded_spectra(self, filename):
+        """Regenerate the spectra of an FFT recording from the Time View frames it references."""
         try:
-            database = self.mongo_client.get_database("changed_db")
-            collection = database.get_collection("messages")
-            message_data = {
-                "topic": tag_name,
-                "filename": self.current_filename,
-                "frameIndex": frame_index,
-                "message": {
-                    "channel_data": [values[self.channel_index].tolist()] if self.channel_index is not None else [],
-                    "sample_rate": sample_rate
-                },
-                "projectId": self.project_id,
-                "createdAt": datetime.utcnow(),
-                "modelName": self.model_name
-            }
-            collection.insert_one(message_data)
+            recordings = self.db.get_fft_recordings(self.project_name, self.model_name, filename)
+            if not recordings:
+                self.log_and_set_status(f"FFT recording {filename} not found")
+                return []
+            recording = recordings[0]
+            channel = recording.get("channelIndex")
+            window_type = recording.get("settings", {}).get("windowType", "Hamming")
+            frames = self.db.get_timeview_frames(
+                self.project_name, self.model_name, recording["sourceFilename"],
+                recording.get("frameStart"), recording.get("frameEnd"), recording.get("topic")
+            )
+            scaling_factor = 3.3 / 65535.0
+            spectra = []
+            for frame in frames:
+                channel_data = frame["message"]["channel_data"]
+                if channel is None or channel >= len(channel_data) or not channel_data[channel]:
+                    continue
+                n = min(len(channel_data[channel]), self.max_samples)
+                nfft = next_pow2(n)
+                sample_rate = float(frame.get("samplingRate") or self.sample_rate)
+                spectrum = frame_spectrum(np.asarray(channel_data[channel][:nfft], dtype=np.float64), window_type, nfft)
+                spectra.append({
+                    "frameIndex": frame["frameIndex"],
+                    "createdAt": frame.get("createdAt"),
+                    "frequencies": frequency_axis(nfft, sample_rate),
+                    "magnitudes": np.abs(spectrum) * scaling_factor / nfft,
+                    "phases": np.degrees(np.angle(spectrum))
+                })
             if self.console:
-                self.console.append_to_console(f"Saved FFT data to database, frame {frame_index}")
+                self.console.append_to_console(f"Regenerated {len(spectra)} spectra for FFT recording {filename}")
+            return spectra
         except Exception as e:
-            self.log_and_set_status(f"Error saving FFT data to database: {str(e)}")
+            self.log_and_set_status(f"Error regenerating FFT recording {filename}: {str(e)}")
+            return []
 
     def toggle_settings(self):
         self.settings_panel.setVisible(not self.settings_panel.isVisible())
@@ -540,6 +628,7 @@ class FFTViewFeature:
             self.settings.number_of_averages = int(self.settings_widgets["NumberOfAverages"].text() or 10)
             self.settings.weighting_mode = self.settings_widgets["WeightingMode"].currentText()
             self.settings.linear_mode = self.settings_widgets["LinearMode"].currentText()
+            self.settings.fft_mode = self.settings_widgets["FFTMode"].currentText()
 
             if self.settings.start_frequency >= self.settings.stop_frequency:
                 self.settings.start_frequency = 10.0
@@ -560,6 +649,10 @@ class FFTViewFeature:
                 self.settings_widgets["NumberOfAverages"].setText(str(self.settings.number_of_averages))
                 self.log_and_set_status("Invalid number of averages, reset to default.")
 
+            self.averager.configure(self.settings.averaging_mode, self.settings.number_of_averages)
+            self.averager.reset()
+            self.zoom_fft = None
+            self.welch = None
             self.save_settings_to_database()
             self.magnitude_plot_widget.setXRange(self.settings.start_frequency, self.settings.stop_frequency, padding=0.02)
             self.phase_plot_widget.setXRange(self.settings.start_frequency, self.settings.stop_frequency, padding=0.02)
@@ -581,13 +674,14 @@ class FFTViewFeature:
         self.settings_widgets["NumberOfAverages"].setText(str(self.settings.number_of_averages))
         self.settings_widgets["WeightingMode"].setCurrentText(self.settings.weighting_mode)
         self.settings_widgets["LinearMode"].setCurrentText(self.settings.linear_mode)
+        self.settings_widgets["FFTMode"].setCurrentText(self.settings.fft_mode)
         self.settings_panel.setVisible(False)
         self.settings_button.setVisible(True)
 
     def get_widget(self):
         return self.widget
 
-    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index):
+    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index, record=None):
         if self.model_name != model_name or self.channel_index is None:
             if self.console:
                 self.console.append_to_console(
@@ -614,13 +708,17 @@ class FFTViewFeature:
             scaling_factor = 3.3 / 65535.0
             raw_data = np.array(values[self.channel_index][:self.max_samples], dtype=np.float32)
             self.latest_data = raw_data * scaling_factor
-            self.data_buffer.append(self.latest_data.copy())
-
-            if len(self.data_buffer) > self.settings.number_of_averages:
-                self.data_buffer = self.data_buffer[-self.settings.number_of_averages:]
-
-            if self.is_saving and self.current_filename:
-                self.save_data_to_database(tag_name, values, sample_rate, frame_index)
+            if self.settings.fft_mode == "Zoom":
+                self.process_zoom(np.asarray(values[self.channel_index], dtype=np.float64) * scaling_factor)
+            elif self.settings.fft_mode == "Welch":
+                self.process_welch(np.asarray(values[self.channel_index], dtype=np.float64) * scaling_factor)
+            elif len(self.latest_data) >= 2:
+                self.nfft = next_pow2(len(self.latest_data))
+                spectrum = frame_spectrum(self.latest_data, self.settings.window_type, self.nfft)
+                self.averager.add(spectrum, self.nfft)
+
+            if self.is_saving and self.recording is not None:
+                self.track_recorded_frame(tag_name, frame_index)
 
             if self.console:
                 self.console.append_to_console(
@@ -630,64 +728,66 @@ class FFTViewFeature:
         except Exception as e:
             self.log_and_set_status(f"Error in on_data_received, frame {frame_index}: {str(e)}")
 
+    def process_zoom(self, samples):
+        if self.settings.stop_frequency > self.sample_rate / 2:
+            self.log_and_set_status(f"Zoom FFT band exceeds Nyquist ({self.sample_rate / 2} Hz)")
+            return
+        if self.zoom_fft is None or not self.zoom_fft.matches(
+                self.sample_rate, self.settings.start_frequency, self.settings.stop_frequency,
+                self.settings.number_of_lines, self.settings.window_type):
+            self.zoom_fft = ZoomFFT(self.sample_rate, self.settings.start_frequency, self.settings.stop_frequency,
+                                    self.settings.number_of_lines, self.settings.window_type)
+            self.averager.reset()
+            if self.console:
+                self.console.append_to_console(
+                    f"FFT View: Zoom FFT {self.settings.start_frequency}-{self.settings.stop_frequency}Hz, "
+                    f"decimation {self.zoom_fft.decimation}, {self.zoom_fft.nfft} points, "
+                    f"record {self.zoom_fft.nfft / self.zoom_fft.output_rate:.1f}s")
+        self.zoom_fft.process(samples)
+        result = self.zoom_fft.spectrum()
+        if result is not None:
+            self.zoom_frequencies, spectra = result
+            self.averager.add(spectra[0], 1)
+
+    def process_welch(self, samples):
+        nperseg = next_pow2(int(np.ceil(2.56 * self.settings.number_of_lines)))
+        overlap = self.settings.overlap_percentage / 100.0
+        if self.welch is None or not self.welch.matches(1, self.sample_rate, nperseg, overlap, self.settings.window_type):
+            self.welch = StreamingWelch(1, self.sample_rate, nperseg, overlap, self.settings.window_type)
+            self.averager.reset()
+        self.nfft = self.welch.nperseg
+        spectra = self.welch.process(samples)
+        for k in range(spectra.shape[1]):
+            self.averager.add(spectra[0, k], self.nfft)
+
     def update_plot(self):
-        if not self.data_buffer:
+        result = self.averager.result()
+        zoom = self.settings.fft_mode == "Zoom"
+        if result is None or (zoom and self.zoom_frequencies is None) or (not zoom and not self.nfft):
             return
 
         try:
-            data = self.data_buffer[-1] if self.settings.averaging_mode == "No Averaging" else np.mean(self.data_buffer, axis=0)
-            n = len(data)
-            if n < 2:
-                self.log_and_set_status(f"Insufficient data length: {n}")
+            magnitudes, phases = result
+            if zoom:
+                frequencies = self.zoom_frequencies
+                band = slice(int(np.searchsorted(frequencies, self.settings.start_frequency, side='left')),
+                             int(np.searchsorted(frequencies, self.settings.stop_frequency, side='right')))
+            else:
+                frequencies = frequency_axis(self.nfft, float(self.sample_rate))
+                band = band_slice(self.nfft, float(self.sample_rate), self.settings.start_frequency, self.settings.stop_frequency)
+            if len(magnitudes) != len(frequencies):
                 return
-
-            window_name = self.settings.window_type.lower() if self.settings.window_type != "None" else "rectangular"
-            window = get_window(window_name, n)
-            windowed_data = data * window
-
-            target_length = 2 ** int(np.ceil(np.log2(n)))
-            padded_data = np.zeros(target_length)
-            padded_data[:n] = windowed_data
-            fft_result = fft(padded_data)
-            half = target_length // 2
-
-            frequencies = np.linspace(0, self.sample_rate / 2, half)
-            freq_mask = (frequencies >= self.settings.start_frequency) & (frequencies <= self.settings.stop_frequency)
-            filtered_frequencies = frequencies[freq_mask]
-
-            magnitudes = np.abs(fft_result[:half]) / target_length
-            phases = np.degrees(np.angle(fft_result[:half]))
-            filtered_magnitudes = magnitudes[freq_mask]
-            filtered_phases = phases[freq_mask]
+            filtered_frequencies = frequencies[band]
+            filtered_magnitudes = magnitudes[band]
+            filtered_phases = phases[band]
 
             if self.settings.weighting_mode != "Linear":
-                weights = np.ones_like(filtered_frequencies)
-                if self.settings.weighting_mode == "A-Weighting":
-                    weights = 1.0 / (1.0 + (filtered_frequencies / 1000) ** 2)
-                elif self.settings.weighting_mode == "B-Weighting":
-                    weights = 1.0 / (1.0 + (filtered_frequencies / 500) ** 2)
-                elif self.settings.weighting_mode == "C-Weighting":
-                    weights = 1.0 / (1.0 + (filtered_frequencies / 200) ** 2)
-                filtered_magnitudes *= weights
-
-            if self.settings.averaging_mode == "Linear" and len(self.data_buffer) > 1:
-                avg_magnitudes = np.mean([np.abs(fft(np.zeros(target_length)[:n] + d * window)[:half]) / target_length for d in self.data_buffer], axis=0)
-                avg_phases = np.mean([np.degrees(np.angle(fft(np.zeros(target_length)[:n] + d * window)[:half])) for d in self.data_buffer], axis=0)
-                filtered_magnitudes = avg_magnitudes[freq_mask]
-                filtered_phases = avg_phases[freq_mask]
-            elif self.settings.averaging_mode == "Exponential" and len(self.data_buffer) > 1:
-                alpha = 2.0 / (self.settings.number_of_averages + 1)
-                avg_magnitudes = np.zeros(half)
-                avg_phases = np.zeros(half)
-                for d in self.data_buffer:
-                    fft_d = fft(np.zeros(target_length)[:n] + d * window)
-                    avg_magnitudes = alpha * (np.abs(fft_d[:half]) / target_length) + (1 - alpha) * avg_magnitudes
-                    avg_phases = alpha * np.degrees(np.angle(fft_d[:half])) + (1 - alpha) * avg_phases
-                filtered_magnitudes = avg_magnitudes[freq_mask]
-                filtered_phases = avg_phases[freq_mask]
+                corner = {"A-Weighting": 1000, "B-Weighting": 500, "C-Weighting": 200}.get(self.settings.weighting_mode)
+                if corner:
+                    filtered_magnitudes = filtered_magnitudes / (1.0 + (filtered_frequencies / corner) ** 2)
 
             if len(filtered_frequencies) > self.settings.number_of_lines:
-                indices = np.linspace(0, len(filtered_frequencies) - 1, self.settings.number_of_lines, dtype=int)
+                indices = peak_indices(filtered_magnitudes, self.settings.number_of_lines)
                 filtered_frequencies = filtered_frequencies[indices]
                 filtered_magnitudes = filtered_magnitudes[indices]
                 filtered_phases = filtered_phases[indices]
@@ -696,13 +796,6 @@ class FFTViewFeature:
             self.phase_plot_item.setData(filtered_frequencies, filtered_phases)
             self.magnitude_plot_widget.setXRange(self.settings.start_frequency, self.settings.stop_frequency, padding=0.02)
             self.phase_plot_widget.setXRange(self.settings.start_frequency, self.settings.stop_frequency, padding=0.02)
-
-            if self.console:
-                self.console.append_to_console(
-                    f"FFT Updated: Samples={n}, FFT Size={target_length}, "
-                    f"Fs={self.sample_rate}Hz, Lines={len(filtered_frequencies)}, "
-                    f"Range={self.settings.start_frequency}-{self.settings.stop_frequency}Hz"
-                )
         except Exception as e:
             self.log_and_set_status(f"Error updating FFT: {str(e)}")
 
@@ -1,6 +1,35 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton
+from PyQt5.QtCore import QTimer
+import pyqtgraph as pg
+import logging
+import datetime
+from processing.rollups import rollup_series
+
+logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class DateAxisItem(pg.AxisItem):
+    def tickStrings(self, values, scale, spacing):
+        fmt = '%H:%M' if spacing < 86400 else '%d %b'
+        return [datetime.datetime.fromtimestamp(val).strftime(fmt) for val in values]
+
 
 class HistoryPlotFeature:
+    METRICS = [
+        ("Direct (pk-pk)", "direct", "V"),
+        ("1X Amplitude (pk-pk)", "amp1x", "V"),
+        ("1X Phase", "phase1x", "deg"),
+        ("Gap", "gap", "V"),
+        ("Speed", "rpm", "RPM"),
+    ]
+    RANGES = [
+        ("Last 6 Hours", 6 * 3600),
+        ("Last 24 Hours", 24 * 3600),
+        ("Last 7 Days", 7 * 86400),
+        ("Last 30 Days", 30 * 86400),
+        ("Last 90 Days", 90 * 86400),
+    ]
+
     def __init__(self, parent, db, project_name, channel=None, model_name=None, console=None):
         self.parent = parent
         self.db = db
@@ -9,25 +38,142 @@ class HistoryPlotFeature:
         self.model_name = model_name
         self.console = console  # Store the console instance
         self.widget = None
+        # Minute buckets up to two days (2880 points), hourly beyond that.
+        self.minute_span_limit = 2 * 86400
+        self.channel_names = self.load_channel_names()
         self.initUI()
+        self.refresh_timer = QTimer()
+        self.refresh_timer.timeout.connect(self.load_history)
+        self.refresh_timer.start(60000)
+        self.load_history()
+
+    def load_channel_names(self):
+        try:
+            project_data = self.db.get_project_data(self.project_name) if self.db else {}
+            for model in project_data.get("models", []):
+                if model.get("name") == self.model_name:
+                    return [ch.get("channelName", f"Channel_{i + 1}") for i, ch in enumerate(model.get("channels", []))]
+        except Exception as e:
+            logging.error(f"Failed to load channels for History Plot: {str(e)}")
+        return []
 
     def initUI(self):
         self.widget = QWidget()
         layout = QVBoxLayout()
         self.widget.setLayout(layout)
-        label = QLabel(f"FFT View for Model: {self.model_name}, Channel: {self.channel}")
-        layout.addWidget(label)
+        self.label = QLabel(f"History Plot for Model: {self.model_name}, Channel: {self.channel or 'All'}")
+        self.label.setStyleSheet("font-size: 16px; font-weight: bold; padding: 10px;")
+        layout.addWidget(self.label)
+
+        combo_style = """
+            QComboBox {
+                padding: 4px 8px;
+                border: 1px solid #90caf9;
+                border-radius: 4px;
+                background-color: white;
+                min-width: 140px;
+            }
+        """
+        controls = QHBoxLayout()
+        self.channel_combo = QComboBox()
+        self.channel_combo.addItems(self.channel_names)
+        if self.channel in self.channel_names:
+            self.channel_combo.setCurrentIndex(self.channel_names.index(self.channel))
+        self.metric_combo = QComboBox()
+        self.metric_combo.addItems([name for name, _, _ in self.METRICS])
+        self.range_combo = QComboBox()
+        self.range_combo.addItems([name for name, _ in self.RANGES])
+        self.range_combo.setCurrentIndex(1)
+        for label, combo in (("Channel:", self.channel_combo), ("Value:", self.metric_combo), ("Range:", self.range_combo)):
+            combo.setStyleSheet(combo_style)
+            combo.currentIndexChanged.connect(self.load_history)
+            controls.addWidget(QLabel(label))
+            controls.addWidget(combo)
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.setStyleSheet("""
+            QPushButton {
+                background-color: #1e88e5;
+                color: white;
+                border: none;
+                padding: 6px 12px;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #1976d2;
+            }
+        """)
+        self.refresh_button.clicked.connect(self.load_history)
+        controls.addWidget(self.refresh_button)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.plot_widget = pg.PlotWidget(axisItems={'bottom': DateAxisItem(orientation='bottom')})
+        self.plot_widget.setBackground('w')
+        self.plot_widget.showGrid(x=True, y=True)
+        self.plot_widget.setLabel('bottom', 'Time')
+        self.plot_widget.addLegend()
+        self.max_curve = self.plot_widget.plot(pen=pg.mkPen((30, 136, 229, 80), width=1), connect='finite')
+        self.min_curve = self.plot_widget.plot(pen=pg.mkPen((30, 136, 229, 80), width=1), connect='finite')
+        self.band = pg.FillBetweenItem(self.min_curve, self.max_curve, brush=pg.mkBrush(30, 136, 229, 50))
+        self.plot_widget.addItem(self.band)
+        self.mean_curve = self.plot_widget.plot(pen=pg.mkPen('b', width=2), name="Mean", connect='finite')
+        layout.addWidget(self.plot_widget)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
 
         if not self.model_name and self.console:
-            self.console.append_to_console("No model selected in FFTViewFeature.")
-        if not self.channel and self.console:
-            self.console.append_to_console("No channel selected in FFTViewFeature.")
+            self.console.append_to_console("No model selected in History Plot.")
+        if not self.channel_names and self.console:
+            self.console.append_to_console(f"No channels found for {self.model_name} in History Plot.")
 
     def get_widget(self):
         return self.widget
 
-    def on_data_received(self, tag_name, model_name, values):
-        if self.model_name != model_name:
-            return  # Ignore data for other models
-        if self.console:
-            self.console.append_to_console(f"FFT View ({self.model_name} - {self.channel}): Received data for {tag_name} - {values}")
\ No newline at end of file
+    def load_history(self):
+        """Plot the selected value over the selected range from the minute or hour rollups."""
+        if not self.db or not self.model_name or not self.channel_names:
+            return
+        try:
+            channel = max(self.channel_combo.currentIndex(), 0)
+            label, metric, unit = self.METRICS[self.metric_combo.currentIndex()]
+            span = self.RANGES[self.range_combo.currentIndex()][1]
+            interval = "minute" if span <= self.minute_span_limit else "hour"
+            end = datetime.datetime.now(datetime.timezone.utc)
+            start = end - datetime.timedelta(seconds=span)
+            docs = self.db.get_rollups(self.project_name, self.model_name, interval, start, end, channel)
+            times, mean, minimum, maximum = rollup_series(docs, channel, metric)
+            self.mean_curve.setData(times, mean)
+            self.min_curve.setData(times, minimum)
+            self.max_curve.setData(times, maximum)
+            self.plot_widget.setLabel('left', f"{label} ({unit})")
+            self.plot_widget.setTitle(f"{self.channel_names[channel] if metric != 'rpm' else self.model_name} - {label}")
+            now = end.timestamp()
+            self.plot_widget.setXRange(now - span, now, padding=0.02)
+            if metric == "phase1x":
+                self.plot_widget.setYRange(0, 360, padding=0.02)
+            else:
+                self.plot_widget.enableAutoRange('y', True)
+            self.status_label.setText(f"{len(docs)} {interval} buckets" if docs else "No history recorded for this range yet")
+        except Exception as e:
+            logging.error(f"Failed to load history for {self.model_name}: {str(e)}")
+            if self.console:
+                self.console.append_to_console(f"Error loading history for {self.model_name}: {str(e)}")
+
+    def refresh_channel_properties(self):
+        self.channel_names = self.load_channel_names()
+        current = self.channel_combo.currentText()
+        self.channel_combo.blockSignals(True)
+        self.channel_combo.clear()
+        self.channel_combo.addItems(self.channel_names)
+        if current in self.channel_names:
+            self.channel_combo.setCurrentIndex(self.channel_names.index(current))
+        self.channel_combo.blockSignals(False)
+        self.load_history()
+
+    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index, record=None):
+        # History comes from the rollups the ingest thread writes; live frames are not needed here.
+        pass
+
+    def cleanup(self):
+        self.refresh_timer.stop()
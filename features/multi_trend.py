@@ -4,6 +4,9 @@ from PyQt5.QtCore import QTimer, Qt
 import pyqtgraph as pg
 from datetime import datetime
 import logging
+from processing.tacho import debounced_edges
+from processing.harmonics import revolution_peak_to_peak
+from processing.trend_buffer import TrendBuffer
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -25,7 +28,8 @@ class MultiTrendFeature:
         self.widget = None
         self.plot_widget = None
         self.plots = []
-        self.channel_data = []
+        self.trend = TrendBuffer(0, 1)
+        self.history_points = 3600
         self.channel_names = []
         self.channel_checkboxes = []
         self.colors = [
@@ -72,7 +76,7 @@ class MultiTrendFeature:
             if not self.channel_names:
                 self.log_error(f"No channels found in model {self.model_name}.")
                 return
-            self.channel_data = [{"direct_data": [], "timestamps": []} for _ in self.channel_names]
+            self.trend = TrendBuffer(len(self.channel_names), self.history_points)
             self.log_info(f"Initialized {len(self.channel_names)} channels for Model: {self.model_name}")
         except Exception as e:
             self.log_error(f"Error initializing MultiTrendFeature: {str(e)}")
@@ -168,7 +172,7 @@ class MultiTrendFeature:
         self.error_label.setText(message)
         self.error_label.setVisible(True)
 
-    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index):
+    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index, record=None):
         if self.model_name != model_name or self.tag_name != tag_name:
             self.log_info(f"Ignoring data for tag: {tag_name}, model: {model_name}, frame {frame_index}")
             return
@@ -199,14 +203,12 @@ class MultiTrendFeature:
                 trigger_data = [1 if i % 100 == 0 else 0 for i in range(len(main_data[0]))]
                 self.log_info(f"No valid trigger data; using synthetic triggers, frame {frame_index}")
 
-            # Find trigger indices
-            trigger_indices = [i for i, v in enumerate(trigger_data) if v >= 1.0]
-            min_distance = 5
-            filtered_triggers = [trigger_indices[0]] if trigger_indices else []
-            for idx in trigger_indices[1:]:
-                if idx - filtered_triggers[-1] >= min_distance:
-                    filtered_triggers.append(idx)
-            trigger_indices = filtered_triggers
+            # Debounced trigger edges, shared from the ingest tacho stage when available
+            tacho = record.tacho if record is not None else None
+            if tacho is not None and tacho.length == len(main_data[0]):
+                trigger_indices = tacho.edges.tolist()
+            else:
+                trigger_indices = debounced_edges(trigger_data).tolist()
 
             if len(trigger_indices) < 2:
                 self.log_error(f"Not enough trigger points detected, frame {frame_index}")
@@ -216,28 +218,16 @@ class MultiTrendFeature:
                     self.log_error(f"Synthetic triggers insufficient, frame {frame_index}")
                     return
 
-            # Calibrate data
-            calibrated_data = [[float(v) * self.scaling_factor for v in ch] for ch in main_data]
+            # Calibrate all channels at once and take every revolution's peak-to-peak in one reduceat pass
+            length = min(len(ch) for ch in main_data)
+            calibrated_data = np.asarray([ch[:length] for ch in main_data], dtype=np.float64) * self.scaling_factor
+            bounds = np.asarray(trigger_indices, dtype=np.intp)
+            bounds = bounds[bounds <= length]
+            direct_values = revolution_peak_to_peak(calibrated_data, bounds)
+            direct_avg = direct_values.mean(axis=1) if direct_values.shape[1] else np.zeros(len(calibrated_data))
 
-            # Calculate Direct (peak-to-peak) values
             current_time = datetime.now().timestamp() / 86400.0  # Convert to days since epoch
-            for ch_idx, ch_data in enumerate(calibrated_data):
-                direct_values = []
-                for i in range(len(trigger_indices) - 1):
-                    start_idx = trigger_indices[i]
-                    end_idx = trigger_indices[i + 1]
-                    if end_idx <= len(ch_data):
-                        segment = ch_data[start_idx:end_idx]
-                        if segment:
-                            peak_to_peak = max(segment) - min(segment)
-                            direct_values.append(peak_to_peak)
-                direct_avg = np.mean(direct_values) if direct_values else 0.0
-                self.channel_data[ch_idx]["direct_data"].append(direct_avg)
-                self.channel_data[ch_idx]["timestamps"].append(current_time)
-                # Limit data to last 1 hour
-                if len(self.channel_data[ch_idx]["timestamps"]) > 3600:
-                    self.channel_data[ch_idx]["timestamps"] = self.channel_data[ch_idx]["timestamps"][-3600:]
-                    self.channel_data[ch_idx]["direct_data"] = self.channel_data[ch_idx]["direct_data"][-3600:]
+            self.trend.append(current_time, direct_avg)
 
             self.log_info(f"Processed data for {tag_name}: {len(self.channel_names)} channels at "
                           f"{datetime.fromtimestamp(current_time * 86400.0).strftime('%H:%M:%S')}, frame {frame_index}")
@@ -247,18 +237,17 @@ class MultiTrendFeature:
 
     def update_plot(self):
         try:
-            has_data = any(data["timestamps"] for data in self.channel_data)
+            times, direct_data = self.trend.view()
+            has_data = len(times) > 0
             self.error_label.setVisible(not has_data)
 
             current_time = datetime.now().timestamp() / 86400.0
             vb = self.plot_widget.getViewBox()
 
             # Update plots
-            for i, (plot, data, cb) in enumerate(zip(self.plots, self.channel_data, self.channel_checkboxes)):
-                if cb.isChecked() and data["timestamps"]:
-                    x = np.array(data["timestamps"])
-                    y = np.array(data["direct_data"])
-                    plot.setData(x, y, connect="all")
+            for i, (plot, cb) in enumerate(zip(self.plots, self.channel_checkboxes)):
+                if cb.isChecked() and has_data:
+                    plot.setData(times, direct_data[i], connect="all")
                 else:
                     plot.setData([], [])
 
@@ -267,27 +256,24 @@ class MultiTrendFeature:
                 vb.enableAutoRange('y', True)
                 return
 
-            max_time = max(max((d["timestamps"] or [0])[-1] for d in self.channel_data if d["timestamps"]), current_time)
+            max_time = max(times[-1], current_time)
             min_time = max_time - self.display_window_seconds / 86400.0
 
             if self.user_interacted and self.last_right_limit is not None:
                 max_time = self.last_right_limit
                 min_time = max_time - self.display_window_seconds / 86400.0
-                if abs(max_time - max(d["timestamps"][-1] for d in self.channel_data if d["timestamps"])) < 1.0 / 86400.0:
+                if abs(max_time - times[-1]) < 1.0 / 86400.0:
                     self.user_interacted = False
                     min_time = max_time - self.display_window_seconds / 86400.0
                     max_time = current_time
             else:
-                if max(d["timestamps"][-1] for d in self.channel_data if d["timestamps"]) - min(d["timestamps"][0] for d in self.channel_data if d["timestamps"]) < self.display_window_seconds / 86400.0:
-                    min_time = min(d["timestamps"][0] for d in self.channel_data if d["timestamps"])
+                if times[-1] - times[0] < self.display_window_seconds / 86400.0:
+                    min_time = times[0]
 
             vb.setXRange(min_time, max_time, padding=0.02)
-            if any(d["direct_data"] for d in self.channel_data):
-                min_y = min(min(d["direct_data"] or [float('inf')]) for d in self.channel_data) * 0.9
-                max_y = max(max(d["direct_data"] or [float('-inf')]) for d in self.channel_data) * 1.1
-                vb.setYRange(min_y, max_y, padding=0.02)
-            else:
-                vb.setYRange(-1, 1, padding=0.02)
+            min_y = float(np.min(direct_data)) * 0.9
+            max_y = float(np.max(direct_data)) * 1.1
+            vb.setYRange(min_y, max_y, padding=0.02)
 
             self.log_info("Plot updated")
         except Exception as e:
@@ -298,7 +284,7 @@ class MultiTrendFeature:
 
     def cleanup(self):
         self.update_timer.stop()
-        self.channel_data.clear()
+        self.trend.clear()
         self.plots.clear()
         self.channel_checkboxes.clear()
         self.log_info("Cleaned up MultiTrendFeature")
\ No newline at end of file
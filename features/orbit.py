@@ -1,13 +1,46 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox, QHBoxLayout
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
 import pyqtgraph as pg
 import numpy as np
 import logging
 from datetime import datetime
+from processing.decimation import ViewportDecimator
+from processing.orbit import ORBIT_MODES, orbit_points
+from processing.tacho import debounced_edges
+
+
+class OrbitWorker(QObject):
+    """Computes orbits off the GUI thread; one job per frame, results go back through ``result``."""
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    @pyqtSlot(object)
+    def process(self, job):
+        try:
+            data = np.array(job["data"], dtype=np.float64) * job["scale"]
+            bounds = job["bounds"]
+            if bounds is None:
+                trigger = job["trigger"]
+                bounds = debounced_edges(trigger) if trigger is not None else np.empty(0, dtype=np.intp)
+            orbit = orbit_points(data, bounds, job["mode"], job["points"], job["revolutions"])
+            samples = data.shape[1]
+            time = job["end_time"] - (samples - np.arange(samples)) / float(job["sample_rate"])
+            self.result.emit({
+                "frame_index": job["frame_index"],
+                "mode": job["mode"],
+                "orbit": orbit,
+                "time": time,
+                "data": data,
+                "revolutions": max(len(bounds) - 1, 0),
+            })
+        except Exception as e:
+            self.error.emit(f"Orbit computation failed for frame {job.get('frame_index')}: {str(e)}")
+
 
 class OrbitFeature(QObject):
     primary_channel_changed = pyqtSignal(int)
     secondary_channel_changed = pyqtSignal(int)
+    frame_ready = pyqtSignal(object)
 
     def __init__(self, parent, db, project_name, channel=None, model_name=None, console=None, channel_count=None):
         super().__init__(parent)
@@ -24,7 +57,7 @@ class OrbitFeature(QObject):
         self.data_plots = []
         self.time_plot_widgets = []
         self.time_plots = []
-        self.channel_data = []
+        self.time_decimators = []
         self.primary_channel = 0
         self.secondary_channel = 1
         self.sample_rate = None
@@ -34,6 +67,20 @@ class OrbitFeature(QObject):
         self.is_updating = False
         self.last_frame_index = -1
         self.window_seconds = 1.0
+        self.scaling_factor = 3.3 / 65535.0
+        self.orbit_mode = ORBIT_MODES[0]
+        self.orbit_resolution = 256  # points per averaged/filtered revolution
+        self.average_revolutions = 16
+        self.latest_frame = None
+        self.pending_job = None
+        self.worker_busy = False
+        self.worker_thread = QThread()
+        self.worker = OrbitWorker()
+        self.worker.moveToThread(self.worker_thread)
+        self.frame_ready.connect(self.worker.process)
+        self.worker.result.connect(self.on_orbit_result)
+        self.worker.error.connect(self.on_orbit_error)
+        self.worker_thread.start()
         self.initUI()
         self.parent.tree_view.model_selected.connect(self.update_model)
         self.parent.tree_view.channel_selected.connect(self.update_channel)
@@ -79,11 +126,19 @@ class OrbitFeature(QObject):
         """)
         self.secondary_combo.currentIndexChanged.connect(self.on_secondary_combo_changed)
 
+        mode_label = QLabel("Orbit:")
+        self.mode_combo = QComboBox()
+        self.mode_combo.setStyleSheet(self.primary_combo.styleSheet())
+        self.mode_combo.addItems(ORBIT_MODES)
+        self.mode_combo.currentTextChanged.connect(self.on_mode_changed)
+
         combo_layout = QHBoxLayout()
         combo_layout.addWidget(primary_label)
         combo_layout.addWidget(self.primary_combo)
         combo_layout.addWidget(secondary_label)
         combo_layout.addWidget(self.secondary_combo)
+        combo_layout.addWidget(mode_label)
+        combo_layout.addWidget(self.mode_combo)
         main_layout.addLayout(combo_layout)
 
         self.plot_layout = QHBoxLayout()
@@ -97,7 +152,7 @@ class OrbitFeature(QObject):
             self.selected_channel = None
             self.primary_channel = 0
             self.secondary_channel = 1
-            self.channel_data = []
+            self.latest_frame = None
             self.available_channels = []
             self.load_channel_data()
             if self.console:
@@ -122,7 +177,7 @@ class OrbitFeature(QObject):
                     self.console.append_to_console("OrbitFeature: No project or model selected")
                 self.channel_count = 0
                 self.available_channels = []
-                self.channel_data = []
+                self.latest_frame = None
                 self.primary_combo.clear()
                 self.secondary_combo.clear()
                 self.clear_plots()
@@ -135,7 +190,7 @@ class OrbitFeature(QObject):
                     self.console.append_to_console(f"OrbitFeature: Project {self.project_name} not found")
                 self.channel_count = 0
                 self.available_channels = []
-                self.channel_data = []
+                self.latest_frame = None
                 self.primary_combo.clear()
                 self.secondary_combo.clear()
                 self.clear_plots()
@@ -146,14 +201,14 @@ class OrbitFeature(QObject):
                     self.console.append_to_console(f"OrbitFeature: Model {self.model_name} not found")
                 self.channel_count = 0
                 self.available_channels = []
-                self.channel_data = []
+                self.latest_frame = None
                 self.primary_combo.clear()
                 self.secondary_combo.clear()
                 self.clear_plots()
                 return
             self.available_channels = [ch.get("channelName", f"Channel_{i+1}") for i, ch in enumerate(model.get("channels", []))]
             self.channel_count = len(self.available_channels)
-            self.channel_data = [[] for _ in range(self.channel_count)]
+            self.latest_frame = None
             self.primary_combo.clear()
             self.secondary_combo.clear()
             self.primary_combo.addItems(self.available_channels)
@@ -181,7 +236,7 @@ class OrbitFeature(QObject):
             logging.error(f"OrbitFeature: Error loading channel data: {str(e)}")
             self.channel_count = 0
             self.available_channels = []
-            self.channel_data = []
+            self.latest_frame = None
             self.primary_combo.clear()
             self.secondary_combo.clear()
             self.clear_plots()
@@ -273,8 +328,7 @@ class OrbitFeature(QObject):
         plot_item.setLabel('left', f"Channel {self.available_channels[self.secondary_channel]}")
         plot_item.showGrid(x=True, y=True)
         plot_item.setAspectLocked(True)
-        plot_item.setXRange(-1.0, 1.0, padding=0.02)
-        plot_item.setYRange(-1.0, 1.0, padding=0.02)
+        plot_item.enableAutoRange('xy', True)
         data_plot = plot_item.plot(pen=pg.mkPen('b', width=2))
         self.plot_widgets.append(plot_widget)
         self.plot_items.append(plot_item)
@@ -298,6 +352,7 @@ class OrbitFeature(QObject):
                 time_plot = time_plot_item.plot(pen=pg.mkPen(time_colors[ch % len(time_colors)], width=2))
                 self.time_plot_widgets.append(time_plot_widget)
                 self.time_plots.append(time_plot)
+                self.time_decimators.append(ViewportDecimator(time_plot_widget, time_plot))
 
         if self.console:
             self.console.append_to_console(
@@ -317,8 +372,7 @@ class OrbitFeature(QObject):
                 if i < len(self.time_plot_widgets) and ch < self.channel_count:
                     self.time_plot_widgets[i].getPlotItem().setTitle(f"Channel {self.available_channels[ch]} Time Domain")
                     self.time_plot_widgets[i].getPlotItem().setLabel('left', f"Channel {self.available_channels[ch]} Value")
-            if self.console:
-                self.console.append_to_console("OrbitFeature: Updated plot labels")
+            logging.debug("OrbitFeature: Updated plot labels")
 
     def clear_plots(self):
         if self.data_plots:
@@ -328,123 +382,99 @@ class OrbitFeature(QObject):
         for widget in self.plot_widgets + self.time_plot_widgets:
             widget.getPlotItem().enableAutoRange('xy', True)
             widget.getViewBox().update()
-        if self.console:
-            self.console.append_to_console("OrbitFeature: Cleared all plots")
+        logging.debug("OrbitFeature: Cleared all plots")
+
+    def on_mode_changed(self, mode):
+        self.orbit_mode = mode
+        self.update_plots()
 
     def update_plots(self):
+        """Recompute the orbit of the latest frame, e.g. after a channel or mode change."""
+        if self.latest_frame is not None:
+            self.submit_frame(*self.latest_frame)
+
+    def submit_frame(self, values, sample_rate, frame_index, end_time, tacho=None):
         if not self.data_plots or not self.time_plots:
-            if self.console:
-                self.console.append_to_console("OrbitFeature: No plots available for update")
             return
-
-        data_lengths = [len(d) if isinstance(d, (list, np.ndarray)) else 0 for d in self.channel_data]
-        if self.console:
-            self.console.append_to_console(
-                f"OrbitFeature: Updating plots with channel data lengths: {data_lengths}, "
-                f"primary: {self.primary_channel}, secondary: {self.secondary_channel}"
-            )
-
-        if (self.primary_channel >= len(self.channel_data) or 
-            self.secondary_channel >= len(self.channel_data) or
-            len(self.channel_data[self.primary_channel]) == 0 or 
-            len(self.channel_data[self.secondary_channel]) == 0):
-            if self.console:
-                self.console.append_to_console(
-                    f"OrbitFeature: Cannot update plots - invalid channel indices or empty data "
-                    f"(primary: {self.primary_channel}, secondary: {self.secondary_channel}, "
-                    f"data lengths: {data_lengths})"
-                )
+        if self.primary_channel >= self.channel_count or self.secondary_channel >= self.channel_count:
             self.clear_plots()
             return
-
-        x_data = np.array(self.channel_data[self.primary_channel])
-        y_data = np.array(self.channel_data[self.secondary_channel])
-        if x_data.size > 0 and y_data.size > 0 and x_data.size == y_data.size:
+        trigger = values[self.channel_count + 1] if len(values) > self.channel_count + 1 else None
+        bounds = tacho.bounds if tacho is not None and tacho.has_revolutions and tacho.length == len(values[0]) else None
+        job = {
+            "frame_index": frame_index,
+            "data": (values[self.primary_channel], values[self.secondary_channel]),
+            "trigger": trigger,
+            "bounds": bounds,
+            "mode": self.orbit_mode,
+            "points": self.orbit_resolution,
+            "revolutions": self.average_revolutions,
+            "scale": self.scaling_factor,
+            "sample_rate": sample_rate,
+            "end_time": end_time,
+        }
+        # Only one frame is computed at a time; while the worker is busy the newest frame waits and older ones are dropped.
+        if self.worker_busy:
+            self.pending_job = job
+            return
+        self.worker_busy = True
+        self.frame_ready.emit(job)
+
+    def dispatch_pending_job(self):
+        self.worker_busy = False
+        if self.pending_job is not None:
+            job, self.pending_job = self.pending_job, None
+            self.worker_busy = True
+            self.frame_ready.emit(job)
+
+    def on_orbit_result(self, result):
+        self.dispatch_pending_job()
+        if not self.data_plots or not self.time_plots:
+            return
+        orbit = result["orbit"]
+        if orbit.shape[1] == 0:
             self.data_plots[0].clear()
-            self.data_plots[0].setData(x_data, y_data)
-            self.plot_items[0].setXRange(-1.0, 1.0, padding=0.02)
-            self.plot_items[0].setYRange(-1.0, 1.0, padding=0.02)
-            self.plot_items[0].getViewBox().update()
-            if self.console:
-                self.console.append_to_console(
-                    f"OrbitFeature: Updated orbit plot with {x_data.size} samples for "
-                    f"Ch {self.available_channels[self.primary_channel]} vs Ch {self.available_channels[self.secondary_channel]}, "
-                    f"data sample: {x_data[:5].tolist()}"
-                )
         else:
-            self.data_plots[0].clear()
-            if self.console:
-                self.console.append_to_console(
-                    f"OrbitFeature: Cannot update orbit plot - invalid data sizes (x: {x_data.size}, y: {y_data.size})"
+            self.data_plots[0].setData(orbit[0], orbit[1])
+        title = f"Orbit Plot (Ch {self.available_channels[self.secondary_channel]} vs Ch {self.available_channels[self.primary_channel]})"
+        if result["mode"] != "Direct":
+            title += f" - {result['mode']}, {min(result['revolutions'], self.average_revolutions) if result['mode'] == 'Averaged' else result['revolutions']} revs"
+        self.plot_items[0].setTitle(title)
+
+        time = result["time"]
+        for i, ch_data in enumerate(result["data"]):
+            if i < len(self.time_plots):
+                self.time_plot_widgets[i].getPlotItem().setXRange(
+                    self.current_time - self.window_seconds, self.current_time, padding=0.02
                 )
+                self.time_decimators[i].set_data(time, ch_data)
+        logging.debug(f"OrbitFeature: Plotted {result['mode']} orbit with {orbit.shape[1]} points, frame {result['frame_index']}")
 
-        if self.sample_rate and self.samples_per_channel:
-            time = np.linspace(self.current_time - self.samples_per_channel / self.sample_rate, 
-                             self.current_time, self.samples_per_channel, endpoint=False)
-            for i, ch in enumerate([self.primary_channel, self.secondary_channel]):
-                if i < len(self.time_plots) and ch < len(self.channel_data) and len(self.channel_data[ch]) > 0:
-                    ch_data = np.array(self.channel_data[ch])
-                    if ch_data.size > 0:
-                        self.time_plots[i].clear()
-                        self.time_plots[i].setData(time, ch_data)
-                        self.time_plot_widgets[i].getPlotItem().setXRange(
-                            self.current_time - self.window_seconds, self.current_time, padding=0.02
-                        )
-                        self.time_plot_widgets[i].getPlotItem().enableAutoRange('y', True)
-                        self.time_plot_widgets[i].getViewBox().update()
-                        if self.console:
-                            self.console.append_to_console(
-                                f"OrbitFeature: Updated time plot {i} for channel {self.available_channels[ch]} with {ch_data.size} samples, "
-                                f"data sample: {ch_data[:5].tolist()}"
-                            )
-                    else:
-                        self.time_plots[i].clear()
-                        if self.console:
-                            self.console.append_to_console(
-                                f"OrbitFeature: Cannot update time plot {i} - empty data for channel {self.available_channels[ch]}"
-                            )
-        else:
-            for plot in self.time_plots:
-                plot.clear()
-            if self.console:
-                self.console.append_to_console(
-                    f"OrbitFeature: Cannot update time plots - missing sample rate ({self.sample_rate}) or sample count ({self.samples_per_channel})"
-                )
+    def on_orbit_error(self, message):
+        self.dispatch_pending_job()
+        logging.error(f"OrbitFeature: {message}")
+        if self.console:
+            self.console.append_to_console(f"OrbitFeature: {message}")
 
-    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index):
+    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index, record=None):
         if self.model_name != model_name:
             return
         try:
             if frame_index != self.last_frame_index + 1 and self.last_frame_index != -1:
                 logging.warning(f"Non-sequential frame index: expected {self.last_frame_index + 1}, got {frame_index}")
-                if self.console:
-                    self.console.append_to_console(f"Warning: Non-sequential frame index: expected {self.last_frame_index + 1}, got {frame_index}")
             self.last_frame_index = frame_index
 
-            if len(values) < self.channel_count:
-                if self.console:
-                    self.console.append_to_console(
-                        f"OrbitFeature: Received {len(values)} channels, expected at least {self.channel_count}, frame {frame_index}"
-                    )
+            if len(values) < self.channel_count or self.channel_count == 0:
+                logging.warning(f"OrbitFeature: Received {len(values)} channels, expected at least {self.channel_count}, frame {frame_index}")
                 return
             self.sample_rate = sample_rate
             self.samples_per_channel = len(values[0])
+            if any(len(values[i]) != self.samples_per_channel for i in range(self.channel_count)):
+                logging.warning(f"OrbitFeature: Channel lengths differ, frame {frame_index}")
+                return
             self.current_time = datetime.now().timestamp()
-            for i in range(min(self.channel_count, len(values))):
-                if len(values[i]) == self.samples_per_channel:
-                    self.channel_data[i] = np.array(values[i])
-                else:
-                    if self.console:
-                        self.console.append_to_console(
-                            f"OrbitFeature: Channel {i} has {len(values[i])} samples, expected {self.samples_per_channel}, frame {frame_index}"
-                        )
-                    return
-            if self.console:
-                self.console.append_to_console(
-                    f"OrbitFeature ({self.model_name}): Received {self.samples_per_channel} samples for {self.channel_count} channels, "
-                    f"data lengths: {[len(d) for d in self.channel_data]}, frame {frame_index}"
-                )
-            self.update_plots()
+            self.latest_frame = (values, sample_rate, frame_index, self.current_time, record.tacho if record is not None else None)
+            self.submit_frame(*self.latest_frame)
         except Exception as e:
             if self.console:
                 self.console.append_to_console(f"OrbitFeature: Error processing data, frame {frame_index}: {str(e)}")
@@ -487,13 +517,17 @@ class OrbitFeature(QObject):
         return self.widget
 
     def cleanup(self):
+        self.pending_job = None
+        self.worker_thread.quit()
+        self.worker_thread.wait()  # At most the frame in progress; the thread must not be destroyed while running
         for plot_widget in self.plot_widgets + self.time_plot_widgets:
             plot_widget.deleteLater()
         self.plot_widgets = []
         self.time_plot_widgets = []
         self.data_plots = []
         self.time_plots = []
-        self.channel_data = []
+        self.time_decimators = []
+        self.latest_frame = None
         self.channel_count = 0
         if self.console:
             self.console.append_to_console("OrbitFeature: Cleaned up resources")
@@ -1,64 +1,106 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
 import pyqtgraph as pg
 import numpy as np
+import logging
 from PyQt5.QtCore import QTimer
+from processing.ring_buffer import RingBuffer
+from processing.harmonics import harmonic_phasors
+from processing.tacho import debounced_edges
+
 
 class PolarPlotFeature:
     def __init__(self, parent=None, db=None, project_name='', channel=0, model_name=None, console=None):
         self.parent = parent
         self.db = db
         self.project_name = project_name
-        try:
-            self.channel = int(channel)  # Convert channel to integer
-        except (ValueError, TypeError):
-            self.channel = 0  # Default to channel 0 if conversion fails
-            if console:
-                console.append_to_console(f"Invalid channel input '{channel}', defaulting to 0")
+        self.channel_name = channel
         self.model_name = model_name
         self.console = console
+        self.channel = self.resolve_channel_index(channel)
+        self.scaling_factor = 3.3 / 65535.0
         self.widget = None
         self.plot_widget = None
-        self.curve = None
+        self.scatter = None
         self.grid_curves = []
+        self.grid_radius = 0.0
+        # One point per revolution: rows are 1X amplitude (pk-pk), 1X phase (deg) and speed (RPM).
+        self.history_points = 2000
+        self.vectors = RingBuffer(3, self.history_points, 1.0)
+        self.color_steps = 64
+        lookup_table = pg.colormap.get('viridis').getLookupTable(nPts=self.color_steps)
+        self.speed_brushes = [pg.mkBrush(*color) for color in lookup_table]
+        self.dirty = False
+        self.update_timer = QTimer()
+        self.update_timer.timeout.connect(self.update_plot)
+        self.update_timer.start(200)
         self.initUI()
 
+    def resolve_channel_index(self, channel):
+        try:
+            if isinstance(channel, str) and self.db:
+                project_data = self.db.get_project_data(self.project_name) or {}
+                for model in project_data.get("models", []):
+                    if model.get("name") == self.model_name:
+                        names = [ch.get("channelName") for ch in model.get("channels", [])]
+                        if channel in names:
+                            return names.index(channel)
+            return int(channel)
+        except (ValueError, TypeError):
+            if self.console:
+                self.console.append_to_console(f"Invalid channel input '{channel}', defaulting to 0")
+            return 0
+
     def initUI(self):
         self.widget = QWidget()
         layout = QVBoxLayout()
         self.widget.setLayout(layout)
 
         # Display label
-        label = QLabel(f"Polar Plot View for Model: {self.model_name}, Channel: {self.channel}")
-        layout.addWidget(label)
+        header = QHBoxLayout()
+        self.label = QLabel(f"Polar Plot View for Model: {self.model_name}, Channel: {self.channel_name}")
+        header.addWidget(self.label)
+        header.addStretch()
+        clear_button = QPushButton("Clear")
+        clear_button.setStyleSheet("""
+            QPushButton {
+                background-color: #f44336;
+                color: white;
+                border: none;
+                padding: 6px 12px;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #e53935;
+            }
+        """)
+        clear_button.clicked.connect(self.clear_history)
+        header.addWidget(clear_button)
+        layout.addLayout(header)
 
         # Create pyqtgraph plot widget
         self.plot_widget = pg.PlotWidget()
-        self.plot_widget.setBackground('k')  # White background
-        self.plot_widget.showGrid(x=True, y=True, alpha=0.3)
+        self.plot_widget.setBackground('w')
         self.plot_widget.setAspectLocked(True)  # Lock aspect ratio for circular appearance
-        self.plot_widget.setRange(xRange=[-1.5, 1.5], yRange=[-1.5, 1.5])  # Fixed range
         self.plot_widget.setMinimumSize(800, 800)  # Increase plot size
         self.plot_widget.setMouseEnabled(x=False, y=False)  # Disable zooming/panning
-
-        # Add circular grid
-        for r in [0.5, 1.0, 1.5]:
-            theta = np.linspace(0, 2 * np.pi, 100)
-            x = r * np.cos(theta)
-            y = r * np.sin(theta)
-            circle = self.plot_widget.plot(x, y, pen=pg.mkPen('k', width=0.5, style=pg.QtCore.Qt.DashLine))
-            self.grid_curves.append(circle)
-
-        # Add radial lines
-        for theta in np.linspace(0, 2 * np.pi, 8, endpoint=False):
-            x = [0, 1.5 * np.cos(theta)]
-            y = [0, 1.5 * np.sin(theta)]
-            line = self.plot_widget.plot(x, y, pen=pg.mkPen('k', width=0.5, style=pg.QtCore.Qt.DashLine))
-            self.grid_curves.append(line)
-
-        # Create data curve
-        self.curve = self.plot_widget.plot(pen=pg.mkPen('b', width=2), symbol='o', symbolSize=5, symbolPen='b', symbolBrush='b')
+        self.plot_widget.hideAxis('left')
+        self.plot_widget.hideAxis('bottom')
+        self.plot_widget.setTitle(f"1X Polar - Channel {self.channel_name}")
+
+        # Circular grid (3 rings) and radial lines every 45 degrees, rescaled by update_grid.
+        grid_pen = pg.mkPen('k', width=0.5, style=pg.QtCore.Qt.DashLine)
+        for _ in range(3 + 8):
+            self.grid_curves.append(self.plot_widget.plot(pen=grid_pen))
+        self.update_grid(1.0)
+
+        # One persistent item for all revolution vectors, coloured by speed.
+        self.scatter = pg.ScatterPlotItem(size=6, pen=None)
+        self.plot_widget.addItem(self.scatter)
         layout.addWidget(self.plot_widget)
 
+        self.speed_label = QLabel("Waiting for 1X vectors...")
+        layout.addWidget(self.speed_label)
+
         if not self.model_name and self.console:
             self.console.append_to_console("No model selected in PolarPlotFeature.")
         if self.channel is None and self.console:
@@ -67,41 +109,77 @@ class PolarPlotFeature:
     def get_widget(self):
         return self.widget
 
-    def on_data_received(self, tag_name, model_name, values, sample_rate):
+    def update_grid(self, radius):
+        """Rescale the rings and radial lines to ``radius`` (a 1-2-5 step above the largest amplitude)."""
+        magnitude = 10.0 ** np.floor(np.log10(radius)) if radius > 0 else 1.0
+        radius = next(step * magnitude for step in (1.0, 2.0, 5.0, 10.0) if step * magnitude >= radius)
+        if radius == self.grid_radius:
+            return
+        self.grid_radius = radius
+        theta = np.linspace(0, 2 * np.pi, 100)
+        for i, ring in enumerate((1.0 / 3.0, 2.0 / 3.0, 1.0)):
+            self.grid_curves[i].setData(ring * radius * np.cos(theta), ring * radius * np.sin(theta))
+        for i, angle in enumerate(np.linspace(0, 2 * np.pi, 8, endpoint=False)):
+            self.grid_curves[3 + i].setData([0, radius * np.cos(angle)], [0, radius * np.sin(angle)])
+        self.plot_widget.setRange(xRange=[-1.1 * radius, 1.1 * radius], yRange=[-1.1 * radius, 1.1 * radius], padding=0)
+
+    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index, record=None):
         if self.model_name != model_name:
-            if self.console:
-                self.console.append_to_console(f"Ignoring data for model {model_name}, expected {self.model_name}")
             return
 
-        if self.console:
-            self.console.append_to_console(
-                f"Polar Plot View ({self.model_name} - Channel {self.channel}): Received data for {tag_name}, {len(values)} channels"
-            )
-
         # Validate and extract data
-        if not isinstance(values, list) or self.channel >= len(values):
-            if self.console:
-                self.console.append_to_console(f"Invalid channel {self.channel} or values for {tag_name}")
+        main_channels = len(values) - 2 if len(values) >= 2 else len(values)
+        if not isinstance(values, list) or self.channel is None or self.channel >= main_channels:
+            logging.warning(f"Invalid channel {self.channel} or values for {tag_name}, frame {frame_index}")
             return
 
-        data = np.asarray(values[self.channel], dtype=float)
-        if data.size == 0:
+        try:
+            data = np.asarray(values[self.channel], dtype=np.float64) * self.scaling_factor
+            if data.size == 0:
+                return
+
+            tacho = record.tacho if record is not None else None
+            if tacho is not None and tacho.length == data.size:
+                bounds = tacho.edges
+            else:
+                bounds = debounced_edges(values[-1]) if len(values) >= 2 else np.empty(0, dtype=np.intp)
+            if len(bounds) < 2:
+                logging.debug(f"Polar Plot: fewer than two keyphasor edges for {tag_name}, frame {frame_index}")
+                return
+
+            phasors = harmonic_phasors(data, bounds, orders=(1,))[0, 0]
+            rpm = sample_rate * 60.0 / np.diff(bounds)
+            self.vectors.append(np.vstack((2.0 * np.abs(phasors), np.degrees(np.angle(phasors)) % 360.0, rpm)))
+            self.dirty = True
+        except Exception as e:
+            logging.error(f"Polar Plot error for {tag_name}, frame {frame_index}: {str(e)}")
             if self.console:
-                self.console.append_to_console(f"No data for channel {self.channel} in {tag_name}")
-            return
+                self.console.append_to_console(f"Polar Plot error for {tag_name}, frame {frame_index}: {str(e)}")
 
-        # Prepare polar plot data
-        theta = np.linspace(0, 2 * np.pi, len(data), endpoint=False)
-        r = data / (np.max(np.abs(data)) + 1e-12)  # Normalize to avoid division by zero
-
-        # Convert to Cartesian coordinates
-        x = r * np.cos(theta)
-        y = r * np.sin(theta)
-
-        # Clear previous data and update plot
-        self.curve.clear()
-        self.curve = self.plot_widget.plot(x, y, pen=pg.mkPen('b', width=2), symbol='o', symbolSize=5, symbolPen='b', symbolBrush='b')
-        self.plot_widget.setRange(xRange=[-1.5, 1.5], yRange=[-1.5, 1.5])  # Reset range to prevent zoom issues
-        self.plot_widget.setTitle(f"Polar Plot - {tag_name} (Channel {self.channel})")
-        if self.console:
-            self.console.append_to_console(f"Plotted {len(data)} points for channel {self.channel}")
\ No newline at end of file
+    def update_plot(self):
+        if not self.dirty:
+            return
+        self.dirty = False
+        amplitudes, phases, speeds = self.vectors.view()
+        radians = np.radians(phases)
+        low, high = speeds.min(), speeds.max()
+        steps = np.zeros(len(speeds), dtype=np.intp) if high <= low else \
+            ((speeds - low) * ((self.color_steps - 1) / (high - low))).astype(np.intp)
+        brushes = [self.speed_brushes[i] for i in steps]
+        self.update_grid(float(amplitudes.max()))
+        self.scatter.setData(x=amplitudes * np.cos(radians), y=amplitudes * np.sin(radians), brush=brushes)
+        self.speed_label.setText(
+            f"{len(self.vectors)} revolutions, speed {low:.0f}-{high:.0f} RPM (dark to light); "
+            f"latest 1X {amplitudes[-1]:.4f} V pk-pk at {phases[-1]:.0f} deg"
+        )
+
+    def clear_history(self):
+        self.vectors.clear()
+        self.scatter.clear()
+        self.dirty = False
+        self.speed_label.setText("Waiting for 1X vectors...")
+
+    def cleanup(self):
+        self.update_timer.stop()
+        self.vectors.clear()
+        self.scatter.clear()
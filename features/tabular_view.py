@@ -1,11 +1,13 @@
 import numpy as np
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QScrollArea, QPushButton, QCheckBox, QComboBox, QHBoxLayout, QGridLayout, QLabel
-from PyQt5.QtCore import Qt, QThread, QObject, pyqtSignal, QTimer
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableView, QHeaderView, QScrollArea, QPushButton, QCheckBox, QComboBox, QHBoxLayout, QGridLayout, QLabel
+from PyQt5.QtCore import Qt, QThread, QObject, pyqtSignal, QTimer, QAbstractTableModel, QModelIndex
 from PyQt5.QtGui import QIcon
 import pyqtgraph as pg
 from datetime import datetime
-import scipy.signal as signal
 import logging
+from processing.harmonics import revolution_bounds, harmonic_phasors, amplitude_phase
+from processing.filters import FIRFilterBank
+from processing.stats import RunningStats, CircularStats
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -83,6 +85,71 @@ class TabularViewWorker(QObject):
         finally:
             self.finished.emit()
 
+class TabularTableModel(QAbstractTableModel):
+    """Table model over a preallocated (channels, numeric columns) result array.
+
+    Cells are formatted lazily in ``data`` and a whole frame is published with
+    a single ``dataChanged`` covering every row, so the view repaints once.
+    """
+    HEADERS = ["Channel Name", "Unit", "DateTime", "RPM", "Gap", "Direct", "Bandpass", "1xA", "1xP", "2xA", "2xP", "NXAmp", "NXPhase"]
+    NUMERIC_HEADERS = HEADERS[3:]
+    AMPLITUDE_HEADERS = {"Direct", "Bandpass", "1xA", "2xA", "NXAmp"}
+
+    def __init__(self, amplitude_formatter, parent=None):
+        super().__init__(parent)
+        self.amplitude_formatter = amplitude_formatter
+        self.channel_names = []
+        self.units = []
+        self.timestamp = ""
+        self.values = np.zeros((0, len(self.NUMERIC_HEADERS)))
+
+    def set_channels(self, channel_names, units):
+        self.beginResetModel()
+        self.channel_names = list(channel_names)
+        self.units = list(units)
+        self.values = np.zeros((len(self.channel_names), len(self.NUMERIC_HEADERS)))
+        self.timestamp = datetime.now().strftime("%d-%b-%Y %I:%M:%S %p")
+        self.endResetModel()
+
+    def update_values(self, values):
+        rows = min(len(values), self.values.shape[0])
+        if rows == 0:
+            return
+        self.values[:rows] = values[:rows]
+        self.timestamp = datetime.now().strftime("%d-%b-%Y %I:%M:%S %p")
+        self.dataChanged.emit(self.index(0, 0), self.index(rows - 1, len(self.HEADERS) - 1), [Qt.DisplayRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.channel_names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role != Qt.DisplayRole:
+            return None
+        row, header = index.row(), self.HEADERS[index.column()]
+        if header == "Channel Name":
+            return self.channel_names[row]
+        if header == "Unit":
+            return self.units[row]
+        if header == "DateTime":
+            return self.timestamp
+        value = self.values[row, index.column() - 3]
+        if header in self.AMPLITUDE_HEADERS:
+            return self.amplitude_formatter([value], self.units[row])
+        return f"{value:.2f}"
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+
 class TabularViewFeature:
     def __init__(self, parent, db, project_name, channel=None, model_name=None, console=None):
         self.parent = parent
@@ -107,12 +174,9 @@ class TabularViewFeature:
         self.band_pass_peak_to_peak_times = [[]]
         self.average_frequency = [0.0]
         self.band_pass_peak_to_peak = [0.0]
-        self.one_x_amps = [[]]
-        self.one_x_phases = [[]]
-        self.two_x_amps = [[]]
-        self.two_x_phases = [[]]
-        self.three_x_amps = [[]]
-        self.three_x_phases = [[]]
+        self.harmonic_window = 100
+        self.harmonic_amplitudes = RunningStats((1, 3), self.harmonic_window)
+        self.harmonic_phases = CircularStats((1, 3), self.harmonic_window)
         self.start_time = datetime.now()
         self.column_visibility = {
             "Channel Name": True, "Unit": True, "DateTime": True, "RPM": True, "Gap": True,
@@ -120,8 +184,10 @@ class TabularViewFeature:
             "2xP": True, "NXAmp": True, "NXPhase": True
         }
         self.bandpass_selection = "None"
+        self.filter_bank = None
         self.plot_initialized = False
         self.table = None
+        self.table_model = None
         self.plot_widgets = []
         self.plots = []
         self.tag_name = ""
@@ -249,9 +315,10 @@ class TabularViewFeature:
         settings_layout.addWidget(QLabel(""), len(headers) // 3 + 1, 2)
         layout.addWidget(self.settings_panel)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
+        self.table_model = TabularTableModel(self.format_direct_value)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
         self.table.setFixedHeight(200)
         layout.addWidget(self.table)
 
@@ -289,7 +356,6 @@ class TabularViewFeature:
             self.tag_name = tag_name
             self.channel_properties = channel_properties
             self.project_id = project_id
-            self.table.setRowCount(self.num_channels)
             self.initialize_data_arrays()
             self.update_table_defaults()
             self.load_settings_from_database()
@@ -300,7 +366,6 @@ class TabularViewFeature:
             self.log_and_set_status(f"Error completing initialization: {str(ex)}")
             self.channel_names = ["Channel 1"]
             self.num_channels = 1
-            self.table.setRowCount(1)
             self.initialize_data_arrays()
             self.update_table_defaults()
             self.initialize_plots()
@@ -346,12 +411,8 @@ class TabularViewFeature:
         self.band_pass_peak_to_peak_times = [[] for _ in range(self.num_channels)]
         self.average_frequency = [0.0 for _ in range(self.num_channels)]
         self.band_pass_peak_to_peak = [0.0 for _ in range(self.num_channels)]
-        self.one_x_amps = [[] for _ in range(self.num_channels)]
-        self.one_x_phases = [[] for _ in range(self.num_channels)]
-        self.two_x_amps = [[] for _ in range(self.num_channels)]
-        self.two_x_phases = [[] for _ in range(self.num_channels)]
-        self.three_x_amps = [[] for _ in range(self.num_channels)]
-        self.three_x_phases = [[] for _ in range(self.num_channels)]
+        self.harmonic_amplitudes = RunningStats((self.num_channels, 3), self.harmonic_window)
+        self.harmonic_phases = CircularStats((self.num_channels, 3), self.harmonic_window)
         self.time_points = np.arange(4096) / self.sample_rate
         if self.console:
             self.console.append_to_console(f"Initialized data arrays for {self.num_channels} channels: {self.channel_names}")
@@ -360,24 +421,9 @@ class TabularViewFeature:
         if not self.table or not self.table_initialized:
             self.log_and_set_status("Table not initialized, skipping update_table_defaults")
             return
-        headers = ["Channel Name", "Unit", "DateTime", "RPM", "Gap", "Direct", "Bandpass", "1xA", "1xP", "2xA", "2xP", "NXAmp", "NXPhase"]
-        self.table.setRowCount(self.num_channels)
-        for row in range(self.num_channels):
-            channel_name = self.channel_names[row] if row < len(self.channel_names) else f"Channel {row+1}"
-            unit = self.channel_properties.get(channel_name, {"Unit": "mil"})["Unit"].lower()
-            logging.debug(f"Setting unit for channel {channel_name}: {unit}")
-            default_data = {
-                "Channel Name": channel_name,
-                "Unit": unit,
-                "DateTime": datetime.now().strftime("%d-%b-%Y %I:%M:%S %p"),
-                "RPM": "0.00", "Gap": "0.00", "Direct": "0.00", "Bandpass": "0.00",
-                "1xA": "0.00", "1xP": "0.00", "2xA": "0.00", "2xP": "0.00",
-                "NXAmp": "0.00", "NXPhase": "0.00"
-            }
-            for col, header in enumerate(headers):
-                item = QTableWidgetItem(default_data[header])
-                item.setTextAlignment(Qt.AlignCenter)
-                self.table.setItem(row, col, item)
+        units = [self.channel_properties.get(name, {"Unit": "mil"})["Unit"].lower() for name in self.channel_names[:self.num_channels]]
+        names = self.channel_names[:self.num_channels] + [f"Channel {row+1}" for row in range(len(self.channel_names), self.num_channels)]
+        self.table_model.set_channels(names, units + ["mil"] * (self.num_channels - len(units)))
         self.table.setFixedHeight(200)
         self.update_column_visibility()
         if self.console:
@@ -492,32 +538,16 @@ class TabularViewFeature:
             self.table.setColumnHidden(col, not self.column_visibility[header])
         logging.debug(f"Updated column visibility: {self.column_visibility}")
 
-    def compute_harmonics(self, data, start_idx, length, harmonic):
-        if length <= 0 or start_idx + length > len(data):
-            return 0.0, 0.0
-        sine_sum = cosine_sum = 0.0
-        for n in range(length):
-            global_idx = start_idx + n
-            theta = (2 * np.pi * harmonic * n) / length
-            sine_sum += data[global_idx] * np.sin(theta)
-            cosine_sum += data[global_idx] * np.cos(theta)
-        amplitude = np.sqrt((sine_sum / length) ** 2 + (cosine_sum / length) ** 2) * 2 if length > 0 else 0.0
-        phase = np.arctan2(cosine_sum, sine_sum) * (180.0 / np.pi) if length > 0 else 0.0
-        if phase < 0:
-            phase += 360
-        return amplitude, phase
-
-    def process_calibrated_data(self, data, channel_idx):
+    def calibration_factor(self, channel_idx):
         channel_name = self.channel_names[channel_idx] if channel_idx < len(self.channel_names) else f"Channel {channel_idx+1}"
         props = self.channel_properties.get(channel_name, {"Unit": "mil", "CorrectionValue": 1.0, "Gain": 1.0, "Sensitivity": 1.0})
-        channel_data = np.array(data, dtype=float) * (3.3 / 65535.0) * (props["CorrectionValue"] * props["Gain"]) / props["Sensitivity"]
+        factor = (3.3 / 65535.0) * (props["CorrectionValue"] * props["Gain"]) / props["Sensitivity"]
         unit = props["Unit"].lower()
         if unit == "mm":
-            channel_data /= 25.4  # Convert from mil to mm
+            factor /= 25.4  # Convert from mil to mm
         elif unit == "um":
-            channel_data *= 25.4 * 1000  # Convert from mil to um
-        logging.debug(f"Processed data for {channel_name} with unit {unit}, shape: {channel_data.shape}")
-        return channel_data
+            factor *= 25.4 * 1000  # Convert from mil to um
+        return factor
 
     def format_direct_value(self, values, unit):
         if not values or len(values) == 0:
@@ -533,12 +563,14 @@ class TabularViewFeature:
         logging.debug(f"Formatted direct value: {avg} in unit {unit}")
         return f"{avg:.2f}"
 
-    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index):
+    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index, record=None):
         if not values or len(values) < 1:
             self.log_and_set_status(f"Insufficient data received for frame {frame_index}: {len(values)} channels")
             return
         try:
             self.refresh_channel_properties()
+            tacho_freq_data = values[self.num_channels] if len(values) > self.num_channels else None
+            trigger_data = values[self.num_channels + 1] if len(values) > self.num_channels + 1 else None
             values = values[:self.num_channels] + [np.zeros(4096).tolist() for _ in range(self.num_channels - len(values))] if len(values) < self.num_channels else values[:self.num_channels]
             for i in range(len(values)):
                 if len(values[i]) < 4096:
@@ -550,96 +582,57 @@ class TabularViewFeature:
             if self.console:
                 self.console.append_to_console(f"Received data for frame {frame_index}, {len(values)} channels, updated channels: {self.channel_names}")
 
-            channel_data_list = []
-            for ch in range(self.num_channels):
-                channel_name = self.channel_names[ch] if ch < len(self.channel_names) else f"Channel {ch+1}"
-                props = self.channel_properties.get(channel_name, {"Unit": "mil"})
-                unit = props["Unit"].lower()
-                self.raw_data[ch] = self.process_calibrated_data(values[ch], ch)
-                nyquist = self.sample_rate / 2.0
-                tap_num = 31
-                if self.bandpass_selection == "50-200 Hz":
-                    band = [50 / nyquist, 200 / nyquist]
-                elif self.bandpass_selection == "100-300 Hz":
-                    band = [100 / nyquist, 300 / nyquist]
-                else:
-                    band = [50 / nyquist, 200 / nyquist]
-                low_pass_coeffs = signal.firwin(tap_num, 20 / nyquist, window='hamming')
-                high_pass_coeffs = signal.firwin(tap_num, 200 / nyquist, window='hamming', pass_zero=False)
-                band_pass_coeffs = signal.firwin(tap_num, band, window='hamming', pass_zero=False)
-                self.low_pass_data[ch] = signal.lfilter(low_pass_coeffs, 1.0, self.raw_data[ch])
-                self.high_pass_data[ch] = signal.lfilter(high_pass_coeffs, 1.0, self.raw_data[ch])
-                self.band_pass_data[ch] = signal.lfilter(band_pass_coeffs, 1.0, self.raw_data[ch])
+            frame_length = len(values[0]) if values else 0
+            scales = np.array([self.calibration_factor(ch) for ch in range(self.num_channels)])
+            calibrated = np.asarray(values, dtype=float) * scales[:, np.newaxis]
+            tacho = record.tacho if record is not None else None
+            if tacho is not None and tacho.length == frame_length:
+                bounds = tacho.bounds
+                has_revolutions = tacho.has_revolutions
+            else:
+                bounds = revolution_bounds(np.asarray(trigger_data[:frame_length]) if trigger_data is not None else None, frame_length)
+                has_revolutions = len(bounds) > 2 or bounds[0] != 0 or bounds[-1] != frame_length
+            # 1X/2X/3X for every channel and revolution in one batched projection.
+            phasors = harmonic_phasors(calibrated, bounds, (1, 2, 3))
+            harmonic_amps, harmonic_phases = amplitude_phase(phasors)
+            if tacho is not None and tacho.speed_hz > 0:
+                tacho_freq = tacho.speed_hz
+            elif has_revolutions:
+                tacho_freq = self.sample_rate / np.mean(np.diff(bounds))
+            elif tacho_freq_data is not None and len(tacho_freq_data) > 0:
+                tacho_freq = float(np.mean(tacho_freq_data)) / 100.0
+            else:
                 tacho_freq = 0.0
-                if len(values) > self.num_channels:
-                    tacho_data = values[self.num_channels]
-                    if len(tacho_data) > 1:
-                        peaks, _ = signal.find_peaks(tacho_data)
-                        if len(peaks) > 1:
-                            tacho_freq = self.sample_rate / np.mean(np.diff(peaks))
+            segment_starts = bounds[:-1] - bounds[0]
+            segment = slice(bounds[0], bounds[-1])
+            band = (100.0, 300.0) if self.bandpass_selection == "100-300 Hz" else (50.0, 200.0)
+            bands = {"low": (20.0, True), "high": (200.0, False), "band": (band, False)}
+            if self.filter_bank is None or not self.filter_bank.matches(self.num_channels, self.sample_rate, bands):
+                self.filter_bank = FIRFilterBank(self.num_channels, self.sample_rate, bands, taps=31)
+            filtered = self.filter_bank.process(calibrated)
+            self.harmonic_amplitudes.push(harmonic_amps)
+            self.harmonic_phases.push(harmonic_phases)
+
+            table_values = np.zeros((self.num_channels, len(TabularTableModel.NUMERIC_HEADERS)))
+            for ch in range(self.num_channels):
+                self.raw_data[ch] = calibrated[ch]
+                self.low_pass_data[ch] = filtered["low"][ch]
+                self.high_pass_data[ch] = filtered["high"][ch]
+                self.band_pass_data[ch] = filtered["band"][ch]
                 self.average_frequency[ch] = tacho_freq
-                trigger_indices = [0, len(self.raw_data[ch]) - 1]
-                band_pass_peak_to_peak_values = []
-                direct_values = []
-                one_x_amps, one_x_phases = [], []
-                two_x_amps, two_x_phases = [], []
-                three_x_amps, three_x_phases = [], []
-                for i in range(len(trigger_indices) - 1):
-                    start_idx = trigger_indices[i]
-                    end_idx = trigger_indices[i + 1]
-                    segment_length = end_idx - start_idx
-                    if segment_length <= 0 or start_idx >= len(self.raw_data[ch]) or end_idx > len(self.raw_data[ch]):
-                        continue
-                    segment_bp = self.band_pass_data[ch][start_idx:end_idx]
-                    segment_raw = self.raw_data[ch][start_idx:end_idx]
-                    if len(segment_bp) > 0:
-                        band_pass = np.ptp(segment_bp)
-                        if not np.isnan(band_pass):
-                            band_pass_peak_to_peak_values.append(band_pass)
-                    if len(segment_raw) > 0:
-                        direct = np.ptp(segment_raw)
-                        if not np.isnan(direct):
-                            direct_values.append(direct)
-                    amp1, phase1 = self.compute_harmonics(self.raw_data[ch], start_idx, segment_length, 1)
-                    amp2, phase2 = self.compute_harmonics(self.raw_data[ch], start_idx, segment_length, 2)
-                    amp3, phase3 = self.compute_harmonics(self.raw_data[ch], start_idx, segment_length, 3)
-                    one_x_amps.append(amp1)
-                    one_x_phases.append(phase1)
-                    two_x_amps.append(amp2)
-                    two_x_phases.append(phase2)
-                    three_x_amps.append(amp3)
-                    three_x_phases.append(phase3)
-                self.band_pass_peak_to_peak[ch] = np.mean(band_pass_peak_to_peak_values) if band_pass_peak_to_peak_values else 0.0
+                band_pass_segments = self.band_pass_data[ch][segment]
+                raw_segments = self.raw_data[ch][segment]
+                band_pass_peak_to_peak_values = (np.maximum.reduceat(band_pass_segments, segment_starts)
+                                                 - np.minimum.reduceat(band_pass_segments, segment_starts))
+                direct_values = list(np.maximum.reduceat(raw_segments, segment_starts) - np.minimum.reduceat(raw_segments, segment_starts))
+                self.band_pass_peak_to_peak[ch] = float(np.nanmean(band_pass_peak_to_peak_values)) if len(band_pass_peak_to_peak_values) else 0.0
                 self.band_pass_peak_to_peak_history[ch].append(self.band_pass_peak_to_peak[ch])
                 self.band_pass_peak_to_peak_times[ch].append((datetime.now() - self.start_time).total_seconds())
                 if len(self.band_pass_peak_to_peak_history[ch]) > 100:
                     self.band_pass_peak_to_peak_history[ch] = self.band_pass_peak_to_peak_history[ch][-100:]
                     self.band_pass_peak_to_peak_times[ch] = self.band_pass_peak_to_peak_times[ch][-100:]
-                self.one_x_amps[ch].append(np.mean(one_x_amps) if one_x_amps else 0.0)
-                self.one_x_phases[ch].append(np.mean(one_x_phases) if one_x_phases else 0.0)
-                self.two_x_amps[ch].append(np.mean(two_x_amps) if two_x_amps else 0.0)
-                self.two_x_phases[ch].append(np.mean(two_x_phases) if two_x_phases else 0.0)
-                self.three_x_amps[ch].append(np.mean(three_x_amps) if three_x_amps else 0.0)
-                self.three_x_phases[ch].append(np.mean(three_x_phases) if three_x_phases else 0.0)
-                direct_formatted = self.format_direct_value(direct_values, unit)
-                gap_value = 0.0
-                channel_data = {
-                    "Channel Name": channel_name,
-                    "Unit": unit,
-                    "DateTime": datetime.now().strftime("%d-%b-%Y %I:%M:%S %p"),
-                    "RPM": f"{self.average_frequency[ch] * 60.0:.2f}",
-                    "Gap": f"{gap_value:.2f}",
-                    "Direct": direct_formatted,
-                    "Bandpass": self.format_direct_value([self.band_pass_peak_to_peak[ch]], unit),
-                    "1xA": self.format_direct_value([np.mean(self.one_x_amps[ch])], unit) if self.one_x_amps[ch] else "0.00",
-                    "1xP": f"{np.mean(self.one_x_phases[ch]):.2f}" if self.one_x_phases[ch] else "0.00",
-                    "2xA": self.format_direct_value([np.mean(self.two_x_amps[ch])], unit) if self.two_x_amps[ch] else "0.00",
-                    "2xP": f"{np.mean(self.two_x_phases[ch]):.2f}" if self.two_x_phases[ch] else "0.00",
-                    "NXAmp": self.format_direct_value([np.mean(self.three_x_amps[ch])], unit) if self.three_x_amps[ch] else "0.00",
-                    "NXPhase": f"{np.mean(self.three_x_phases[ch]):.2f}" if self.three_x_phases[ch] else "0.00"
-                }
-                channel_data_list.append(channel_data)
-                self.update_table_row(ch, channel_data)
+                table_values[ch] = self.summary_row(ch, np.mean(direct_values) if direct_values else 0.0)
+            self.update_table(table_values)
             # Defer plot update to avoid UI blocking
             QTimer.singleShot(0, self.update_plots)
             if self.console:
@@ -647,19 +640,33 @@ class TabularViewFeature:
         except Exception as ex:
             self.log_and_set_status(f"Error processing data for frame {frame_index}: {str(ex)}")
 
-    def update_table_row(self, row, channel_data):
+    def summary_row(self, ch, direct):
+        """Numeric table columns for one channel, in TabularTableModel.NUMERIC_HEADERS order."""
+        amplitudes = self.harmonic_amplitudes.mean()[ch]
+        phases = self.harmonic_phases.mean()[ch] if self.harmonic_phases.count else np.zeros(3)
+        return [
+            self.average_frequency[ch] * 60.0,
+            0.0,
+            direct,
+            self.band_pass_peak_to_peak[ch],
+            amplitudes[0],
+            phases[0],
+            amplitudes[1],
+            phases[1],
+            amplitudes[2],
+            phases[2]
+        ]
+
+    def update_table(self, values):
         if not self.table or not self.table_initialized:
-            self.log_and_set_status("Table not initialized, skipping update_table_row")
+            self.log_and_set_status("Table not initialized, skipping update_table")
             return
-        headers = ["Channel Name", "Unit", "DateTime", "RPM", "Gap", "Direct", "Bandpass", "1xA", "1xP", "2xA", "2xP", "NXAmp", "NXPhase"]
         try:
-            for col, header in enumerate(headers):
-                item = QTableWidgetItem(channel_data[header])
-                item.setTextAlignment(Qt.AlignCenter)
-                self.table.setItem(row, col, item)
-            logging.debug(f"Updated table row {row} with unit: {channel_data['Unit']}")
+            if self.table_model.rowCount() != self.num_channels:
+                self.update_table_defaults()
+            self.table_model.update_values(values)
         except Exception as ex:
-            self.log_and_set_status(f"Error updating table row {row}: {str(ex)}")
+            self.log_and_set_status(f"Error updating table: {str(ex)}")
 
     def update_display(self):
         if not self.table or not self.table_initialized:
@@ -668,27 +675,9 @@ class TabularViewFeature:
             return
         try:
             self.refresh_channel_properties()
-            for ch in range(self.num_channels):
-                channel_name = self.channel_names[ch] if ch < len(self.channel_names) else f"Channel {ch+1}"
-                props = self.channel_properties.get(channel_name, {"Unit": "mil"})
-                unit = props["Unit"].lower()
-                direct_values = [np.ptp(self.raw_data[ch])] if np.any(self.raw_data[ch]) else []
-                channel_data = {
-                    "Channel Name": channel_name,
-                    "Unit": unit,
-                    "DateTime": datetime.now().strftime("%d-%b-%Y %I:%M:%S %p"),
-                    "RPM": f"{self.average_frequency[ch] * 60.0:.2f}" if self.average_frequency[ch] > 0 else "0.00",
-                    "Gap": "0.00",
-                    "Direct": self.format_direct_value(direct_values, unit),
-                    "Bandpass": self.format_direct_value([self.band_pass_peak_to_peak[ch]], unit),
-                    "1xA": self.format_direct_value([np.mean(self.one_x_amps[ch])], unit) if self.one_x_amps[ch] else "0.00",
-                    "1xP": f"{np.mean(self.one_x_phases[ch]):.2f}" if self.one_x_phases[ch] else "0.00",
-                    "2xA": self.format_direct_value([np.mean(self.two_x_amps[ch])], unit) if self.two_x_amps[ch] else "0.00",
-                    "2xP": f"{np.mean(self.two_x_phases[ch]):.2f}" if self.two_x_phases[ch] else "0.00",
-                    "NXAmp": self.format_direct_value([np.mean(self.three_x_amps[ch])], unit) if self.three_x_amps[ch] else "0.00",
-                    "NXPhase": f"{np.mean(self.three_x_phases[ch]):.2f}" if self.three_x_phases[ch] else "0.00"
-                }
-                self.update_table_row(ch, channel_data)
+            table_values = np.array([self.summary_row(ch, np.ptp(self.raw_data[ch]) if np.any(self.raw_data[ch]) else 0.0)
+                                     for ch in range(self.num_channels)])
+            self.update_table(table_values)
             QTimer.singleShot(0, self.update_plots)
             if self.console:
                 self.console.append_to_console(f"Updated display for all {self.num_channels} channels")
@@ -703,28 +692,23 @@ class TabularViewFeature:
         if ch >= self.num_channels:
             self.log_and_set_status("Selected channel not available, skipping plot update")
             return
-        trim_samples = 47
-        low_pass_trim = 0
-        high_pass_trim = 110
-        band_pass_trim = 110
-        raw_trim = trim_samples
-        if len(self.raw_data[ch]) <= trim_samples:
-            raw_trim = low_pass_trim = high_pass_trim = band_pass_trim = 0
         channel_name = self.channel_names[ch] if ch < len(self.channel_names) else f"Channel {ch+1}"
         unit = self.channel_properties.get(channel_name, {"Unit": "mil"})["Unit"].lower()
+        band_title = "100-300 Hz" if self.bandpass_selection == "100-300 Hz" else "50-200 Hz"
         data_sets = [
-            (self.raw_data[ch], raw_trim, "Raw Data"),
-            (self.low_pass_data[ch], low_pass_trim, "Low-Pass Filtered Data (20 Hz)"),
-            (self.high_pass_data[ch], high_pass_trim, "High-Pass Filtered Data (200 Hz)"),
-            (self.band_pass_data[ch], band_pass_trim, "Band-Pass Filtered Data (50-200 Hz)")
+            (self.raw_data[ch], "Raw Data"),
+            (self.low_pass_data[ch], "Low-Pass Filtered Data (20 Hz)"),
+            (self.high_pass_data[ch], "High-Pass Filtered Data (200 Hz)"),
+            (self.band_pass_data[ch], f"Band-Pass Filtered Data ({band_title})")
         ]
-        for i, (data, trim, title) in enumerate(data_sets):
+        if len(self.time_points) != len(self.raw_data[ch]):
+            self.time_points = np.arange(len(self.raw_data[ch])) / self.sample_rate
+        for i, (data, title) in enumerate(data_sets):
             try:
-                if len(data) <= trim:
+                if len(data) == 0:
                     data = np.array([0])
                     time_data = np.array([0])
                 else:
-                    data = data[trim:]
                     time_data = self.time_points[:len(data)]
                 if i < len(self.plots):
                     self.plots[i].setData(time_data, data)
@@ -761,7 +745,9 @@ class TabularViewFeature:
             if not model:
                 self.log_and_set_status(f"Model {self.model_name} not found")
                 return
-            self.channel_names = [c.get("channelName", f"Channel {i+1}") for i, c in enumerate(model["channels"])]
+            channel_names = [c.get("channelName", f"Channel {i+1}") for i, c in enumerate(model["channels"])]
+            channels_changed = channel_names != self.channel_names
+            self.channel_names = channel_names
             self.num_channels = len(self.channel_names)
             self.channel_properties = {}
             for channel in model["channels"]:
@@ -773,8 +759,13 @@ class TabularViewFeature:
                     "Gain": float(channel.get("gain", "1.0")) if channel.get("gain") else 1.0,
                     "Sensitivity": float(channel.get("sensitivity", "1.0")) if channel.get("sensitivity") else 1.0
                 }
-            self.table.setRowCount(self.num_channels)
+            if not channels_changed:
+                units = [self.channel_properties[name]["Unit"] for name in self.channel_names]
+                if self.table_model is not None and units != self.table_model.units:
+                    self.update_table_defaults()
+                return
             self.initialize_data_arrays()
+            self.filter_bank = None
             self.update_table_defaults()
             self.load_settings_from_database()
             self.initialize_plots()
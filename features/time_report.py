@@ -1,12 +1,14 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, QPushButton, QScrollArea, QDateTimeEdit, QGridLayout, QProgressDialog)
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QPropertyAnimation, QEasingCurve, Qt, QDateTime, QRect, pyqtSignal, QEvent, QObject, QTimer
+from PyQt5.QtCore import QPropertyAnimation, QEasingCurve, Qt, QDateTime, QRect, pyqtSignal, QEvent, QObject, QTimer, QThread
 from PyQt5.QtGui import QPainter, QPen, QBrush, QColor
 import pyqtgraph as pg
 from pyqtgraph import PlotWidget, mkPen, AxisItem, InfiniteLine, SignalProxy
 import numpy as np
 from datetime import datetime, timedelta
 import logging
+from processing.decimation import ViewportDecimator
+from processing.tacho import debounced_edges
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -122,6 +124,238 @@ class MouseTracker(QObject):
             self.feature.mouse_leave(self.idx)
         return False
 
+def parse_created_at(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def created_at_bound(timestamp):
+    return datetime.utcfromtimestamp(timestamp).isoformat(timespec='microseconds') + 'Z'
+
+
+class TimeReportLoader(QObject):
+    """Streams a recording's frames in frame-index order into preallocated arrays on a worker thread.
+
+    The time range is pushed into the query (``createdAt`` is an ISO string,
+    so a range on it works server-side), widened by a second to absorb
+    formatting differences and then checked exactly per frame.  Samples get
+    an implicit time base: each frame starts at its ``createdAt`` (or where
+    the previous frame ended, whichever is later) and advances by
+    ``1 / samplingRate``, so no per-sample timestamps are built in Python
+    and the result needs no sorting.
+    """
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    PROJECTION = {"_id": 0, "frameIndex": 1, "createdAt": 1, "samplingRate": 1, "numberOfChannels": 1, "message": 1}
+
+    def __init__(self, db, query, start_time, end_time, scaling_factor, batch_frames=50):
+        super().__init__()
+        self.db = db
+        self.query = dict(query)
+        self.query["createdAt"] = {"$gte": created_at_bound(start_time - 1.0), "$lte": created_at_bound(end_time + 1.0)}
+        self.start_time = start_time
+        self.end_time = end_time
+        self.scaling_factor = scaling_factor
+        self.batch_frames = batch_frames
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        result = None
+        try:
+            collection = self.db.timeview_collection
+            total = collection.count_documents(self.query)
+            if total == 0:
+                return
+            channels = tacho = None
+            starts = np.empty(total)
+            frames = 0
+            skipped = 0
+            previous_end = -np.inf
+            last_progress = -1
+            cursor = collection.find(self.query, self.PROJECTION, batch_size=self.batch_frames).sort("frameIndex", 1)
+            for processed, document in enumerate(cursor, 1):
+                if self.cancelled:
+                    break
+                progress = int(processed * 100 / total)
+                if progress != last_progress:
+                    self.progress.emit(progress)
+                    last_progress = progress
+                created_at = parse_created_at(document["createdAt"])
+                if not self.start_time <= created_at <= self.end_time:
+                    continue
+                message = document.get("message") or {}
+                if channels is None:
+                    num_channels = document.get("numberOfChannels", 0)
+                    channel_data = message.get("channel_data") or []
+                    if not num_channels or len(channel_data) != num_channels or not channel_data[0]:
+                        self.error.emit("Invalid channel data in recording")
+                        return
+                    sample_rate = float(document.get("samplingRate") or 4096)
+                    size = len(channel_data[0])
+                    tacho_size = len(message.get("tacho_freq") or [])
+                    channels = np.empty((num_channels, total * size), dtype=np.float32)
+                    tacho = np.empty((2, total * tacho_size), dtype=np.float32)
+                try:
+                    block = np.asarray(message["channel_data"], dtype=np.float32)
+                    tacho_block = np.asarray((message["tacho_freq"], message["tacho_trigger"]), dtype=np.float32)
+                except (KeyError, ValueError):
+                    block = tacho_block = None
+                if block is None or block.shape != (num_channels, size) or tacho_block.shape != (2, tacho_size):
+                    skipped += 1
+                    continue
+                channels[:, frames * size:(frames + 1) * size] = block
+                tacho[:, frames * tacho_size:(frames + 1) * tacho_size] = tacho_block
+                starts[frames] = max(created_at, previous_end)
+                previous_end = starts[frames] + size / sample_rate
+                frames += 1
+            cursor.close()
+            if self.cancelled or frames == 0:
+                return
+
+            channels = channels[:, :frames * size]
+            channels *= self.scaling_factor
+            tacho = tacho[:, :frames * tacho_size]
+            tacho[0] /= 100  # Matches time_view.py scaling
+            channel_times = (starts[:frames, np.newaxis] + np.arange(size) / sample_rate).ravel()
+            tacho_times = (starts[:frames, np.newaxis] + np.arange(tacho_size) / sample_rate).ravel()
+            first = np.searchsorted(channel_times, self.start_time, side='left')
+            last = np.searchsorted(channel_times, self.end_time, side='right')
+            tacho_first = np.searchsorted(tacho_times, self.start_time, side='left')
+            tacho_last = np.searchsorted(tacho_times, self.end_time, side='right')
+            result = {
+                "sample_rate": sample_rate,
+                "num_channels": num_channels,
+                "frames": frames,
+                "skipped": skipped,
+                "raw": True,
+                "samples_per_point": 1,
+                "start": self.start_time,
+                "end": self.end_time,
+                "channels": channels[:, first:last],
+                "channel_times": channel_times[first:last],
+                "tacho": tacho[:, tacho_first:tacho_last],
+                "tacho_times": tacho_times[tacho_first:tacho_last],
+            }
+        except Exception as e:
+            self.error.emit(f"Error loading Time Report data: {str(e)}")
+        finally:
+            self.finished.emit(result)
+
+
+class TimeReportEnvelopeLoader(QObject):
+    """Fetches a min/max envelope of a time span, reduced server-side to about ``columns`` points.
+
+    Used when the span holds too many samples to load raw.  With
+    ``chunk = ceil(samples / columns)`` samples per column, each frame's
+    arrays are cut into chunks and only every chunk's min and max leave the
+    server; once a column spans whole frames, ``stride`` frames are grouped
+    per column and reduced with ``$min``/``$max`` instead.  The result has
+    the same layout as :class:`TimeReportLoader`, with every column giving a
+    (min, max) pair of points at its start time.
+    """
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, db, query, start_time, end_time, num_channels, sample_rate, frame_size, columns, scaling_factor):
+        super().__init__()
+        self.db = db
+        self.query = dict(query)
+        self.query["createdAt"] = {"$gte": created_at_bound(start_time - frame_size / sample_rate - 1.0),
+                                   "$lte": created_at_bound(end_time + 1.0)}
+        self.start_time = start_time
+        self.end_time = end_time
+        self.num_channels = int(num_channels)
+        self.sample_rate = float(sample_rate)
+        self.frame_size = int(frame_size)
+        samples = (end_time - start_time) * self.sample_rate
+        self.chunk = max(1, int(np.ceil(samples / max(columns, 1))))
+        self.stride = self.chunk // self.frame_size
+        self.scaling_factor = scaling_factor
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def arrays(self):
+        channels = [{"$arrayElemAt": ["$message.channel_data", ch]} for ch in range(self.num_channels)]
+        return channels + ["$message.tacho_freq", "$message.tacho_trigger"]
+
+    def pipeline(self):
+        if self.stride >= 1:
+            group = {"_id": {"$floor": {"$divide": ["$frameIndex", self.stride]}}, "createdAt": {"$min": "$createdAt"}}
+            for i, array in enumerate(self.arrays()):
+                group[f"min{i}"] = {"$min": {"$min": array}}
+                group[f"max{i}"] = {"$max": {"$max": array}}
+            return [{"$match": self.query}, {"$group": group}, {"$sort": {"_id": 1}}]
+        chunks = {"$range": [0, self.frame_size, self.chunk]}
+        project = {"_id": 0, "frameIndex": 1, "createdAt": 1, "envelope": [
+            {"$map": {"input": chunks, "as": "i", "in": [
+                {"$min": {"$slice": [array, "$$i", self.chunk]}},
+                {"$max": {"$slice": [array, "$$i", self.chunk]}},
+            ]}} for array in self.arrays()
+        ]}
+        return [{"$match": self.query}, {"$sort": {"frameIndex": 1}}, {"$project": project}]
+
+    def run(self):
+        result = None
+        try:
+            rows = 2 + self.num_channels
+            times = []
+            columns = []
+            previous_end = -np.inf
+            frame_seconds = self.frame_size / self.sample_rate
+            offsets = np.arange(0, self.frame_size, self.chunk) / self.sample_rate
+            for document in self.db.timeview_collection.aggregate(self.pipeline(), allowDiskUse=True):
+                if self.cancelled:
+                    return
+                start = max(parse_created_at(document["createdAt"]), previous_end)
+                if self.stride >= 1:
+                    previous_end = start + self.stride * frame_seconds
+                    times.append([start])
+                    columns.append([[[document[f"min{i}"], document[f"max{i}"]]] for i in range(rows)])
+                else:
+                    envelope = document.get("envelope") or []
+                    if len(envelope) != rows or any(len(pairs) != len(offsets) for pairs in envelope):
+                        continue
+                    previous_end = start + frame_seconds
+                    times.append(start + offsets)
+                    columns.append(envelope)
+            if not times:
+                return
+            column_times = np.concatenate(times)
+            # (rows, columns, 2) -> interleaved min/max points per row.
+            envelope = np.concatenate([np.asarray(block, dtype=np.float64) for block in columns], axis=1)
+            values = envelope.reshape(rows, -1)
+            values[:self.num_channels] *= self.scaling_factor
+            values[self.num_channels] /= 100  # Matches time_view.py scaling
+            point_times = np.repeat(column_times, 2)
+            first = np.searchsorted(point_times, self.start_time - self.chunk / self.sample_rate, side='left')
+            last = np.searchsorted(point_times, self.end_time, side='right')
+            result = {
+                "sample_rate": self.sample_rate,
+                "num_channels": self.num_channels,
+                "frames": len(times),
+                "skipped": 0,
+                "raw": False,
+                "samples_per_point": self.chunk,
+                "start": self.start_time,
+                "end": self.end_time,
+                "channels": values[:self.num_channels, first:last],
+                "channel_times": point_times[first:last],
+                "tacho": values[self.num_channels:, first:last],
+                "tacho_times": point_times[first:last],
+            }
+        except Exception as e:
+            self.error.emit(f"Error loading Time Report envelope: {str(e)}")
+        finally:
+            self.finished.emit(result)
+
+
 class TimeReportFeature:
     def __init__(self, parent, db, project_name, channel=None, model_name=None, console=None):
         self.parent = parent
@@ -153,6 +387,21 @@ class TimeReportFeature:
         self.end_time = None
         self.use_full_range = True
         self.scaling_factor = 3.3 / 65535  # Matches time_view.py
+        self.loader = None
+        self.loader_thread = None
+        self.loader_threads = []  # Every loader thread still running, superseded ones included
+        self.progress_dialog = None
+        self.file_info = None
+        self.frame_size = None
+        self.report_filename = None
+        self.report_query = None
+        self.report_end_time = None
+        self.loaded_view = None
+        self.raw_samples_limit = 200000  # Per channel; wider spans are fetched as a min/max envelope
+        self.viewport_debounce_ms = 250
+        self.viewport_timer = QTimer()
+        self.viewport_timer.setSingleShot(True)
+        self.viewport_timer.timeout.connect(self.fetch_viewport)
         self.init_ui_deferred()
 
     def init_ui_deferred(self):
@@ -354,6 +603,7 @@ class TimeReportFeature:
         # Clear existing plots
         self.plot_widgets = []
         self.plots = []
+        self.decimators = []
         self.data = []
         self.vlines = []
         self.proxies = []
@@ -384,6 +634,7 @@ class TimeReportFeature:
             plot = plot_widget.plot([], [], pen=pen)
             self.plots.append(plot)
             self.plot_widgets.append(plot_widget)
+            self.decimators.append(ViewportDecimator(plot_widget, plot))
             self.data.append([])
 
             vline = InfiniteLine(angle=90, movable=False, pen=mkPen('r', width=2))
@@ -478,12 +729,8 @@ class TimeReportFeature:
             return
 
         try:
-            messages = self.db.get_timeview_messages(
-                self.project_name,
-                model_name=self.model_name,
-                filename=filename
-            )
-            if not messages:
+            span = self.db.get_timeview_time_span(self.project_name, self.model_name, filename)
+            if not span:
                 self.start_time_label.setText("File Start Time: N/A")
                 self.stop_time_label.setText("File Stop Time: N/A")
                 self.start_time_edit.setEnabled(False)
@@ -497,15 +744,14 @@ class TimeReportFeature:
                 return
 
             timestamps = []
-            for msg in messages:
+            self.file_info = span
+            for created_at in (span["start"], span["end"]):
                 try:
-                    created_at = datetime.fromisoformat(msg['createdAt'].replace('Z', '+00:00')).timestamp()
-                    timestamps.append(created_at)
+                    timestamps.append(parse_created_at(created_at))
                 except Exception as e:
                     logging.warning(f"Invalid timestamp in {filename}: {e}")
                     if self.console:
                         self.console.append_to_console(f"Invalid timestamp in {filename}: {e}")
-                    continue
 
             if timestamps:
                 self.file_start_time = datetime.fromtimestamp(min(timestamps))
@@ -603,8 +849,8 @@ class TimeReportFeature:
                     self.time_slider.blockSignals(False)
 
     def clear_plots(self):
-        for plot in self.plots:
-            plot.setData([], [])
+        for decimator in self.decimators:
+            decimator.clear()
         for widget in self.plot_widgets:
             widget.clear()
             widget.addLegend()
@@ -615,10 +861,19 @@ class TimeReportFeature:
         self.channel_times = []
         self.tacho_times = []
         self.trigger_lines = [None] * (self.num_plots - 1) + [[]]
+        self.report_query = None  # Stop following the viewport until the next plot_data
+        self.loaded_view = None
         logging.debug("Cleared all plots")
 
     def plot_data(self):
-        """Plot data for the selected file and time range with a progress dialog."""
+        """Set up the plots for the selected file and time range; the data follows the viewport.
+
+        The x axes are linked, and every (debounced) change of the visible span
+        fetches just that span in the background: raw samples when it is
+        short enough, otherwise a server-side min/max envelope at about one
+        column per pixel.  Memory therefore stays bounded from hours down to
+        milliseconds.
+        """
         filename = self.file_combo.currentText()
         if not filename or filename in ["No Files Available", "Error Loading Files"]:
             self.clear_plots()
@@ -626,227 +881,198 @@ class TimeReportFeature:
                 self.console.append_to_console("No valid file selected to plot.")
             return
 
-        # Initialize progress dialog
-        progress = QProgressDialog("Loading and plotting data...", "Cancel", 0, 100, self.widget)
-        progress.setWindowModality(Qt.WindowModal)
-        progress.setMinimumDuration(0)
-        progress.setValue(0)
-        progress.show()
-        QApplication.processEvents()
+        if self.use_full_range and self.file_start_time and self.file_end_time:
+            self.start_time = self.file_start_time.timestamp()
+            self.end_time = self.file_end_time.timestamp()
+            self.start_time_edit.setDateTime(QDateTime(self.file_start_time))
+            self.end_time_edit.setDateTime(QDateTime(self.file_end_time))
+            self.time_slider.setValues(0, 1000)
 
-        try:
-            # Fetch messages
-            progress.setLabelText("Fetching data from database...")
-            progress.setValue(10)
-            messages = self.db.get_timeview_messages(
-                self.project_name,
-                model_name=self.model_name,
-                filename=filename
-            )
-            if not messages:
-                self.clear_plots()
-                progress.setValue(100)
-                progress.close()
-                if self.console:
-                    self.console.append_to_console(f"No data found for filename {filename}")
-                return
-
-            # Sort messages by timestamp to ensure chronological order
-            progress.setLabelText("Sorting messages...")
-            progress.setValue(15)
-            messages.sort(key=lambda x: datetime.fromisoformat(x['createdAt'].replace('Z', '+00:00')).timestamp())
-
-            # Determine number of channels dynamically
-            first_msg = messages[0]
-            num_channels = first_msg.get('numberOfChannels', 0)
-            tacho_channels_count = self.tacho_channels_count
-            if not num_channels or len(first_msg['message']['channel_data']) != num_channels:
-                self.clear_plots()
-                progress.setValue(100)
-                progress.close()
-                if self.console:
-                    self.console.append_to_console(f"Invalid channel data in {filename}")
-                return
+        if self.start_time is None or self.end_time is None or self.start_time >= self.end_time:
+            self.clear_plots()
+            if self.console:
+                self.console.append_to_console("Error: Start time must be before end time.")
+            return
 
-            # Initialize plots with dynamic channel counts
-            progress.setLabelText("Initializing plots...")
-            progress.setValue(20)
-            self.init_plots(num_channels, tacho_channels_count)
+        info = self.file_info or {}
+        num_channels = info.get("numberOfChannels") or 0
+        if not num_channels:
+            self.clear_plots()
+            if self.console:
+                self.console.append_to_console(f"Invalid channel data in {filename}")
+            return
 
-            if self.use_full_range:
-                self.start_time = self.file_start_time.timestamp()
-                self.end_time = self.file_end_time.timestamp()
-                self.start_time_edit.setDateTime(QDateTime(self.file_start_time))
-                self.end_time_edit.setDateTime(QDateTime(self.file_end_time))
-                self.time_slider.setValues(0, 1000)
+        self.cancel_loading()
+        self.sample_rate = float(info.get("samplingRate") or 4096)
+        self.frame_size = int(info.get("samplingSize") or 4096)
+        self.report_filename = filename
+        self.report_query = {"project_name": self.project_name, "email": self.db.email, "model_name": self.model_name, "filename": filename}
+        # The selected range ends where the last frame's samples end.
+        self.report_end_time = self.end_time + self.frame_size / self.sample_rate
+        self.loaded_view = None
+        self.init_plots(num_channels, self.tacho_channels_count)
+        main_view = self.plot_widgets[0].getViewBox()
+        for widget in self.plot_widgets[1:]:
+            widget.setXLink(self.plot_widgets[0])
+        main_view.sigXRangeChanged.connect(self.schedule_viewport_fetch)
+        main_view.sigResized.connect(self.on_viewport_resized)
+
+        self.progress_dialog = QProgressDialog("Loading data...", "Cancel", 0, 100, self.widget)
+        self.progress_dialog.setWindowModality(Qt.NonModal)
+        self.progress_dialog.setMinimumDuration(0)
+        self.progress_dialog.setValue(0)
+        self.progress_dialog.canceled.connect(self.on_progress_canceled)
+        self.ok_button.setEnabled(False)
+        self.plot_widgets[0].setXRange(self.start_time, self.report_end_time, padding=0)
+        self.viewport_timer.stop()
+        self.fetch_viewport()
 
-            if self.start_time >= self.end_time:
-                self.clear_plots()
-                progress.setValue(100)
-                progress.close()
-                if self.console:
-                    self.console.append_to_console("Error: Start time must be before end time.")
-                return
+    def schedule_viewport_fetch(self, *args):
+        self.viewport_timer.start(self.viewport_debounce_ms)
 
-            # Filter messages by time range
-            progress.setLabelText("Filtering messages by time range...")
-            progress.setValue(25)
-            filtered_messages = [
-                msg for msg in messages
-                if self.start_time <= datetime.fromisoformat(msg['createdAt'].replace('Z', '+00:00')).timestamp() <= self.end_time
-            ]
+    def on_viewport_resized(self, *args):
+        if self.loaded_view is not None:  # Layout changes while the first load runs would only restart it
+            self.schedule_viewport_fetch()
 
-            if not filtered_messages:
+    def fetch_viewport(self):
+        """Load the visible span (plus half a span each side, for panning) at the resolution the plot width needs."""
+        if not self.plot_widgets or self.report_query is None:
+            return
+        view_box = self.plot_widgets[0].getViewBox()
+        x_min, x_max = view_box.viewRange()[0]
+        x_min, x_max = max(x_min, self.start_time), min(x_max, self.report_end_time)
+        if x_max <= x_min:
+            return
+        width = max(int(view_box.width()), 100)
+        span = x_max - x_min
+        samples_per_pixel = span * self.sample_rate / width
+        if self.loaded_view is not None:
+            loaded_start, loaded_end, loaded_samples_per_pixel = self.loaded_view
+            if loaded_start <= x_min and x_max <= loaded_end and loaded_samples_per_pixel <= max(samples_per_pixel, 1.0):
+                return  # Already on screen at enough detail
+        fetch_start = max(x_min - span / 2, self.start_time)
+        fetch_end = min(x_max + span / 2, self.report_end_time)
+        columns = int(width * (fetch_end - fetch_start) / span)
+
+        self.cancel_loading()
+        if (fetch_end - fetch_start) * self.sample_rate <= self.raw_samples_limit:
+            loader = TimeReportLoader(self.db, self.report_query, fetch_start - self.frame_size / self.sample_rate,
+                                      fetch_end, self.scaling_factor)
+        else:
+            loader = TimeReportEnvelopeLoader(self.db, self.report_query, fetch_start, fetch_end, self.num_channels,
+                                              self.sample_rate, self.frame_size, columns, self.scaling_factor)
+        self.loader = loader
+        self.loader_thread = thread = QThread()
+        self.loader_threads.append(thread)
+        self.loader.moveToThread(thread)
+        thread.started.connect(self.loader.run)
+        if self.progress_dialog is not None:
+            self.loader.progress.connect(self.progress_dialog.setValue)
+        self.loader.error.connect(self.on_loading_error)
+        self.loader.finished.connect(lambda result, name=self.report_filename, loader=loader: self.on_loading_finished(name, result, loader))
+        self.loader.finished.connect(thread.quit)
+        self.loader.finished.connect(self.loader.deleteLater)
+        # The worker's finished is handled before the thread has stopped, so the
+        # reference is only dropped once the thread itself reports finished.
+        thread.finished.connect(lambda thread=thread: self.on_loader_thread_finished(thread))
+        thread.finished.connect(thread.deleteLater)
+        thread.start()
+
+    def cancel_loading(self, wait=False):
+        """Abandon the current load without blocking; its thread winds down on its own.
+
+        A superseded loader only stops at its next batch, and its result is
+        dropped by ``on_loading_finished``.  With ``wait`` every loader thread
+        is stopped before returning, for ``cleanup``.
+        """
+        if self.loader is not None:
+            self.loader.cancel()
+        self.loader = None
+        if wait:
+            for thread in self.loader_threads:
+                thread.quit()
+                thread.wait()
+
+    def on_loader_thread_finished(self, thread):
+        if thread in self.loader_threads:
+            self.loader_threads.remove(thread)
+        if thread is self.loader_thread:
+            self.loader_thread = None
+
+    def on_progress_canceled(self):
+        self.cancel_loading()
+        self.close_progress_dialog()
+
+    def close_progress_dialog(self):
+        self.ok_button.setEnabled(True)
+        if self.progress_dialog is not None:
+            self.progress_dialog.canceled.disconnect(self.on_progress_canceled)
+            self.progress_dialog.close()
+            self.progress_dialog = None
+
+    def on_loading_error(self, message):
+        logging.error(message)
+        if self.console:
+            self.console.append_to_console(message)
+
+    def on_loading_finished(self, filename, result, loader):
+        if loader is not self.loader:
+            return  # A cancelled or superseded load
+        self.loader = None
+        first_load = self.progress_dialog is not None
+        self.close_progress_dialog()
+        if result is None:
+            if first_load:
                 self.clear_plots()
-                progress.setValue(100)
-                progress.close()
                 if self.console:
                     self.console.append_to_console(f"No data within time range for filename {filename}")
-                return
-
-            # Initialize data arrays
-            progress.setLabelText("Preparing data arrays...")
-            progress.setValue(30)
-            channel_data_agg = [[] for _ in range(self.num_channels)]
-            tacho_freq_agg = []
-            tacho_trigger_agg = []
-            channel_times_agg = []
-            tacho_times_agg = []
-            self.sample_rate = filtered_messages[0].get('samplingRate', 4096)
-            total_messages = len(filtered_messages)
-
-            # Process messages
-            progress.setLabelText("Processing messages...")
-            for i, msg in enumerate(filtered_messages):
-                progress.setValue(30 + int((i / total_messages) * 50))  # 30% to 80%
-                QApplication.processEvents()
-                if progress.wasCanceled():
-                    self.clear_plots()
-                    progress.close()
-                    return
-
-                created_at = datetime.fromisoformat(msg['createdAt'].replace('Z', '+00:00')).timestamp()
-                channel_data = msg['message']['channel_data']
-                tacho_freq = msg['message']['tacho_freq']
-                tacho_trigger = msg['message']['tacho_trigger']
-                channel_samples = msg.get('samplingSize', 4096)
-                tacho_samples = len(tacho_freq)
-
-                if len(channel_data) != self.num_channels or len(tacho_freq) != tacho_samples or len(tacho_trigger) != tacho_samples:
-                    if self.console:
-                        self.console.append_to_console(f"Data length mismatch in message at {created_at} for {filename}")
-                    continue
-
-                # Calculate time arrays in ascending order
-                channel_time_step = 1.0 / self.sample_rate
-                tacho_time_step = 1.0 / self.sample_rate
-                channel_times = np.array([
-                    created_at + i * channel_time_step
-                    for i in range(channel_samples)
-                ])
-                tacho_times = np.array([
-                    created_at + i * tacho_time_step
-                    for i in range(tacho_samples)
-                ])
-
-                # Filter by time range
-                channel_mask = (channel_times >= self.start_time) & (channel_times <= self.end_time)
-                tacho_mask = (tacho_times >= self.start_time) & (tacho_times <= self.end_time)
-
-                # Ensure data is appended in chronological order
-                for ch in range(self.num_channels):
-                    filtered_data = np.array(channel_data[ch])[channel_mask] * self.scaling_factor
-                    if len(filtered_data) > 0:
-                        channel_data_agg[ch].extend(filtered_data)
-                filtered_tacho_freq = np.array(tacho_freq)[tacho_mask] / 100  # Matches time_view.py scaling
-                if len(filtered_tacho_freq) > 0:
-                    tacho_freq_agg.extend(filtered_tacho_freq)
-                filtered_tacho_trigger = np.array(tacho_trigger)[tacho_mask]
-                if len(filtered_tacho_trigger) > 0:
-                    tacho_trigger_agg.extend(filtered_tacho_trigger)
-                filtered_channel_times = channel_times[channel_mask]
-                if len(filtered_channel_times) > 0:
-                    channel_times_agg.extend(filtered_channel_times)
-                filtered_tacho_times = tacho_times[tacho_mask]
-                if len(filtered_tacho_times) > 0:
-                    tacho_times_agg.extend(filtered_tacho_times)
-
-            # Sort aggregated times to ensure chronological order
-            if channel_times_agg:
-                channel_sort_indices = np.argsort(channel_times_agg)
-                channel_times_agg = np.array(channel_times_agg)[channel_sort_indices]
-                for ch in range(self.num_channels):
-                    if channel_data_agg[ch]:
-                        channel_data_agg[ch] = np.array(channel_data_agg[ch])[channel_sort_indices]
-            if tacho_times_agg:
-                tacho_sort_indices = np.argsort(tacho_times_agg)
-                tacho_times_agg = np.array(tacho_times_agg)[tacho_sort_indices]
-                tacho_freq_agg = np.array(tacho_freq_agg)[tacho_sort_indices]
-                tacho_trigger_agg = np.array(tacho_trigger_agg)[tacho_sort_indices]
-
-            # Assign data to plots
-            progress.setLabelText("Assigning data to plots...")
-            progress.setValue(80)
-            for ch in range(self.num_channels):
-                self.data[ch] = np.array(channel_data_agg[ch])
-            self.data[self.num_channels] = np.array(tacho_freq_agg)
-            if self.tacho_channels_count >= 2:
-                self.data[self.num_plots - 1] = np.array(tacho_trigger_agg)
-            self.channel_times = np.array(channel_times_agg)
-            self.tacho_times = np.array(tacho_times_agg)
-
-            # Clear and update plots
-            progress.setLabelText("Updating plots...")
-            progress.setValue(90)
-            for widget in self.plot_widgets:
-                widget.clear()
-                widget.addLegend()
-                widget.showGrid(x=True, y=True)
-                if widget.getAxis('left').labelText.startswith('Tacho Trigger'):
-                    widget.setYRange(-0.5, 1.5, padding=0)
-
-            colors = ['r', 'g', 'b', 'y', 'c', 'm', 'k', 'w', '#FF4500', '#32CD32', '#00CED1', '#FFD700', '#FF69B4', '#8A2BE2', '#FF6347', '#20B2AA', '#ADFF2F', '#9932CC', '#FF7F50', '#00FA9A', '#9400D3']
-            for ch in range(self.num_plots):
-                times = self.tacho_times if ch >= self.num_channels else self.channel_times
-                if len(self.data[ch]) > 0 and len(times) > 0:
-                    pen = mkPen(color=colors[ch % len(colors)], width=2)
-                    self.plots[ch] = self.plot_widgets[ch].plot(times, self.data[ch], pen=pen)
-                    self.plot_widgets[ch].setXRange(self.start_time, self.end_time, padding=0)
-                    if ch < self.num_channels:
-                        self.plot_widgets[ch].enableAutoRange(axis='y')
-                    elif ch == self.num_channels:
-                        self.plot_widgets[ch].enableAutoRange(axis='y')
-                else:
-                    if self.console:
-                        self.console.append_to_console(f"No data for plot {ch} in time range")
-
-            # Add trigger lines
-            if self.tacho_channels_count >= 2 and len(self.data[self.num_plots - 1]) > 0 and len(self.tacho_times) > 0:
-                trigger_indices = np.where(self.data[self.num_plots - 1] == 1)[0]
-                self.trigger_lines = [None] * (self.num_plots - 1) + [[]]
-                for idx in trigger_indices:
-                    if idx < len(self.tacho_times):
-                        line = InfiniteLine(
-                            pos=self.tacho_times[idx],
-                            angle=90,
-                            movable=False,
-                            pen=mkPen('k', width=2, style=Qt.SolidLine)
-                        )
-                        self.plot_widgets[self.num_plots - 1].addItem(line)
-                        self.trigger_lines[self.num_plots - 1].append(line)
-
-            progress.setValue(100)
-            progress.close()
-            if self.console:
-                self.console.append_to_console(f"Time Report ({self.model_name}): Plotted {self.num_plots} plots for {filename}")
+            return
+        try:
+            self.show_loaded_data(result)
+            if first_load and self.console:
+                skipped = f", skipped {result['skipped']} malformed frames" if result["skipped"] else ""
+                self.console.append_to_console(
+                    f"Time Report ({self.model_name}): Plotted {self.num_plots} plots for {filename} "
+                    f"from {result['frames']} {'frames' if result['raw'] else 'envelope columns'}{skipped}"
+                )
         except Exception as e:
             logging.error(f"Error plotting data: {str(e)}")
             self.clear_plots()
-            progress.setValue(100)
-            progress.close()
             if self.console:
                 self.console.append_to_console(f"Error plotting data: {str(e)}")
 
+    def show_loaded_data(self, result):
+        self.sample_rate = result["sample_rate"]
+        self.loaded_view = (result["start"], result["end"], result["samples_per_point"])
+        for ch in range(self.num_channels):
+            self.data[ch] = result["channels"][ch]
+        self.data[self.num_channels] = result["tacho"][0]
+        if self.tacho_channels_count >= 2:
+            self.data[self.num_plots - 1] = result["tacho"][1]
+        self.channel_times = result["channel_times"]
+        self.tacho_times = result["tacho_times"]
+
+        for ch in range(self.num_plots):
+            times = self.tacho_times if ch >= self.num_channels else self.channel_times
+            if len(self.data[ch]) > 0 and len(times) > 0:
+                self.decimators[ch].set_data(times, self.data[ch])
+                if ch <= self.num_channels:
+                    self.plot_widgets[ch].enableAutoRange(axis='y')
+            else:
+                self.decimators[ch].clear()
+
+        # Trigger lines: one item drawing a vertical segment per keyphasor edge, only at raw resolution.
+        trigger_widget = self.plot_widgets[self.num_plots - 1]
+        for line in self.trigger_lines[-1] if self.trigger_lines and self.trigger_lines[-1] else []:
+            trigger_widget.removeItem(line)
+        self.trigger_lines = [None] * (self.num_plots - 1) + [[]]
+        if result["raw"] and self.tacho_channels_count >= 2 and len(self.data[self.num_plots - 1]) > 0 and len(self.tacho_times) > 0:
+            edges = self.tacho_times[debounced_edges(self.data[self.num_plots - 1])]
+            x = np.repeat(edges, 2)
+            y = np.tile([-0.5, 1.5], len(edges))
+            line = trigger_widget.plot(x, y, pen=mkPen('k', width=2), connect='pairs')
+            self.trigger_lines[-1].append(line)
+
     def mouse_enter(self, idx):
         self.active_line_idx = idx
         self.vlines[idx].setVisible(True)
@@ -874,5 +1100,10 @@ class TimeReportFeature:
             vline.setPos(x)
             vline.setVisible(True)
 
+    def cleanup(self):
+        self.viewport_timer.stop()
+        self.cancel_loading(wait=True)
+        self.close_progress_dialog()
+
     def get_widget(self):
         return self.widget
\ No newline at end of file
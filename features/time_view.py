@@ -7,6 +7,9 @@ from datetime import datetime
 import time
 import re
 import logging
+from processing.ring_buffer import RingBuffer
+from processing.decimation import ViewportDecimator
+from processing.history import TieredHistory
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -41,8 +44,13 @@ class TimeViewFeature:
         self.widget = None
         self.plot_widgets = []
         self.plots = []
-        self.fifo_data = []
-        self.fifo_times = []
+        self.decimators = []
+        self.fifo = None
+        self.history = None
+        self.history_seconds = 60
+        self.is_paused = False
+        self.pause_button = None
+        self.channel_scales = None
         self.sample_rate = None
         self.main_channels = None
         self.tacho_channels_count = None
@@ -65,6 +73,27 @@ class TimeViewFeature:
 
         top_layout = QHBoxLayout()
         top_layout.addStretch()
+        self.pause_button = QPushButton("⏸ Pause")
+        self.pause_button.setStyleSheet("""
+            QPushButton {
+                background-color: #607D8B;
+                color: white;
+                border: none;
+                padding: 8px 16px;
+                border-radius: 4px;
+                font-size: 14px;
+                min-width: 120px;
+            }
+            QPushButton:hover {
+                background-color: #546E7A;
+            }
+            QPushButton:pressed {
+                background-color: #455A64;
+            }
+        """)
+        self.pause_button.setToolTip("Freeze the live view and scroll back through the last hour")
+        self.pause_button.clicked.connect(self.toggle_pause)
+        top_layout.addWidget(self.pause_button)
         self.settings_button = QPushButton("⚙️ Settings")
         self.settings_button.setStyleSheet("""
             QPushButton {
@@ -189,8 +218,8 @@ class TimeViewFeature:
 
         self.plot_widgets = []
         self.plots = []
-        self.fifo_data = []
-        self.fifo_times = []
+        self.decimators = []
+        self.fifo = None
         self.needs_refresh = []
 
         self.scroll_content = QWidget()
@@ -215,9 +244,10 @@ class TimeViewFeature:
             plot = plot_widget.plot([], [], pen=pen, name=f'Channel {i+1}')
             self.plots.append(plot)
             self.plot_widgets.append(plot_widget)
-            self.fifo_data.append([])
-            self.fifo_times.append([])
+            self.decimators.append(ViewportDecimator(plot_widget, plot))
             self.needs_refresh.append(True)
+            plot_widget.getPlotItem().getViewBox().sigXRangeChanged.connect(
+                lambda view_box, x_range, idx=i: self.load_history_range(idx))
 
             self.scroll_layout.addWidget(plot_widget)
 
@@ -230,11 +260,13 @@ class TimeViewFeature:
             self.log_and_set_status("Buffer initialization failed: Missing sample_rate, num_plots, or samples_per_channel")
             return
         self.fifo_window_samples = int(self.sample_rate * self.window_seconds)
-        current_time = time.time()
-        time_step = 1.0 / self.sample_rate
+        self.fifo = RingBuffer(self.num_plots, self.fifo_window_samples, self.sample_rate)
+        self.history = TieredHistory(self.num_plots, self.sample_rate, full_seconds=self.history_seconds)
+        self.channel_scales = np.ones(self.num_plots)
+        self.channel_scales[:self.main_channels] = self.scaling_factor
+        if self.tacho_channels_count >= 1:
+            self.channel_scales[self.main_channels] = 1 / 100
         for i in range(self.num_plots):
-            self.fifo_data[i] = np.zeros(self.fifo_window_samples)
-            self.fifo_times[i] = np.array([current_time - (self.fifo_window_samples - 1 - j) * time_step for j in range(self.fifo_window_samples)])
             self.needs_refresh[i] = True
         logging.debug(f"Initialized FIFO buffers: {self.num_plots} channels, {self.fifo_window_samples} samples each")
         self.is_initialized = True
@@ -258,6 +290,34 @@ class TimeViewFeature:
         except Exception as e:
             self.log_and_set_status(f"Error loading project data: {str(e)}")
 
+    def toggle_pause(self):
+        self.is_paused = not self.is_paused
+        if self.is_paused:
+            self.pause_button.setText("▶ Live")
+            for ch in range(len(self.plot_widgets)):
+                self.load_history_range(ch)
+            span = self.history.span() if self.history else None
+            if span and self.console:
+                self.console.append_to_console(
+                    f"Time View ({self.model_name}): Paused, history available for the last {span[1] - span[0]:.0f} s")
+        else:
+            self.pause_button.setText("⏸ Pause")
+            for ch in range(len(self.needs_refresh)):
+                self.needs_refresh[ch] = True
+            self.refresh_plots()
+
+    def load_history_range(self, ch):
+        """While paused, feed plot ``ch`` the stored history for its visible time range."""
+        if not self.is_paused or self.history is None or ch >= len(self.plot_widgets):
+            return
+        try:
+            x_min, x_max = self.plot_widgets[ch].getPlotItem().getViewBox().viewRange()[0]
+            width = x_max - x_min
+            times, data = self.history.query(x_min - width, x_max + width, channel=ch)
+            self.decimators[ch].set_data(times, data)
+        except Exception as e:
+            self.log_and_set_status(f"Error loading Time View history: {str(e)}")
+
     def toggle_settings(self):
         self.settings_panel.setVisible(not self.settings_panel.isVisible())
         self.settings_button.setVisible(not self.settings_panel.isVisible())
@@ -293,22 +353,8 @@ class TimeViewFeature:
         if new_fifo_window_samples == self.fifo_window_samples:
             logging.debug("No change in window size, skipping update")
             return
-        current_time = time.time()
-        time_step = 1.0 / self.sample_rate
+        self.fifo.resize(new_fifo_window_samples)
         for i in range(self.num_plots):
-            current_data = self.fifo_data[i]
-            current_times = self.fifo_times[i]
-            current_length = len(current_data)
-            new_data = np.zeros(new_fifo_window_samples)
-            new_times = np.array([current_time - (new_fifo_window_samples - 1 - j) * time_step for j in range(new_fifo_window_samples)])
-            
-            if current_length > 0:
-                copy_length = min(current_length, new_fifo_window_samples)
-                new_data[-copy_length:] = current_data[-copy_length:]
-                new_times[-copy_length:] = current_times[-copy_length:] if len(current_times) >= copy_length else new_times[-copy_length:]
-            
-            self.fifo_data[i] = new_data
-            self.fifo_times[i] = new_times
             self.needs_refresh[i] = True
         self.fifo_window_samples = new_fifo_window_samples
         logging.debug(f"Updated FIFO buffers to {self.window_seconds} seconds, {self.fifo_window_samples} samples")
@@ -361,7 +407,7 @@ class TimeViewFeature:
         except AttributeError:
             logging.warning("No sub_tool_bar found to refresh filenames")
 
-    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index):
+    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index, record=None):
         logging.debug(f"on_data_received called with tag_name={tag_name}, model_name={model_name}, "
                      f"values_len={len(values) if values else 0}, sample_rate={sample_rate}, frame_index={frame_index}")
         if self.model_name != model_name:
@@ -387,53 +433,20 @@ class TimeViewFeature:
                 self.log_and_set_status(f"Channel data length mismatch: expected {self.samples_per_channel} samples")
                 return
 
-            if not self.fifo_data or len(self.fifo_data) != self.total_channels or not self.is_initialized:
+            if self.fifo is None or self.fifo.channels != self.total_channels or not self.is_initialized:
                 self.num_plots = self.total_channels
                 self.initialize_plots()
+            elif self.fifo.sample_rate != sample_rate:
+                self.initialize_buffers()
+            if self.fifo is None:
+                return
 
-            current_time = time.time()
-            time_step = 1.0 / sample_rate
-            new_times = np.array([current_time - (self.samples_per_channel - 1 - i) * time_step for i in range(self.samples_per_channel)])
-
-            for ch in range(self.main_channels):
-                new_data = np.array(values[ch]) * self.scaling_factor
-                if len(self.fifo_data[ch]) != self.fifo_window_samples:
-                    self.fifo_data[ch] = np.zeros(self.fifo_window_samples)
-                    self.fifo_times[ch] = np.array([current_time - (self.fifo_window_samples - 1 - j) * time_step for j in range(self.fifo_window_samples)])
-                self.fifo_data[ch] = np.roll(self.fifo_data[ch], -self.samples_per_channel)
-                self.fifo_data[ch][-self.samples_per_channel:] = new_data
-                self.fifo_times[ch] = np.roll(self.fifo_times[ch], -self.samples_per_channel)
-                self.fifo_times[ch][-self.samples_per_channel:] = new_times
-                self.needs_refresh[ch] = True
-
-            if self.tacho_channels_count >= 1 and self.main_channels < len(values):
-                new_data = np.array(values[self.main_channels]) / 100
-                if len(self.fifo_data[self.main_channels]) != self.fifo_window_samples:
-                    self.fifo_data[self.main_channels] = np.zeros(self.fifo_window_samples)
-                    self.fifo_times[self.main_channels] = np.array([current_time - (self.fifo_window_samples - 1 - j) * time_step for j in range(self.fifo_window_samples)])
-                self.fifo_data[self.main_channels] = np.roll(self.fifo_data[self.main_channels], -self.samples_per_channel)
-                self.fifo_data[self.main_channels][-self.samples_per_channel:] = new_data
-                self.fifo_times[self.main_channels] = np.roll(self.fifo_times[self.main_channels], -self.samples_per_channel)
-                self.fifo_times[self.main_channels][-self.samples_per_channel:] = new_times
-                self.needs_refresh[self.main_channels] = True
-
-            if self.tacho_channels_count >= 2 and self.main_channels + 1 < len(values):
-                new_data = np.array(values[self.main_channels + 1])
-                if len(self.fifo_data[self.main_channels + 1]) != self.fifo_window_samples:
-                    self.fifo_data[self.main_channels + 1] = np.zeros(self.fifo_window_samples)
-                    self.fifo_times[self.main_channels + 1] = np.array([current_time - (self.fifo_window_samples - 1 - j) * time_step for j in range(self.fifo_window_samples)])
-                self.fifo_data[self.main_channels + 1] = np.roll(self.fifo_data[self.main_channels + 1], -self.samples_per_channel)
-                self.fifo_data[self.main_channels + 1][-self.samples_per_channel:] = new_data
-                self.fifo_times[self.main_channels + 1] = np.roll(self.fifo_times[self.main_channels + 1], -self.samples_per_channel)
-                self.fifo_times[self.main_channels + 1][-self.samples_per_channel:] = new_times
-                self.needs_refresh[self.main_channels + 1] = True
-
+            frame = np.asarray(values[:self.total_channels], dtype=np.float64)
+            frame *= self.channel_scales[:, np.newaxis]
+            self.fifo.append(frame, time.time())
+            self.history.append(frame, self.fifo.end_time)
             for ch in range(self.total_channels):
-                if len(self.fifo_times[ch]) > 1:
-                    sort_indices = np.argsort(self.fifo_times[ch])
-                    self.fifo_times[ch] = self.fifo_times[ch][sort_indices]
-                    self.fifo_data[ch] = self.fifo_data[ch][sort_indices]
-                    self.needs_refresh[ch] = True
+                self.needs_refresh[ch] = True
 
             if self.is_saving:
                 try:
@@ -469,38 +482,24 @@ class TimeViewFeature:
     def refresh_plots(self):
         try:
             if not self.is_initialized or self.fifo_window_samples is None or not self.plot_widgets or \
-               not self.plots or not self.fifo_data or not self.fifo_times:
+               not self.plots or self.fifo is None:
                 logging.warning("Skipping plot refresh: Plots or buffers not initialized")
                 self.log_and_set_status("Cannot refresh plots: Initialization incomplete")
                 return
 
-            current_time = time.time()
+            if self.is_paused or len(self.fifo) == 0:
+                return
+            times = self.fifo.times()
+            data = self.fifo.view()
+            current_time = times[-1]
             window_start_time = current_time - self.window_seconds
 
             for ch in range(self.num_plots):
                 if not self.needs_refresh[ch]:
                     continue
 
-                times = self.fifo_times[ch]
-                data = self.fifo_data[ch]
-                if len(data) == 0 or len(times) == 0:
-                    self.log_and_set_status(f"No data for plot {ch}, data_len={len(data)}, times_len={len(times)}")
-                    continue
-
-                if len(times) < self.fifo_window_samples:
-                    self.log_and_set_status(f"Insufficient time data for plot {ch}: {len(times)} < {self.fifo_window_samples}")
-                    continue
-
-                mask = (times >= window_start_time) & (times <= current_time)
-                filtered_times = times[mask]
-                filtered_data = data[mask]
-
-                if len(filtered_times) == 0:
-                    self.log_and_set_status(f"No data within window for plot {ch}")
-                    continue
-
-                self.plots[ch].setData(filtered_times, filtered_data)
                 self.plot_widgets[ch].setXRange(window_start_time, current_time, padding=0.02)
+                self.decimators[ch].set_data(times, data[ch])
                 if ch < self.main_channels:
                     self.plot_widgets[ch].enableAutoRange(axis='y')
                 elif ch == self.main_channels:
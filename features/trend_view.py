@@ -4,6 +4,9 @@ import pyqtgraph as pg
 import numpy as np
 import logging
 from datetime import datetime
+from processing.tacho import debounced_edges
+from processing.harmonics import revolution_peak_to_peak
+from processing.trend_buffer import TrendBuffer
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -26,7 +29,8 @@ class TrendViewFeature:
         self.channel_name = channel
         self.channel = self.resolve_channel_index(channel) if channel is not None else None
         self.sample_rate = None
-        self.plot_data = []
+        self.max_history_points = 1048576
+        self.trend = TrendBuffer(1, 4096)
         self.user_interacted = False
         self.last_right_limit = None
         self.last_frame_index = -1
@@ -114,7 +118,7 @@ class TrendViewFeature:
     def get_widget(self):
         return self.widget
 
-    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index):
+    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index, record=None):
         if self.model_name != model_name or self.channel is None:
             return
 
@@ -143,12 +147,11 @@ class TrendViewFeature:
             channel_data = np.array(values[channel_idx], dtype=np.float32) * self.scaling_factor
             trigger_data = np.array(values[-1], dtype=np.float32) if len(values) >= 2 else np.zeros_like(channel_data)
 
-            trigger_indices = np.where(trigger_data == 1)[0].tolist()
-            min_distance_between_triggers = 5
-            filtered_trigger_indices = [trigger_indices[0]] if trigger_indices else []
-            for i in range(1, len(trigger_indices)):
-                if trigger_indices[i] - filtered_trigger_indices[-1] >= min_distance_between_triggers:
-                    filtered_trigger_indices.append(trigger_indices[i])
+            tacho = record.tacho if record is not None else None
+            if tacho is not None and tacho.length == len(channel_data):
+                filtered_trigger_indices = tacho.edges.tolist()
+            else:
+                filtered_trigger_indices = debounced_edges(trigger_data).tolist()
 
             if len(filtered_trigger_indices) < 2:
                 logging.warning(f"Not enough trigger points detected, frame {frame_index}")
@@ -156,29 +159,18 @@ class TrendViewFeature:
                     self.console.append_to_console(f"Not enough trigger points detected, frame {frame_index}")
                 return
 
-            direct_values = []
-            for i in range(len(filtered_trigger_indices) - 1):
-                start_idx = filtered_trigger_indices[i]
-                end_idx = filtered_trigger_indices[i + 1]
-                if end_idx <= start_idx:
-                    continue
-                segment_data = channel_data[start_idx:end_idx]
-                if len(segment_data) == 0:
-                    continue
-                peak_to_peak = segment_data.max() - segment_data.min()
-                direct_values.append(peak_to_peak)
-
-            if not direct_values:
+            direct_values = revolution_peak_to_peak(channel_data, filtered_trigger_indices)[0]
+
+            if direct_values.size == 0:
                 logging.warning(f"No valid segments for peak-to-peak calculation, frame {frame_index}")
                 if self.console:
                     self.console.append_to_console(f"No valid segments for calculation, frame {frame_index}")
                 return
 
-            direct_average = np.mean(direct_values)
+            direct_average = float(np.mean(direct_values))
             timestamp = datetime.now().timestamp()
-            self.plot_data.append((timestamp, direct_average))
-
-            self.trim_old_data()
+            self.trim_old_data(timestamp)
+            self.trend.append(timestamp, direct_average)
 
             logging.debug(f"Processed TrendView for {tag_name}, Channel {self.channel_name or self.channel}: Direct value {direct_average:.4f} at {datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')}, frame {frame_index}")
             if self.console:
@@ -189,31 +181,34 @@ class TrendViewFeature:
             if self.console:
                 self.console.append_to_console(f"Data processing error for channel {self.channel_name or self.channel}, frame {frame_index}: {e}")
 
-    def trim_old_data(self):
-        now = datetime.now().timestamp()
-        self.plot_data = [(t, v) for t, v in self.plot_data if (now - t) <= self.display_window_seconds]
+    def trim_old_data(self, now=None):
+        """Make room for one more point: the ring overwrites its oldest point, and only grows
+        (amortised doubling) while that point is still inside the display window."""
+        now = datetime.now().timestamp() if now is None else now
+        self.trend.make_room(now - self.display_window_seconds, self.max_history_points)
 
     def update_plot(self):
-        if not self.plot_data:
+        if len(self.trend) == 0:
             return
 
-        timestamps, voltages = zip(*self.plot_data)
-        timestamps = np.array(timestamps)
-        voltages = np.array(voltages)
         now = datetime.now().timestamp()
+        latest = self.trend.last_time()
 
         if self.user_interacted and self.last_right_limit is not None:
             max_time = self.last_right_limit
             min_time = max_time - self.display_window_seconds
-            if abs(max_time - timestamps.max()) < 1.0:
+            if abs(max_time - latest) < 1.0:
                 self.user_interacted = False
                 min_time = now - self.display_window_seconds
                 max_time = now
         else:
             max_time = now
             min_time = max_time - self.display_window_seconds
-            if len(timestamps) > 0 and (timestamps.max() - timestamps.min()) < self.display_window_seconds:
-                min_time = timestamps.min()
+
+        timestamps, values = self.trend.window(min_time, max_time)
+        voltages = values[0]
+        if not self.user_interacted and len(timestamps) > 0 and (latest - timestamps[0]) < self.display_window_seconds:
+            min_time = timestamps[0]
 
         plot_width = self.plot_widget.width() or 600
         total_span = max_time - min_time
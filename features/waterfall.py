@@ -1,14 +1,97 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea, QDialog, QComboBox
+from PyQt5.QtCore import QRectF, QThread, QObject, pyqtSignal, QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 from matplotlib.figure import Figure
+import pyqtgraph as pg
 import numpy as np
 import math
 import logging
 from datetime import datetime
+from processing.ring_buffer import RingBuffer
+from processing.spectrum import frequency_axis
+from processing.stft import StreamingWelch
+from processing.spectrogram_tiles import SpectrogramTileBuilder, decode_tile, level_for_span, uniform_edges, TILE_LEVELS, TILE_LINES
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# (project, model) pairs whose recordings were already scanned for tiling this session.
+_tiled_models = set()
+
+class SpectrogramTileWorker(QObject):
+    finished = pyqtSignal()
+    error = pyqtSignal(str)
+    progress = pyqtSignal(str)
+
+    def __init__(self, db, project_name, model_name, frequency_range, segment_overlap, page_frames=100):
+        super().__init__()
+        self.db = db
+        self.project_name = project_name
+        self.model_name = model_name
+        self.frequency_range = frequency_range
+        self.segment_overlap = segment_overlap
+        self.page_frames = page_frames
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            progress = self.db.get_spectrogram_tile_progress(self.project_name, self.model_name, TILE_LEVELS[-1], TILE_LINES)
+            for filename in self.db.get_distinct_filenames(self.project_name, self.model_name):
+                if self.cancelled:
+                    break
+                last_frame = self.db.get_timeview_last_frame_index(self.project_name, self.model_name, filename)
+                tiled = progress.get(filename)
+                if last_frame is None or (tiled is not None and tiled["frameEnd"] >= last_frame):
+                    continue
+                # Recordings still being written when they were last tiled resume after their last full coarse tile.
+                count = self.build_recording(filename, tiled["complete"] if tiled else None)
+                if count:
+                    self.progress.emit(f"Built {count} spectrogram tiles for {filename}")
+        except Exception as e:
+            self.error.emit(f"Error building spectrogram tiles: {str(e)}")
+        finally:
+            self.finished.emit()
+
+    def build_recording(self, filename, resume=None):
+        """Tile ``filename`` from the start, or after ``resume`` = [tileIndex, frameEnd] of its last full coarse tile."""
+        builder = None
+        count = 0
+        next_frame = None
+        start_line = 0
+        if resume:
+            next_frame = resume[1] + 1
+            start_line = (resume[0] + 1) * TILE_LEVELS[-1] * TILE_LINES
+        scaling_factor = 3.3 / 65535.0
+        while not self.cancelled:
+            frames = self.db.get_timeview_frames(self.project_name, self.model_name, filename,
+                                                 frame_start=next_frame, limit=self.page_frames)
+            if not frames:
+                break
+            for frame in frames:
+                channel_data = frame["message"]["channel_data"]
+                if not channel_data or not channel_data[0]:
+                    continue
+                if builder is None:
+                    sample_rate = float(frame.get("samplingRate") or 4096)
+                    nperseg = 2 ** math.ceil(math.log2(len(channel_data[0])))
+                    builder = SpectrogramTileBuilder(len(channel_data), sample_rate, nperseg, self.segment_overlap,
+                                                     "Hanning", self.frequency_range, start_line=start_line)
+                if len(channel_data) != builder.channels:
+                    continue
+                tiles = builder.add_frame(frame["frameIndex"], np.asarray(channel_data, dtype=np.float64) * scaling_factor)
+                if tiles:
+                    self.db.save_spectrogram_tiles(self.project_name, self.model_name, filename, tiles)
+                    count += len(tiles)
+            next_frame = frames[-1]["frameIndex"] + 1
+        if builder is not None and not self.cancelled:
+            tiles = builder.flush()
+            self.db.save_spectrogram_tiles(self.project_name, self.model_name, filename, tiles)
+            count += len(tiles)
+        return count
+
 class WaterfallFeature:
     def __init__(self, parent, db, project_name, channel=None, model_name=None, console=None, channel_count=None):
         self.parent = parent
@@ -26,16 +109,40 @@ class WaterfallFeature:
             if self.console:
                 self.console.append_to_console(f"Invalid channel_count {channel_count}: {str(e)}. Using {self.channel_count} from database.")
             logging.error(f"Invalid channel_count {channel_count}: {str(e)}. Using {self.channel_count} from database.")
-        self.max_lines = 1
-        self.data_history = [[] for _ in range(self.channel_count)]
-        self.phase_history = [[] for _ in range(self.channel_count)]
+        self.max_lines = 30
+        self.history_lines = 300
+        self.max_bins = 1600
+        self.dynamic_range_db = 80.0
+        self.rings = [None] * self.channel_count
+        self.level_peaks = [None] * self.channel_count
+        self.latest_phases = [None] * self.channel_count
+        self.frequencies = None
+        self.plot_widgets = []
+        self.image_items = []
         self.scaling_factor = 3.3 / 65535.0
         self.sample_rate = 4096
         self.samples_per_channel = 4096
         self.last_frame_index = -1
         self.frequency_range = (0, 2000)
+        self.segment_overlap = 0.5
+        self.welch = None
+        self.history_filename = None
+        self.history_max_lines = 600
+        self.tile_worker = None
+        self.tile_thread = None
+        self.history_timer = QTimer()
+        self.history_timer.setSingleShot(True)
+        self.history_timer.timeout.connect(self.load_history_tiles)
+        # Live lines land in the rings per frame; the images are redrawn from them at most once per interval.
+        self.render_pending = False
+        self.render_interval = 200  # ms
+        self.render_timer = QTimer()
+        self.render_timer.timeout.connect(self.render_waterfall)
+        self.render_timer.start(self.render_interval)
         self.channel_names = self.get_channel_names()
         self.initUI()
+        if (self.project_name, self.model_name) not in _tiled_models:
+            self.start_tile_builder()
         if self.console:
             self.console.append_to_console(
                 f"Initialized WaterfallFeature for {self.model_name or 'No Model'} with {self.channel_count} channels: {self.channel_names}"
@@ -80,19 +187,99 @@ class WaterfallFeature:
         self.widget = QWidget()
         layout = QVBoxLayout()
         self.widget.setLayout(layout)
-        self.figure = Figure(figsize=(8, 6))
-        self.canvas = FigureCanvas(self.figure)
-        self.ax = self.figure.add_subplot(111, projection='3d')
-        layout.addWidget(self.canvas)
-        self.toolbar = NavigationToolbar(self.canvas, self.widget)
-        layout.addWidget(self.toolbar)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Recording:"))
+        self.recording_combo = QComboBox()
+        self.recording_combo.setStyleSheet("""
+            QComboBox {
+                padding: 5px;
+                border: 1px solid #ccc;
+                border-radius: 4px;
+                min-width: 160px;
+            }
+        """)
+        self.recording_combo.addItem("Live")
+        self.recording_combo.currentTextChanged.connect(self.select_recording)
+        top_layout.addWidget(self.recording_combo)
+        self.build_tiles_button = QPushButton("Build Tiles")
+        self.build_tiles_button.setStyleSheet("""
+            QPushButton {
+                background-color: #2196F3;
+                color: white;
+                border: none;
+                padding: 8px 16px;
+                border-radius: 4px;
+                font-size: 14px;
+                min-width: 120px;
+            }
+            QPushButton:hover {
+                background-color: #1e88e5;
+            }
+            QPushButton:disabled {
+                background-color: #90caf9;
+            }
+        """)
+        self.build_tiles_button.clicked.connect(self.start_tile_builder)
+        top_layout.addWidget(self.build_tiles_button)
+        top_layout.addStretch()
+        self.snapshot_button = QPushButton("3D Snapshot")
+        self.snapshot_button.setStyleSheet("""
+            QPushButton {
+                background-color: #4CAF50;
+                color: white;
+                border: none;
+                padding: 8px 16px;
+                border-radius: 4px;
+                font-size: 14px;
+                min-width: 120px;
+            }
+            QPushButton:hover {
+                background-color: #45a049;
+            }
+            QPushButton:pressed {
+                background-color: #3d8b40;
+            }
+        """)
+        self.snapshot_button.clicked.connect(self.show_3d_snapshot)
+        top_layout.addWidget(self.snapshot_button)
+        layout.addLayout(top_layout)
+
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        layout.addWidget(self.scroll_area)
+        self.create_plots()
         if not self.model_name and self.console:
             self.console.append_to_console("No model selected in WaterfallFeature.")
 
+    def create_plots(self):
+        self.scroll_content = QWidget()
+        self.scroll_layout = QVBoxLayout(self.scroll_content)
+        self.plot_widgets = []
+        self.image_items = []
+        lookup_table = pg.colormap.get('viridis').getLookupTable(nPts=256)
+        for ch_idx in range(self.channel_count):
+            plot_widget = pg.PlotWidget()
+            plot_widget.setBackground('w')
+            plot_widget.setFixedHeight(250)
+            name = self.channel_names[ch_idx] if ch_idx < len(self.channel_names) else f"Channel_{ch_idx + 1}"
+            plot_widget.setTitle(f"Waterfall - {self.model_name or 'Unknown'} - {name}", color="black", size="12pt")
+            plot_widget.setLabel('bottom', 'Frequency (Hz)')
+            plot_widget.setLabel('left', 'Frames (newest at top)')
+            plot_widget.setYRange(0, self.history_lines, padding=0)
+            image_item = pg.ImageItem()
+            image_item.setLookupTable(lookup_table)
+            plot_widget.addItem(image_item)
+            plot_widget.sigYRangeChanged.connect(self.schedule_history_load)
+            self.plot_widgets.append(plot_widget)
+            self.image_items.append(image_item)
+            self.scroll_layout.addWidget(plot_widget)
+        self.scroll_area.setWidget(self.scroll_content)
+
     def get_widget(self):
         return self.widget
 
-    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index):
+    def on_data_received(self, tag_name, model_name, values, sample_rate, frame_index, record=None):
         if self.model_name != model_name:
             if self.console:
                 self.console.append_to_console(f"WaterfallFeature: Ignored data for model {model_name}, expected {self.model_name}, frame {frame_index}")
@@ -113,136 +300,241 @@ class WaterfallFeature:
             self.samples_per_channel = len(values[0]) if values and values[0] else 4096
             sample_count = self.samples_per_channel
             target_length = 2 ** math.ceil(math.log2(sample_count))
-            fft_magnitudes = []
-            fft_phases = []
-            frequencies = np.fft.fftfreq(target_length, 1.0 / self.sample_rate)[:target_length // 2]
-            freq_mask = (frequencies >= self.frequency_range[0]) & (frequencies <= self.frequency_range[1])
-            filtered_frequencies = frequencies[freq_mask]
+            frequencies = frequency_axis(target_length, float(self.sample_rate))[:target_length // 2]
+            if any(len(values[ch_idx]) != sample_count for ch_idx in range(self.channel_count)):
+                if self.console:
+                    self.console.append_to_console(f"Invalid data length across channels, expected {sample_count}, frame {frame_index}")
+                return
+            if self.welch is None or not self.welch.matches(self.channel_count, self.sample_rate, target_length, self.segment_overlap, "Hanning"):
+                self.welch = StreamingWelch(self.channel_count, self.sample_rate, target_length, self.segment_overlap, "Hanning")
+            spectra = self.welch.process(np.asarray(values[:self.channel_count], dtype=np.float64) * self.scaling_factor)
+            if spectra.shape[1] == 0:
+                return
+            # One waterfall line per frame: RMS average of the segments this frame completed.
+            amplitudes = self.welch.amplitude(np.mean(np.abs(spectra) ** 2, axis=1))
+            band = slice(int(np.searchsorted(frequencies, self.frequency_range[0], side='left')),
+                         int(np.searchsorted(frequencies, self.frequency_range[1], side='right')))
+            filtered_frequencies = frequencies[band]
             if len(filtered_frequencies) == 0:
                 if self.console:
                     self.console.append_to_console(f"Error: No valid frequencies in range {self.frequency_range}, frame {frame_index}")
                 return
-            for ch_idx in range(self.channel_count):
-                if len(values[ch_idx]) != self.samples_per_channel:
-                    if self.console:
-                        self.console.append_to_console(
-                            f"Invalid data length for channel {self.channel_names[ch_idx]}: got {len(values[ch_idx])}, expected {self.samples_per_channel}, frame {frame_index}"
-                        )
-                    continue
-                channel_data = np.array(values[ch_idx], dtype=np.float32) * self.scaling_factor
-                if not np.any(channel_data):
-                    if self.console:
-                        self.console.append_to_console(
-                            f"Warning: Zero data for channel {self.channel_names[ch_idx]}, frame {frame_index}"
-                        )
-                    continue
-                padded_data = np.pad(channel_data, (0, target_length - sample_count), mode='constant') if target_length > sample_count else channel_data
-                fft_result = np.fft.fft(padded_data)
-                half = target_length // 2
-                magnitudes = (2.0 / target_length) * np.abs(fft_result[:half])
-                magnitudes[0] /= 2
-                if target_length % 2 == 0:
-                    magnitudes[-1] /= 2
-                phases = np.angle(fft_result[:half], deg=True)
-                filtered_magnitudes = magnitudes[freq_mask]
-                filtered_phases = phases[freq_mask]
-                if len(filtered_frequencies) > 1600:
-                    indices = np.linspace(0, len(filtered_frequencies) - 1, 1600, dtype=int)
-                    filtered_frequencies_subset = filtered_frequencies[indices]
-                    filtered_magnitudes = filtered_magnitudes[indices]
-                    filtered_phases = filtered_phases[indices]
-                else:
-                    filtered_frequencies_subset = filtered_frequencies
-                if len(filtered_magnitudes) == 0 or len(filtered_frequencies_subset) == 0:
-                    if self.console:
-                        self.console.append_to_console(
-                            f"Error: Empty FFT data for channel {self.channel_names[ch_idx]}, frame {frame_index}"
-                        )
-                    continue
-                self.data_history[ch_idx].append(filtered_magnitudes)
-                self.phase_history[ch_idx].append(filtered_phases)
-                if len(self.data_history[ch_idx]) > self.max_lines:
-                    self.data_history[ch_idx].pop(0)
-                    self.phase_history[ch_idx].pop(0)
-                fft_magnitudes.append(filtered_magnitudes)
-                fft_phases.append(filtered_phases)
-                if self.console:
-                    self.console.append_to_console(
-                        f"WaterfallFeature: Processed FFT for channel {self.channel_names[ch_idx]}, "
-                        f"samples={len(channel_data)}, Fs={self.sample_rate}Hz, FFT points={len(filtered_magnitudes)}, frame {frame_index}"
-                    )
-            if fft_magnitudes:
-                self.update_waterfall_plot(filtered_frequencies_subset if fft_magnitudes else None)
-            else:
-                if self.console:
-                    self.console.append_to_console(f"No valid FFT data to plot, frame {frame_index}")
+            # Max-per-bin reduction to at most max_bins columns keeps a uniform frequency axis.
+            edges = uniform_edges(len(filtered_frequencies), self.max_bins)
+            rows = np.maximum.reduceat(amplitudes[:, :len(frequencies)][:, band], edges, axis=1)
+            phases = np.angle(spectra[:, -1, :len(frequencies)][:, band], deg=True)
+            self.update_waterfall_plot(filtered_frequencies[edges], rows, phases)
         except Exception as e:
             if self.console:
                 self.console.append_to_console(f"WaterfallFeature: Error processing data, frame {frame_index}: {str(e)}")
             logging.error(f"WaterfallFeature: Error processing data, frame {frame_index}: {str(e)}")
 
-    def update_waterfall_plot(self, frequencies):
+    def update_waterfall_plot(self, frequencies, rows, phases):
+        """Append one line per channel to its ring; the images are redrawn by ``render_waterfall``."""
         try:
-            self.ax.clear()
-            self.ax.set_title(f"Waterfall FFT Plot (Model: {self.model_name}, {self.channel_count} Channels)")
-            self.ax.set_xlabel("Frequency (Hz)")
-            self.ax.set_ylabel("Channel")
-            self.ax.set_zlabel("Amplitude (V)")
-            self.ax.grid(True)
+            if self.frequencies is None or len(self.frequencies) != len(frequencies) or not np.allclose(self.frequencies, frequencies):
+                self.frequencies = frequencies
+                self.rings = [None] * self.channel_count
+                self.level_peaks = [None] * self.channel_count
+            rows_db = 20.0 * np.log10(np.maximum(rows, 1e-12))
+            for ch_idx in range(min(self.channel_count, len(self.image_items))):
+                if self.rings[ch_idx] is None:
+                    self.rings[ch_idx] = RingBuffer(len(frequencies), self.history_lines, 1.0, dtype=np.float32)
+                ring = self.rings[ch_idx]
+                ring.append(rows_db[ch_idx][:, np.newaxis])
+                self.latest_phases[ch_idx] = phases[ch_idx]
+                row_peak = float(np.max(rows_db[ch_idx]))
+                peak = self.level_peaks[ch_idx]
+                # Follow new maxima at once, let the colour scale relax slowly after a transient.
+                peak = row_peak if peak is None else max(row_peak, peak - 0.2)
+                self.level_peaks[ch_idx] = peak
+            self.render_pending = True
+        except Exception as e:
+            if self.console:
+                self.console.append_to_console(f"WaterfallFeature: Error updating plot: {str(e)}")
+            logging.error(f"WaterfallFeature: Error updating plot: {str(e)}")
+
+    def render_waterfall(self):
+        """Redraw the live images from the rings if lines arrived since the last tick."""
+        if not self.render_pending or self.history_filename is not None or self.frequencies is None:
+            return
+        self.render_pending = False
+        try:
+            frequencies = self.frequencies
+            span = (frequencies[-1] - frequencies[0]) if len(frequencies) > 1 else 1.0
+            step = span / max(len(frequencies) - 1, 1)
+            for ch_idx in range(min(self.channel_count, len(self.image_items))):
+                ring = self.rings[ch_idx]
+                if ring is None or not len(ring):
+                    continue
+                peak = self.level_peaks[ch_idx]
+                self.image_items[ch_idx].setImage(ring.view(), autoLevels=False, levels=(peak - self.dynamic_range_db, peak))
+                self.image_items[ch_idx].setRect(QRectF(frequencies[0], self.history_lines - len(ring), span + step, len(ring)))
+        except Exception as e:
+            if self.console:
+                self.console.append_to_console(f"WaterfallFeature: Error updating plot: {str(e)}")
+            logging.error(f"WaterfallFeature: Error updating plot: {str(e)}")
+
+    def show_3d_snapshot(self):
+        """Render the newest max_lines spectra of every channel as the classic 3D waterfall."""
+        try:
+            if self.frequencies is None or not any(ring is not None and len(ring) for ring in self.rings):
+                if self.console:
+                    self.console.append_to_console("WaterfallFeature: No spectra captured yet for a 3D snapshot")
+                return
+            dialog = QDialog(self.widget)
+            dialog.setWindowTitle(f"Waterfall 3D Snapshot - {self.model_name}")
+            dialog_layout = QVBoxLayout(dialog)
+            figure = Figure(figsize=(8, 6))
+            canvas = FigureCanvas(figure)
+            dialog_layout.addWidget(canvas)
+            dialog_layout.addWidget(NavigationToolbar(canvas, dialog))
+            ax = figure.add_subplot(111, projection='3d')
+            ax.set_title(f"Waterfall FFT Plot (Model: {self.model_name}, {self.channel_count} Channels)")
+            ax.set_xlabel("Frequency (Hz)")
+            ax.set_ylabel("Channel")
+            ax.set_zlabel("Amplitude (V)")
+            ax.grid(True)
             colors = ['blue', 'red', 'green', 'purple', 'orange', 'cyan', 'magenta', 'yellow', 'black', 'brown']
             max_amplitude = 0
-            plotted = False
-            for ch_idx in range(self.channel_count):
-                if not self.data_history[ch_idx]:
-                    if self.console:
-                        self.console.append_to_console(f"No data to plot for channel {self.channel_names[ch_idx]}")
+            for ch_idx, ring in enumerate(self.rings):
+                if ring is None or not len(ring):
                     continue
-                num_lines = len(self.data_history[ch_idx])
-                for idx, fft_line in enumerate(self.data_history[ch_idx]):
-                    if len(fft_line) == 0:
-                        if self.console:
-                            self.console.append_to_console(f"Empty FFT data for channel {self.channel_names[ch_idx]}, line {idx}")
-                        continue
-                    x = frequencies if frequencies is not None and len(frequencies) == len(fft_line) else np.arange(len(fft_line))
-                    y = np.full_like(x, ch_idx * (self.max_lines + 2))
-                    z = fft_line
-                    self.ax.plot(x, y, z, color=colors[ch_idx % len(colors)], label=self.channel_names[ch_idx] if idx == num_lines - 1 else None)
-                    max_amplitude = max(max_amplitude, np.max(z) if len(z) > 0 else 0)
-                    plotted = True
-                    if self.console:
-                        self.console.append_to_console(
-                            f"Plotted channel {self.channel_names[ch_idx]}, FFT points={len(fft_line)}, max amplitude={np.max(z):.4f}"
-                        )
-            if not plotted:
-                if self.console:
-                    self.console.append_to_console("No valid data plotted, drawing empty plot")
-                x = np.array([0, 1])
-                y = np.array([0, 0])
-                z = np.array([0, 0])
-                self.ax.plot(x, y, z, color='gray', label='No Data')
-            self.ax.set_ylim(-1, self.channel_count * (self.max_lines + 2))
-            self.ax.set_xlim(self.frequency_range[0], self.frequency_range[1] if frequencies is not None else 1000)
-            self.ax.set_zlim(0, max_amplitude * 1.1 if max_amplitude > 0 else 1.0)
-            self.ax.legend(loc='upper right')
-            self.ax.view_init(elev=20, azim=-45)
-            self.figure.tight_layout()
-            self.canvas.draw_idle()
-            self.canvas.flush_events()
+                lines = 10.0 ** (ring.view(self.max_lines) / 20.0)
+                num_lines = lines.shape[1]
+                for idx in range(num_lines):
+                    z = lines[:, idx]
+                    y = np.full_like(self.frequencies, ch_idx * (self.max_lines + 2) + idx)
+                    ax.plot(self.frequencies, y, z, color=colors[ch_idx % len(colors)],
+                            label=self.channel_names[ch_idx] if idx == num_lines - 1 and ch_idx < len(self.channel_names) else None)
+                max_amplitude = max(max_amplitude, float(np.max(lines)))
+            ax.set_ylim(-1, self.channel_count * (self.max_lines + 2))
+            ax.set_xlim(self.frequency_range[0], self.frequency_range[1])
+            ax.set_zlim(0, max_amplitude * 1.1 if max_amplitude > 0 else 1.0)
+            ax.legend(loc='upper right')
+            ax.view_init(elev=20, azim=-45)
+            figure.tight_layout()
+            canvas.draw_idle()
+            dialog.resize(900, 700)
+            dialog.show()
+        except Exception as e:
             if self.console:
-                self.console.append_to_console(f"WaterfallFeature: Updated plot for {self.channel_count} channels, plotted={plotted}")
+                self.console.append_to_console(f"WaterfallFeature: Error creating 3D snapshot: {str(e)}")
+            logging.error(f"WaterfallFeature: Error creating 3D snapshot: {str(e)}")
+
+    def start_tile_builder(self):
+        if self.tile_thread is not None or not self.model_name:
+            return
+        _tiled_models.add((self.project_name, self.model_name))
+        self.tile_worker = SpectrogramTileWorker(self.db, self.project_name, self.model_name,
+                                                 self.frequency_range, self.segment_overlap)
+        self.tile_thread = QThread()
+        self.tile_worker.moveToThread(self.tile_thread)
+        self.tile_thread.started.connect(self.tile_worker.run)
+        self.tile_worker.finished.connect(self.tile_thread.quit)
+        self.tile_worker.finished.connect(self.tile_worker.deleteLater)
+        self.tile_thread.finished.connect(self.tile_thread.deleteLater)
+        self.tile_thread.finished.connect(self.on_tile_builder_finished)
+        self.tile_worker.progress.connect(self.log_tile_progress)
+        self.tile_worker.error.connect(self.log_tile_progress)
+        self.build_tiles_button.setEnabled(False)
+        self.tile_thread.start()
+
+    def log_tile_progress(self, message):
+        if self.console:
+            self.console.append_to_console(f"WaterfallFeature: {message}")
+        logging.info(message)
+
+    def on_tile_builder_finished(self):
+        self.tile_worker = None
+        self.tile_thread = None
+        try:
+            self.build_tiles_button.setEnabled(True)
+            self.refresh_recordings()
+        except RuntimeError:
+            pass
+
+    def refresh_recordings(self):
+        current = self.recording_combo.currentText()
+        filenames = self.db.get_tiled_filenames(self.project_name, self.model_name)
+        self.recording_combo.blockSignals(True)
+        self.recording_combo.clear()
+        self.recording_combo.addItem("Live")
+        self.recording_combo.addItems(sorted(filenames))
+        index = self.recording_combo.findText(current)
+        self.recording_combo.setCurrentIndex(index if index >= 0 else 0)
+        self.recording_combo.blockSignals(False)
+
+    def select_recording(self, filename):
+        try:
+            if not filename or filename == "Live":
+                self.history_filename = None
+                for plot_widget in self.plot_widgets:
+                    plot_widget.setLabel('left', 'Frames (newest at top)')
+                    plot_widget.setYRange(0, self.history_lines, padding=0)
+                for image_item in self.image_items:
+                    image_item.clear()
+                self.render_pending = True
+                return
+            span = self.db.get_spectrogram_tile_span(self.project_name, self.model_name, filename)
+            if span is None:
+                self.log_tile_progress(f"No spectrogram tiles found for {filename}")
+                return
+            self.history_filename = filename
+            for plot_widget in self.plot_widgets:
+                plot_widget.setLabel('left', 'Frame Index')
+                plot_widget.setYRange(span[0], span[1] + 1, padding=0)
+            self.load_history_tiles()
         except Exception as e:
+            self.log_tile_progress(f"Error selecting recording {filename}: {str(e)}")
+
+    def schedule_history_load(self):
+        if self.history_filename is not None:
+            self.history_timer.start(150)
+
+    def load_history_tiles(self):
+        """Page in the tiles of the visible frame window at the coarsest level that still fills the plot."""
+        if self.history_filename is None or not self.plot_widgets:
+            return
+        try:
+            y0, y1 = self.plot_widgets[0].viewRange()[1]
+            frame_start, frame_end = int(math.floor(y0)), int(math.ceil(y1))
+            level = level_for_span(frame_end - frame_start, self.history_max_lines)
+            tiles = self.db.get_spectrogram_tiles(self.project_name, self.model_name, self.history_filename,
+                                                  level, frame_start, frame_end)
+            if not tiles:
+                return
+            data = np.concatenate([decode_tile(tile) for tile in tiles], axis=1)
+            first = tiles[0]["frameStart"]
+            last = tiles[-1]["frameEnd"] + 1
+            width = tiles[0]["freqStep"] * tiles[0]["bins"]
+            for ch_idx in range(min(data.shape[0], len(self.image_items))):
+                channel = data[ch_idx].T
+                peak = float(np.max(channel))
+                self.image_items[ch_idx].setImage(channel, autoLevels=False, levels=(peak - self.dynamic_range_db, peak))
+                self.image_items[ch_idx].setRect(QRectF(tiles[0]["freqStart"], first, width, last - first))
             if self.console:
-                self.console.append_to_console(f"WaterfallFeature: Error updating plot: {str(e)}")
-            logging.error(f"WaterfallFeature: Error updating plot: {str(e)}")
+                self.console.append_to_console(
+                    f"WaterfallFeature: Loaded {len(tiles)} level-{level} tiles for {self.history_filename} frames {first}-{last - 1}"
+                )
+        except Exception as e:
+            self.log_tile_progress(f"Error loading spectrogram tiles: {str(e)}")
 
     def cleanup(self):
         try:
-            self.canvas.figure.clear()
-            self.canvas.deleteLater()
-            self.toolbar.deleteLater()
+            if self.tile_worker is not None:
+                self.tile_worker.cancel()
+            if self.tile_thread is not None:
+                self.tile_thread.quit()
+                self.tile_thread.wait()
+            self.history_timer.stop()
+            self.render_timer.stop()
+            for plot_widget in self.plot_widgets:
+                plot_widget.deleteLater()
             self.widget.deleteLater()
-            self.data_history = [[] for _ in range(self.channel_count)]
-            self.phase_history = [[] for _ in range(self.channel_count)]
+            self.plot_widgets = []
+            self.image_items = []
+            self.rings = [None] * self.channel_count
             if self.console:
                 self.console.append_to_console(f"WaterfallFeature: Cleaned up resources")
         except Exception as e:
@@ -265,8 +557,12 @@ class WaterfallFeature:
                             f"Channel count updated from {self.channel_count} to {new_channel_count} for model {self.model_name}"
                         )
                     self.channel_count = new_channel_count
-                    self.data_history = [self.data_history[i] if i < len(self.data_history) else [] for i in range(self.channel_count)]
-                    self.phase_history = [self.phase_history[i] if i < len(self.phase_history) else [] for i in range(self.channel_count)]
+                    self.rings = [self.rings[i] if i < len(self.rings) else None for i in range(self.channel_count)]
+                    self.level_peaks = [self.level_peaks[i] if i < len(self.level_peaks) else None for i in range(self.channel_count)]
+                    self.latest_phases = [self.latest_phases[i] if i < len(self.latest_phases) else None for i in range(self.channel_count)]
+                    self.welch = None
+                    self.create_plots()
+                    self.render_pending = True
                 if self.console:
                     self.console.append_to_console(f"Refreshed channel properties: {self.channel_count} channels: {self.channel_names}")
         except Exception as e:
@@ -7,11 +7,15 @@ from datetime import datetime
 import threading
 import queue
 from collections import defaultdict
+import numpy as np
+from processing.tacho import TachoProcessor
+from processing.frame_record import FrameRecord
+from processing.rollups import RollupRecorder, frame_overalls
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class MQTTHandler(QObject):
-    data_received = pyqtSignal(str, str, str, int, list, int, int)  # Added frame_index
+    data_received = pyqtSignal(str, str, str, int, list, int, int, object)  # Added frame_index and FrameRecord
     connection_status = pyqtSignal(str)
 
     def __init__(self, db, project_name, broker="192.168.1.238", port=1883):
@@ -29,6 +33,12 @@ class MQTTHandler(QObject):
         self.running = False
         self.channel_counts = {}
         self._channel_data_buffer = defaultdict(lambda: defaultdict(list))
+        self.tacho_processor = TachoProcessor()
+        self.rollup_recorder = RollupRecorder()
+        # Overall values and rollup writes run on their own thread so a slow database never holds up ingest.
+        self.rollup_queue = queue.Queue(maxsize=1000)
+        self.rollup_thread = None
+        self.scaling_factor = 3.3 / 65535.0
         self.feature_mapping = {
             "Tabular View": ["TabularView"],
             "Time View": ["TimeWave", "TimeReport"],
@@ -132,11 +142,13 @@ class MQTTHandler(QObject):
                     expected_channels = len(model.get("channels", []))
                     tacho_channels = 2
 
-                    for payload, _ in payloads:
+                    for payload, received_at in payloads:
                         try:
                             values = None
                             sample_rate = 1000
                             frame_index = 0
+                            main_count = expected_channels
+                            header = None
                             try:
                                 payload_str = payload.decode('utf-8')
                                 data = json.loads(payload_str)
@@ -167,6 +179,7 @@ class MQTTHandler(QObject):
                                 frame_index = (header[1] << 16) | header[0]  # Combine high and low
                                 total_values = values[100:]
                                 main_channels = header[2]
+                                main_count = main_channels
                                 sample_rate = header[3]
                                 tacho_channels_count = header[6]
                                 total_channels = main_channels + tacho_channels_count
@@ -196,6 +209,13 @@ class MQTTHandler(QObject):
                                 if tacho_trigger_data:
                                     values.append([float(v) for v in tacho_trigger_data])
 
+                            # Tacho stage: trigger edges, speed and phase reference once per frame for all views.
+                            tacho = None
+                            if len(values) > main_count + 1 and len(values[main_count + 1]) > 0:
+                                tacho = self.tacho_processor.process(tag_name, frame_index, values[main_count + 1], sample_rate)
+                            record = FrameRecord(tag_name, frame_index, sample_rate, tacho, header)
+                            self.queue_rollup(model_name, values[:main_count], tacho, header, received_at)
+
                             for feature_name, _ in self.feature_mapping.items():
                                 buffer_key = (tag_name, model_name, feature_name)
                                 if feature_name == "Multiple Trend View":
@@ -205,22 +225,17 @@ class MQTTHandler(QObject):
                                         self._channel_data_buffer[buffer_key][ch_idx].extend(values[ch_idx])
                                     if all(len(ch_data) > 0 for ch_data in self._channel_data_buffer[buffer_key][:-tacho_channels]):
                                         aggregated_values = self._channel_data_buffer[buffer_key]
-                                        self.data_received.emit(feature_name, tag_name, model_name, -1, aggregated_values, sample_rate, frame_index)
+                                        self.data_received.emit(feature_name, tag_name, model_name, -1, aggregated_values, sample_rate, frame_index, record)
                                         logging.debug(f"Emitted aggregated data for {feature_name}/{tag_name}/{model_name}: {len(aggregated_values)} channels, frame {frame_index}")
                                         self._channel_data_buffer[buffer_key] = [[] for _ in range(expected_channels + tacho_channels)]
                                 else:
-                                    if feature_name in ["Time View", "Time Report", "Tabular View"]:
-                                        self.data_received.emit(feature_name, tag_name, model_name, -1, values, sample_rate, frame_index)
+                                    if feature_name in ["Time View", "Time Report", "Tabular View", "FFT", "Waterfall", "Bode Plot", "Trend View", "Centerline", "Orbit", "Polar Plot"]:
+                                        self.data_received.emit(feature_name, tag_name, model_name, -1, values, sample_rate, frame_index, record)
                                         logging.debug(f"Emitted for {feature_name}/{tag_name}/{model_name}/all_channels: {len(values)} channels, frame {frame_index}")
-                                    elif feature_name in ["Orbit", "FFT"]:
-                                        for ch_idx in range(min(channel_count, len(values))):
-                                            channel_values = values[ch_idx] if ch_idx < len(values) else []
-                                            self.data_received.emit(feature_name, tag_name, model_name, ch_idx, channel_values, sample_rate, frame_index)
-                                            logging.debug(f"Emitted for {feature_name}/{tag_name}/{model_name}/channel_{ch_idx}: {len(channel_values)} samples, frame {frame_index}")
                                     else:
                                         for ch_idx in range(min(channel_count, len(values))):
                                             channel_values = values[ch_idx] if ch_idx < len(values) else []
-                                            self.data_received.emit(feature_name, tag_name, model_name, ch_idx, channel_values, sample_rate, frame_index)
+                                            self.data_received.emit(feature_name, tag_name, model_name, ch_idx, channel_values, sample_rate, frame_index, record)
                                             logging.debug(f"Emitted for {feature_name}/{tag_name}/{model_name}/channel_{ch_idx}: {len(channel_values)} samples, frame {frame_index}")
 
                         except Exception as e:
@@ -231,6 +246,51 @@ class MQTTHandler(QObject):
                 logging.error(f"Error in data processing loop: {str(e)}")
                 self.connection_status.emit(f"Data processing error: {str(e)}")
 
+    def queue_rollup(self, model_name, channel_values, tacho, header, received_at):
+        try:
+            self.rollup_queue.put_nowait((model_name, channel_values, tacho, header, received_at))
+        except queue.Full:
+            logging.warning(f"Rollup queue full, dropping frame for {model_name}")
+
+    def process_rollups(self):
+        """Rollup thread: fold queued frames into the rollups while running, then drain the queue and flush."""
+        while self.running:
+            try:
+                item = self.rollup_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            self.record_rollup(*item)
+        while True:
+            try:
+                item = self.rollup_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.record_rollup(*item)
+        self.flush_rollups()
+
+    def record_rollup(self, model_name, channel_values, tacho, header, received_at):
+        """Fold one frame's overall values into the per-minute/per-hour rollups used by History Plot."""
+        try:
+            data = np.asarray(channel_values, dtype=np.float64) * self.scaling_factor
+            if data.ndim != 2 or data.shape[1] == 0:
+                return
+            if tacho is not None and tacho.has_revolutions and tacho.length == data.shape[1]:
+                bounds, rpm = tacho.bounds, tacho.mean_rpm
+            else:
+                bounds, rpm = np.array([0, data.shape[1]], dtype=np.intp), None
+            # Binary frames carry the gap voltages in header words 10+, as Centerline reads them.
+            gap = header[10:10 + data.shape[0]] if header is not None and len(header) >= 10 + data.shape[0] else None
+            overalls = frame_overalls(data, bounds, rpm, gap)
+            completed = self.rollup_recorder.add(model_name, received_at.timestamp(), overalls)
+            if completed:
+                self.db.save_rollups(self.project_name, model_name, completed)
+        except Exception as e:
+            logging.error(f"Error recording rollups for {model_name}: {str(e)}")
+
+    def flush_rollups(self):
+        for model_name, rollups in self.rollup_recorder.flush().items():
+            self.db.save_rollups(self.project_name, model_name, rollups)
+
     def subscribe_to_topics(self):
         try:
             if not self.db.is_connected():
@@ -257,6 +317,8 @@ class MQTTHandler(QObject):
             self.running = True
             self.processing_thread = threading.Thread(target=self.process_data, daemon=True)
             self.processing_thread.start()
+            self.rollup_thread = threading.Thread(target=self.process_rollups, daemon=True)
+            self.rollup_thread.start()
             logging.info("MQTT client and processing thread started")
         except Exception as e:
             logging.error(f"Failed to start MQTT client: {str(e)}")
@@ -268,6 +330,9 @@ class MQTTHandler(QObject):
             if self.processing_thread:
                 self.processing_thread.join(timeout=1.0)
                 self.processing_thread = None
+            if self.rollup_thread:
+                self.rollup_thread.join(timeout=5.0)
+                self.rollup_thread = None
             if self.client:
                 self.client.loop_stop()
                 self.client.disconnect()
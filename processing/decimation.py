@@ -0,0 +1,71 @@
+import numpy as np
+
+
+def minmax_decimate(x, y, max_points):
+    """Reduce (x, y) to at most ``max_points`` samples keeping each bucket's min and max.
+
+    Samples are grouped into ``max_points // 2`` contiguous buckets; every bucket
+    contributes its minimum and maximum in their original order, so short spikes
+    survive at any zoom level.  Inputs that already fit are returned unchanged.
+    """
+    n = len(y)
+    buckets = max(1, int(max_points) // 2)
+    if n <= 2 * buckets:
+        return x, y
+    size = -(-n // buckets)
+    buckets = -(-n // size)
+    pad = buckets * size - n
+    y = np.asarray(y)
+    if pad:
+        y_blocks = np.concatenate((y, np.repeat(y[-1:], pad))).reshape(buckets, size)
+    else:
+        y_blocks = y.reshape(buckets, size)
+    base = np.arange(buckets) * size
+    i_min = base + np.argmin(y_blocks, axis=1)
+    i_max = base + np.argmax(y_blocks, axis=1)
+    idx = np.empty(2 * buckets, dtype=np.intp)
+    idx[0::2] = np.minimum(i_min, i_max)
+    idx[1::2] = np.maximum(i_min, i_max)
+    np.minimum(idx, n - 1, out=idx)
+    return np.asarray(x)[idx], y[idx]
+
+
+class ViewportDecimator:
+    """Feeds a pyqtgraph curve a min/max envelope of the samples visible in its viewbox.
+
+    The full-resolution arrays are kept by reference; on data changes, zoom, pan
+    and resize only the visible slice is decimated to about two points per pixel
+    column, so redraw cost follows the plot width instead of the data length.
+    """
+    def __init__(self, plot_widget, curve, points_per_pixel=2):
+        self.view_box = plot_widget.getPlotItem().getViewBox()
+        self.curve = curve
+        self.points_per_pixel = points_per_pixel
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.view_box.sigXRangeChanged.connect(self.update)
+        self.view_box.sigResized.connect(self.update)
+
+    def set_data(self, x, y):
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.update()
+
+    def clear(self):
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.curve.setData([], [])
+
+    def update(self, *args):
+        n = min(len(self.x), len(self.y))
+        if n == 0:
+            self.curve.setData([], [])
+            return
+        x_min, x_max = self.view_box.viewRange()[0]
+        start = max(int(np.searchsorted(self.x[:n], x_min, side='left')) - 1, 0)
+        stop = min(int(np.searchsorted(self.x[:n], x_max, side='right')) + 1, n)
+        if stop <= start:
+            start, stop = 0, n
+        width = max(int(self.view_box.width()), 100)
+        x, y = minmax_decimate(self.x[start:stop], self.y[start:stop], self.points_per_pixel * width)
+        self.curve.setData(x, y)
@@ -0,0 +1,51 @@
+from functools import lru_cache
+import numpy as np
+import scipy.signal as signal
+
+
+@lru_cache(maxsize=32)
+def fir_design(taps, cutoff, sample_rate, pass_zero=True, window='hamming'):
+    """Cached ``firwin`` design; ``cutoff`` is in Hz (a float or a (low, high) tuple)."""
+    nyquist = sample_rate / 2.0
+    normalized = tuple(c / nyquist for c in cutoff) if isinstance(cutoff, tuple) else cutoff / nyquist
+    coefficients = signal.firwin(taps, normalized, window=window, pass_zero=pass_zero)
+    coefficients.flags.writeable = False
+    return coefficients
+
+
+class FIRFilterBank:
+    """Named FIR filters run over all channels of a stream with carried state.
+
+    ``bands`` maps a name to ``(cutoff_hz, pass_zero)``.  Coefficients come
+    from :func:`fir_design`, and each filter keeps a (channels, taps - 1) ``zi``
+    so consecutive frames are filtered as one continuous signal.  The first
+    block seeds the state at its first sample's steady state, so there is no
+    start-up transient to trim.
+    """
+
+    def __init__(self, channels, sample_rate, bands, taps=31):
+        self.channels = int(channels)
+        self.sample_rate = float(sample_rate)
+        self.bands = dict(bands)
+        self.taps = int(taps)
+        self.coefficients = {name: fir_design(self.taps, cutoff, self.sample_rate, pass_zero)
+                             for name, (cutoff, pass_zero) in self.bands.items()}
+        self.reset()
+
+    def reset(self):
+        self.state = {name: None for name in self.coefficients}
+
+    def matches(self, channels, sample_rate, bands):
+        return (self.channels == int(channels) and self.sample_rate == float(sample_rate)
+                and self.bands == dict(bands))
+
+    def process(self, block):
+        """Filter a (channels, n) block; returns {name: (channels, n) filtered}."""
+        block = np.atleast_2d(np.asarray(block, dtype=np.float64))
+        outputs = {}
+        for name, b in self.coefficients.items():
+            zi = self.state[name]
+            if zi is None:
+                zi = signal.lfilter_zi(b, 1.0)[np.newaxis, :] * block[:, :1]
+            outputs[name], self.state[name] = signal.lfilter(b, 1.0, block, axis=1, zi=zi)
+        return outputs
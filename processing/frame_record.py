@@ -0,0 +1,16 @@
+class FrameRecord:
+    """Per-frame results computed once at ingest and shared by every view.
+
+    The MQTT ingest thread builds one record per frame and emits it together
+    with the frame, so a view always reads the results of the frame it was
+    given; frame indexes alone are not unique (JSON payloads default to 0 and
+    publishers restart).  ``header`` holds the 100 header words of a binary
+    frame (gap voltages start at word 10); it is None for JSON payloads.
+    """
+
+    def __init__(self, topic, frame_index, sample_rate, tacho=None, header=None):
+        self.topic = topic
+        self.frame_index = frame_index
+        self.sample_rate = sample_rate
+        self.tacho = tacho
+        self.header = header
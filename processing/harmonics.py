@@ -0,0 +1,164 @@
+import numpy as np
+from processing.tacho import debounced_edges
+
+
+def revolution_bounds(trigger, length):
+    """Revolution start indices, closed by the start of the next one.
+
+    With fewer than two trigger edges the whole frame is treated as a single
+    segment, which keeps the table alive for machines without a tacho.
+    """
+    edges = debounced_edges(trigger) if trigger is not None else np.empty(0, dtype=np.intp)
+    edges = edges[edges < length]
+    if len(edges) < 2:
+        return np.array([0, length], dtype=np.intp)
+    return edges
+
+
+def revolution_peak_to_peak(data, bounds):
+    """Peak-to-peak of every channel over every revolution: (channels, R) via max/min reduceat."""
+    data = np.atleast_2d(np.asarray(data))
+    bounds = np.asarray(bounds, dtype=np.intp)
+    if len(bounds) < 2:
+        return np.zeros((data.shape[0], 0))
+    segment = data[:, bounds[0]:bounds[-1]]
+    offsets = bounds[:-1] - bounds[0]
+    return np.maximum.reduceat(segment, offsets, axis=1) - np.minimum.reduceat(segment, offsets, axis=1)
+
+
+def harmonic_phasors(data, bounds, orders=(1, 2, 3)):
+    """Per-revolution phasors of every order for every channel in one pass.
+
+    ``data`` is (channels, samples) and ``bounds`` holds R+1 revolution
+    boundaries.  Each revolution is projected onto cos/sin of
+    ``order * 2*pi * (n - start) / length`` with ``np.add.reduceat``, so the
+    trigonometric tables are built once per frame and shared by all channels.
+    Returns complex (channels, orders, R) where ``abs`` is the 0-peak
+    amplitude and ``angle`` the phase (``arctan2(cos_sum, sin_sum)``).
+    """
+    data = np.atleast_2d(np.asarray(data, dtype=np.float64))
+    bounds = np.asarray(bounds, dtype=np.intp)
+    lengths = np.diff(bounds)
+    if len(lengths) == 0 or np.any(lengths <= 0):
+        return np.zeros((data.shape[0], len(orders), 0), dtype=np.complex128)
+    start, stop = bounds[0], bounds[-1]
+    offsets = bounds[:-1] - start
+    local = np.arange(stop - start) - np.repeat(offsets, lengths)
+    fraction = local / np.repeat(lengths, lengths)
+    angles = (2.0 * np.pi) * np.asarray(orders, dtype=np.float64)[:, np.newaxis] * fraction
+    segment = data[:, np.newaxis, start:stop]
+    cosine_sums = np.add.reduceat(segment * np.cos(angles), offsets, axis=-1)
+    sine_sums = np.add.reduceat(segment * np.sin(angles), offsets, axis=-1)
+    return (sine_sums + 1j * cosine_sums) * (2.0 / lengths)
+
+
+def amplitude_phase(phasors, axis=-1):
+    """Mean amplitude and vector-averaged phase (degrees, 0-360) over ``axis``."""
+    if phasors.shape[axis] == 0:
+        shape = np.delete(phasors.shape, axis)
+        return np.zeros(shape), np.zeros(shape)
+    amplitudes = np.mean(np.abs(phasors), axis=axis)
+    phases = np.degrees(np.angle(np.sum(phasors, axis=axis))) % 360.0
+    return amplitudes, phases
+
+
+def revolution_vectors(data, frequency, trigger, orders=(1,), bounds=None):
+    """Per-revolution mean speed and harmonic phasors of one frame.
+
+    ``bounds`` may carry revolution boundaries already found by the tacho
+    stage; otherwise they are derived from ``trigger``.  Returns
+    ``(frequencies (R,), phasors (channels, orders, R))``; a module-level
+    function so it can run in a process pool.
+    """
+    data = np.atleast_2d(np.asarray(data, dtype=np.float64))
+    frequency = np.asarray(frequency, dtype=np.float64)
+    length = min(data.shape[1], len(frequency), len(trigger) if bounds is None else data.shape[1])
+    if length == 0:
+        return np.empty(0), np.empty((data.shape[0], len(orders), 0), dtype=np.complex128)
+    if bounds is None or bounds[-1] > length:
+        bounds = revolution_bounds(None if trigger is None else np.asarray(trigger, dtype=np.float64)[:length], length)
+    phasors = harmonic_phasors(data[:, :length], bounds, orders)
+    frequencies = np.add.reduceat(frequency[bounds[0]:bounds[-1]], bounds[:-1] - bounds[0]) / np.diff(bounds)
+    return frequencies, phasors
+
+
+def batch_revolution_vectors(frames, orders=(1,)):
+    """``revolution_vectors`` over a list of (data, frequency, trigger) frames, concatenated by revolution."""
+    results = [revolution_vectors(data, frequency, trigger, orders) for data, frequency, trigger in frames]
+    if not results:
+        return np.empty(0), np.empty((0, len(orders), 0), dtype=np.complex128)
+    return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results], axis=-1)
+
+
+def smooth_edges(values, window):
+    """Centred moving average whose window shrinks at the ends (no padding bias)."""
+    values = np.asarray(values)
+    count = len(values)
+    if count == 0 or window <= 1:
+        return values
+    half = window // 2
+    cumulative = np.concatenate(([0], np.cumsum(values)))
+    index = np.arange(count)
+    low = np.maximum(index - half, 0)
+    high = np.minimum(index + half + 1, count)
+    return (cumulative[high] - cumulative[low]) / (high - low)
+
+
+class SpeedBinnedAccumulator:
+    """Running 1X vectors binned by shaft speed for run-up/coast-down plots.
+
+    Each revolution's phasor is added to the bin of its speed
+    (``round(frequency / bin_width)``); bins keep a count, an amplitude sum
+    and a phasor sum in growable arrays, so adding a frame costs
+    O(revolutions) however much history exists.  Sorting, averaging and
+    smoothing happen only when a curve is requested.
+    """
+
+    def __init__(self, bin_width=0.01, capacity=1024):
+        self.bin_width = float(bin_width)
+        self._capacity = int(capacity)
+        self.clear()
+
+    def clear(self):
+        self._slots = {}
+        self._keys = np.zeros(self._capacity, dtype=np.int64)
+        self._counts = np.zeros(self._capacity)
+        self._amplitudes = np.zeros(self._capacity)
+        self._phasors = np.zeros(self._capacity, dtype=np.complex128)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def add(self, frequencies, phasors):
+        frequencies = np.asarray(frequencies, dtype=np.float64)
+        phasors = np.asarray(phasors, dtype=np.complex128)
+        valid = np.isfinite(frequencies) & np.isfinite(phasors)
+        if not np.any(valid):
+            return
+        keys, inverse = np.unique(np.rint(frequencies[valid] / self.bin_width).astype(np.int64), return_inverse=True)
+        slots = np.array([self._slot(key) for key in keys.tolist()], dtype=np.intp)[inverse]
+        np.add.at(self._counts, slots, 1)
+        np.add.at(self._amplitudes, slots, np.abs(phasors[valid]))
+        np.add.at(self._phasors, slots, phasors[valid])
+
+    def _slot(self, key):
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._slots)
+            if slot == len(self._keys):
+                self._keys = np.concatenate((self._keys, np.zeros_like(self._keys)))
+                self._counts = np.concatenate((self._counts, np.zeros_like(self._counts)))
+                self._amplitudes = np.concatenate((self._amplitudes, np.zeros_like(self._amplitudes)))
+                self._phasors = np.concatenate((self._phasors, np.zeros_like(self._phasors)))
+            self._keys[slot] = key
+            self._slots[key] = slot
+        return slot
+
+    def curve(self, smoothing=1):
+        """Sorted (frequencies, mean amplitudes, phases in degrees 0-360), smoothed over ``smoothing`` bins."""
+        used = len(self._slots)
+        order = np.argsort(self._keys[:used])
+        counts = self._counts[order]
+        amplitudes = smooth_edges(self._amplitudes[order] / counts, smoothing)
+        phasors = smooth_edges(self._phasors[order] / counts, smoothing)
+        return self._keys[order] * self.bin_width, amplitudes, np.degrees(np.angle(phasors)) % 360.0
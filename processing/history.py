@@ -0,0 +1,110 @@
+import numpy as np
+from processing.ring_buffer import RingBuffer
+
+
+class _MinMaxTier:
+    """One coarse history level: per-bucket min and max rows stacked in a ring."""
+
+    def __init__(self, channels, sample_rate, bucket_seconds, span_seconds, dtype):
+        self.channels = channels
+        self.sample_rate = float(sample_rate)
+        self.samples_per_bucket = max(1, int(round(sample_rate * bucket_seconds)))
+        buckets = max(1, int(span_seconds * sample_rate / self.samples_per_bucket))
+        self.ring = RingBuffer(2 * channels, buckets, sample_rate / self.samples_per_bucket, dtype)
+        self.pending = np.empty((channels, 0), dtype=dtype)
+
+    def append(self, block, end_time):
+        data = np.concatenate((self.pending, block), axis=1) if self.pending.shape[1] else block
+        spb = self.samples_per_bucket
+        buckets = data.shape[1] // spb
+        used = buckets * spb
+        if buckets:
+            blocks = data[:, :used].reshape(self.channels, buckets, spb)
+            frame = np.concatenate((blocks.min(axis=2), blocks.max(axis=2)))
+            remainder = data.shape[1] - used
+            self.ring.append(frame, end_time - remainder / self.sample_rate)
+        self.pending = data[:, used:].copy()
+
+    def clear(self):
+        self.ring.clear()
+        self.pending = np.empty((self.channels, 0), dtype=self.ring.dtype)
+
+
+class TieredHistory:
+    """Memory-bounded scrollback: full-resolution recent samples plus min/max tiers.
+
+    ``full_seconds`` of raw samples are kept in a ring; every entry of ``tiers``
+    is ``(bucket_seconds, span_seconds)`` and keeps the min and max of each bucket
+    for ``span_seconds``.  Memory per channel is fixed at construction, so the
+    history can run for hours without growing.
+    """
+
+    def __init__(self, channels, sample_rate, full_seconds=60, tiers=((0.05, 600), (1.0, 3600)), dtype=np.float32):
+        self.channels = int(channels)
+        self.sample_rate = float(sample_rate)
+        self.full = RingBuffer(self.channels, int(sample_rate * full_seconds), sample_rate, dtype)
+        self.tiers = [_MinMaxTier(self.channels, sample_rate, bucket, span, dtype) for bucket, span in tiers]
+
+    def clear(self):
+        self.full.clear()
+        for tier in self.tiers:
+            tier.clear()
+
+    def append(self, block, timestamp=None):
+        """Append a (channels, n) block whose last sample was taken at ``timestamp``."""
+        block = np.asarray(block, dtype=self.full.dtype)
+        if block.shape[1] == 0:
+            return
+        self.full.append(block, timestamp)
+        for tier in self.tiers:
+            tier.append(block, self.full.end_time)
+
+    def span(self):
+        """Return (oldest, newest) timestamps held by any level, or None when empty."""
+        if not len(self.full):
+            return None
+        oldest = self._start_time(self.full)
+        for tier in self.tiers:
+            if len(tier.ring):
+                oldest = min(oldest, self._start_time(tier.ring))
+        return oldest, self.full.end_time
+
+    def query(self, t0, t1, channel=None):
+        """Return (times, data) covering [t0, t1] from the finest level that reaches back to ``t0``.
+
+        Coarse levels come back as an interleaved min/max envelope so they can be
+        drawn as a line directly.  ``data`` is (channels, n), or (n,) when
+        ``channel`` is given.
+        """
+        levels = [(self.full, False)] + [(tier.ring, True) for tier in self.tiers]
+        levels = [(ring, envelope) for ring, envelope in levels if len(ring)]
+        if not levels:
+            return np.empty(0), np.empty((self.channels, 0)) if channel is None else np.empty(0)
+        ring, envelope = levels[-1]
+        for candidate, candidate_envelope in levels:
+            if self._start_time(candidate) <= t0:
+                ring, envelope = candidate, candidate_envelope
+                break
+
+        n = len(ring)
+        step = 1.0 / ring.sample_rate
+        start = self._start_time(ring)
+        i0 = int(np.clip(np.floor((t0 - start) / step), 0, n))
+        i1 = int(np.clip(np.ceil((t1 - start) / step) + 1, i0, n))
+        times = start + np.arange(i0, i1) * step
+        data = ring.view(n)[:, i0:i1]
+        if not envelope:
+            return times, data if channel is None else data[channel]
+
+        rows = slice(None) if channel is None else slice(channel, channel + 1)
+        lows = data[:self.channels][rows]
+        highs = data[self.channels:][rows]
+        merged = np.empty((lows.shape[0], 2 * lows.shape[1]), dtype=data.dtype)
+        merged[:, 0::2] = lows
+        merged[:, 1::2] = highs
+        times = np.repeat(times, 2)
+        return times, merged if channel is None else merged[0]
+
+    @staticmethod
+    def _start_time(ring):
+        return ring.end_time - (len(ring) - 1) / ring.sample_rate
@@ -0,0 +1,59 @@
+import numpy as np
+from processing.harmonics import harmonic_phasors
+
+ORBIT_MODES = ("Averaged", "1X Filtered", "2X Filtered", "Direct")
+
+
+def revolution_average(data, bounds, points=256, revolutions=None):
+    """Synchronous average of (channels, n) data over the revolutions in ``bounds``.
+
+    Every revolution is resampled onto ``points`` equally spaced shaft angles
+    with ``np.interp``, so revolutions of slightly different length line up,
+    and the last ``revolutions`` of them (all by default) are averaged into a
+    single (channels, points) revolution.  Components that are not
+    synchronous with the shaft average out.
+    """
+    data = np.atleast_2d(np.asarray(data, dtype=np.float64))
+    bounds = np.asarray(bounds, dtype=np.intp)
+    if len(bounds) < 2:
+        return np.zeros((data.shape[0], 0))
+    if revolutions:
+        bounds = bounds[-(int(revolutions) + 1):]
+    lengths = np.diff(bounds)
+    fraction = np.arange(points) / float(points)
+    positions = bounds[:-1, np.newaxis] + lengths[:, np.newaxis] * fraction
+    samples = np.arange(data.shape[1])
+    return np.stack([np.interp(positions, samples, channel).mean(axis=0) for channel in data])
+
+
+def filtered_orbit(data, bounds, order=1, points=256):
+    """``order``-X filtered orbit: the vector-averaged harmonic of every channel redrawn over one revolution.
+
+    The phasors come from :func:`processing.harmonics.harmonic_phasors`
+    (``A * exp(j*phi)`` for a component ``A * sin(order*theta + phi)``), so
+    the filtered signal is ``Im(phasor * exp(j*order*theta))``.
+    """
+    phasors = harmonic_phasors(data, bounds, orders=(order,))[:, 0, :]
+    if phasors.shape[1] == 0:
+        return np.zeros((phasors.shape[0], 0))
+    theta = (2.0 * np.pi * order) * np.arange(points) / float(points)
+    return np.imag(phasors.mean(axis=1)[:, np.newaxis] * np.exp(1j * theta))
+
+
+def orbit_points(data, bounds, mode, points=256, revolutions=None):
+    """(2, m) orbit of a (2, n) primary/secondary block for one of ``ORBIT_MODES``.
+
+    Averaged and direct orbits are centred on their mean; the averaged one
+    is closed by repeating its first point.
+    """
+    data = np.atleast_2d(np.asarray(data, dtype=np.float64))
+    if mode == "Direct" or len(bounds) < 2:
+        return data - data.mean(axis=1, keepdims=True)
+    if mode == "1X Filtered":
+        orbit = filtered_orbit(data, bounds, 1, points)
+    elif mode == "2X Filtered":
+        orbit = filtered_orbit(data, bounds, 2, points)
+    else:
+        orbit = revolution_average(data, bounds, points, revolutions)
+        orbit -= orbit.mean(axis=1, keepdims=True)
+    return np.concatenate((orbit, orbit[:, :1]), axis=1) if orbit.shape[1] else orbit
@@ -0,0 +1,101 @@
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity multi-channel sample FIFO with an implicit sample clock.
+
+    Samples are written twice (at ``pos`` and ``pos + capacity``) so the newest
+    ``capacity`` samples always form one contiguous slice: appends cost
+    O(samples appended) and reads return views without copying or sorting.
+    """
+
+    def __init__(self, channels, capacity, sample_rate, dtype=np.float64):
+        self.channels = int(channels)
+        self.capacity = max(1, int(capacity))
+        self.sample_rate = float(sample_rate)
+        self.dtype = dtype
+        self.buffer = np.zeros((self.channels, 2 * self.capacity), dtype=dtype)
+        self.write_pos = 0
+        self.count = 0
+        self.total_written = 0
+        self.end_time = None
+        self.resync_tolerance = 0.5
+        self._offsets = (np.arange(self.capacity, dtype=np.float64) - (self.capacity - 1)) / self.sample_rate
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.write_pos = 0
+        self.count = 0
+        self.total_written = 0
+        self.end_time = None
+
+    def append(self, block, timestamp=None):
+        """Append a (channels, n) block; ``timestamp`` is the wall-clock time of its last sample."""
+        block = np.asarray(block, dtype=self.dtype)
+        if block.ndim == 1:
+            block = block[np.newaxis, :]
+        n = block.shape[1]
+        if n == 0:
+            return
+        self._advance_clock(n, timestamp)
+        self.total_written += n
+        if n > self.capacity:
+            block = block[:, -self.capacity:]
+            n = self.capacity
+        cap = self.capacity
+        pos = self.write_pos
+        first = min(n, cap - pos)
+        self.buffer[:, pos:pos + first] = block[:, :first]
+        self.buffer[:, pos + cap:pos + cap + first] = block[:, :first]
+        rest = n - first
+        if rest:
+            self.buffer[:, :rest] = block[:, first:]
+            self.buffer[:, cap:cap + rest] = block[:, first:]
+        self.write_pos = (pos + n) % cap
+        self.count = min(cap, self.count + n)
+
+    def _advance_clock(self, n, timestamp):
+        step = n / self.sample_rate
+        if self.end_time is None:
+            self.end_time = timestamp if timestamp is not None else 0.0
+            return
+        expected = self.end_time + step
+        # Follow the sample clock; only re-anchor to wall time after a gap or a long stall.
+        if timestamp is not None and abs(timestamp - expected) > max(self.resync_tolerance, step):
+            self.end_time = timestamp
+        else:
+            self.end_time = expected
+
+    def view(self, n=None):
+        """Return a contiguous (channels, n) view of the newest ``n`` samples, oldest first."""
+        n = self.count if n is None else max(0, min(int(n), self.count))
+        end = self.write_pos + self.capacity
+        return self.buffer[:, end - n:end]
+
+    def times(self, n=None):
+        """Timestamps matching ``view(n)``, derived from the sample clock."""
+        n = self.count if n is None else max(0, min(int(n), self.count))
+        if n == 0 or self.end_time is None:
+            return np.empty(0, dtype=np.float64)
+        return self.end_time + self._offsets[self.capacity - n:]
+
+    def resize(self, capacity):
+        """Change capacity, keeping the newest samples that still fit."""
+        capacity = max(1, int(capacity))
+        if capacity == self.capacity:
+            return
+        keep = self.view(min(self.count, capacity)).copy()
+        end_time = self.end_time
+        total_written = self.total_written
+        self.capacity = capacity
+        self.buffer = np.zeros((self.channels, 2 * capacity), dtype=self.dtype)
+        self._offsets = (np.arange(capacity, dtype=np.float64) - (capacity - 1)) / self.sample_rate
+        self.write_pos = 0
+        self.count = 0
+        self.end_time = None
+        if keep.shape[1]:
+            self.append(keep)
+        self.end_time = end_time
+        self.total_written = total_written
@@ -0,0 +1,149 @@
+import datetime
+import numpy as np
+from processing.harmonics import revolution_peak_to_peak, harmonic_phasors
+
+ROLLUP_INTERVALS = {"minute": 60, "hour": 3600}
+CHANNEL_METRICS = ("direct", "amp1x", "gap")
+
+
+def frame_overalls(data, bounds, rpm=None, gap=None):
+    """Overall values of one calibrated (channels, n) frame.
+
+    ``direct`` is the mean per-revolution peak-to-peak, ``amp1x``/``phase1x``
+    the vector-averaged 1X peak-to-peak amplitude and phase (degrees) and
+    ``gap`` the per-channel gap values of the frame header, or the DC level
+    when the frame has none (JSON payloads).  ``bounds`` are the revolution
+    boundaries; without a tacho they cover the whole frame and ``rpm`` stays
+    None.
+    """
+    data = np.atleast_2d(np.asarray(data, dtype=np.float64))
+    phasors = harmonic_phasors(data, bounds, orders=(1,))[:, 0, :]
+    vector = phasors.mean(axis=1) if phasors.shape[1] else np.zeros(data.shape[0], dtype=np.complex128)
+    direct = revolution_peak_to_peak(data, bounds)
+    return {
+        "direct": direct.mean(axis=1) if direct.shape[1] else np.zeros(data.shape[0]),
+        "amp1x": 2.0 * np.abs(vector),
+        "phase1x": np.degrees(np.angle(vector)) % 360.0,
+        "gap": data.mean(axis=1) if gap is None else np.asarray(gap, dtype=np.float64),
+        "rpm": None if rpm is None else float(rpm),
+    }
+
+
+class RollupRecorder:
+    """Accumulates per-frame overall values into per-minute rollup buckets.
+
+    Each channel metric keeps min/max/sum, the 1X phase keeps the sum of its
+    unit vector (so it can be averaged circularly) and RPM is kept once per
+    frame that had a tacho, with its own count.  When a frame lands in a new
+    minute, the finished minute is returned as one partial document per
+    rollup interval (its minute and its hour); they are written as
+    ``$min``/``$max``/``$inc`` upserts, so the hour buckets fill up from the
+    minutes without reading anything back.
+    """
+
+    def __init__(self, intervals=ROLLUP_INTERVALS):
+        self.intervals = dict(intervals)
+        self._buckets = {}
+
+    def add(self, key, timestamp, overalls):
+        """Record one frame for ``key`` (e.g. the model name); returns completed rollups."""
+        minute = int(timestamp // 60) * 60
+        channels = len(overalls["direct"])
+        completed = []
+        bucket = self._buckets.get(key)
+        if bucket is not None and (bucket["start"] != minute or bucket["channels"] != channels):
+            completed = self._rollups(bucket)
+            bucket = None
+        if bucket is None:
+            bucket = self._new_bucket(minute, channels)
+            self._buckets[key] = bucket
+        for name in CHANNEL_METRICS:
+            values = np.asarray(overalls[name], dtype=np.float64)
+            bucket["min"][name] = np.minimum(bucket["min"][name], values)
+            bucket["max"][name] = np.maximum(bucket["max"][name], values)
+            bucket["sum"][name] += values
+        radians = np.radians(overalls["phase1x"])
+        bucket["cos"] += np.cos(radians)
+        bucket["sin"] += np.sin(radians)
+        rpm = overalls["rpm"]
+        if rpm is not None:
+            low, high, total, frames = bucket["rpm"]
+            bucket["rpm"] = [min(low, rpm), max(high, rpm), total + rpm, frames + 1]
+        bucket["count"] += 1
+        return completed
+
+    def flush(self):
+        """Return {key: rollups} for every open bucket and forget them."""
+        completed = {key: self._rollups(bucket) for key, bucket in self._buckets.items()}
+        self._buckets.clear()
+        return completed
+
+    def _new_bucket(self, start, channels):
+        return {
+            "start": start,
+            "channels": channels,
+            "count": 0,
+            "min": {name: np.full(channels, np.inf) for name in CHANNEL_METRICS},
+            "max": {name: np.full(channels, -np.inf) for name in CHANNEL_METRICS},
+            "sum": {name: np.zeros(channels) for name in CHANNEL_METRICS},
+            "cos": np.zeros(channels),
+            "sin": np.zeros(channels),
+            "rpm": [np.inf, -np.inf, 0.0, 0],
+        }
+
+    def _rollups(self, bucket):
+        if bucket["count"] == 0:
+            return []
+        minimum = {}
+        maximum = {}
+        increment = {"count": bucket["count"]}
+        if bucket["rpm"][3]:
+            minimum["rpm.min"], maximum["rpm.max"] = bucket["rpm"][0], bucket["rpm"][1]
+            increment["rpm.sum"], increment["rpm.count"] = bucket["rpm"][2], bucket["rpm"][3]
+        for ch in range(bucket["channels"]):
+            for name in CHANNEL_METRICS:
+                minimum[f"c{ch}.{name}.min"] = float(bucket["min"][name][ch])
+                maximum[f"c{ch}.{name}.max"] = float(bucket["max"][name][ch])
+                increment[f"c{ch}.{name}.sum"] = float(bucket["sum"][name][ch])
+            increment[f"c{ch}.phase1x.cos"] = float(bucket["cos"][ch])
+            increment[f"c{ch}.phase1x.sin"] = float(bucket["sin"][ch])
+        rollups = []
+        for interval, seconds in self.intervals.items():
+            start = bucket["start"] // seconds * seconds
+            rollups.append({
+                "interval": interval,
+                "bucket": datetime.datetime.fromtimestamp(start, datetime.timezone.utc),
+                "channels": bucket["channels"],
+                "$min": minimum,
+                "$max": maximum,
+                "$inc": increment,
+            })
+        return rollups
+
+
+def rollup_series(docs, channel, metric):
+    """Turn rollup documents into (times, mean, minimum, maximum) arrays for one channel metric.
+
+    ``times`` are POSIX seconds; the 1X phase mean is circular and has no
+    min/max band, so its band collapses onto the mean.  RPM is per model,
+    ignores ``channel`` and is averaged over the frames that had a tacho.
+    """
+    count = len(docs)
+    times = np.empty(count)
+    mean = np.full(count, np.nan)
+    minimum = np.full(count, np.nan)
+    maximum = np.full(count, np.nan)
+    for i, doc in enumerate(docs):
+        times[i] = doc["bucket"].replace(tzinfo=datetime.timezone.utc).timestamp()
+        frames = doc.get("count", 0)
+        values = doc.get("rpm") if metric == "rpm" else doc.get(f"c{channel}", {}).get(metric)
+        if not frames or not values:
+            continue
+        if metric == "phase1x":
+            mean[i] = np.degrees(np.arctan2(values.get("sin", 0.0), values.get("cos", 0.0))) % 360.0
+            minimum[i] = maximum[i] = mean[i]
+        else:
+            mean[i] = values.get("sum", 0.0) / values.get("count", frames)
+            minimum[i] = values.get("min", np.nan)
+            maximum[i] = values.get("max", np.nan)
+    return times, mean, minimum, maximum
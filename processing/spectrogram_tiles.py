@@ -0,0 +1,134 @@
+import numpy as np
+from processing.stft import StreamingWelch
+
+TILE_LINES = 256
+TILE_LEVELS = (1, 8, 64)
+DB_FLOOR = -120.0
+DB_CEIL = 0.0
+
+
+def quantize_db(values_db, floor=DB_FLOOR, ceil=DB_CEIL):
+    """Map dB values onto uint8 codes 0..255 over [floor, ceil]."""
+    scaled = (np.asarray(values_db, dtype=np.float32) - floor) * (255.0 / (ceil - floor))
+    return np.clip(np.rint(scaled), 0, 255).astype(np.uint8)
+
+
+def dequantize_db(codes, floor=DB_FLOOR, ceil=DB_CEIL):
+    return np.asarray(codes, dtype=np.float32) * ((ceil - floor) / 255.0) + floor
+
+
+def decode_tile(tile):
+    """Return a stored tile's dB data as (channels, lines, bins) float32."""
+    codes = np.frombuffer(tile["data"], dtype=np.uint8)
+    codes = codes.reshape(tile["channels"], tile["lines"], tile["bins"])
+    return dequantize_db(codes, tile.get("dbFloor", DB_FLOOR), tile.get("dbCeil", DB_CEIL))
+
+
+def uniform_edges(width, max_bins):
+    """Start indices of equal groups of ``ceil(width / max_bins)`` bins, for ``np.maximum.reduceat``.
+
+    Every group but possibly the last has the same width, so the reduced
+    columns stay on a uniform frequency axis.
+    """
+    step = max(1, -(-int(width) // int(max_bins)))
+    return np.arange(0, int(width), step)
+
+
+def level_for_span(frames, max_lines, levels=TILE_LEVELS):
+    """Smallest decimation level that shows ``frames`` in at most ``max_lines`` lines."""
+    for level in levels:
+        if frames / level <= max_lines:
+            return level
+    return levels[-1]
+
+
+class SpectrogramTileBuilder:
+    """Turns a recording's frames into quantized spectrogram tiles.
+
+    Each frame becomes one spectrogram line: the RMS average of the Welch
+    segments it completed, reduced by max-per-bin to at most ``max_bins``
+    columns and converted to dB.  Lines are max-held in groups of ``level``
+    for every decimation level, and whenever a level has gathered
+    ``tile_lines`` lines a tile dict ready for storage is emitted.
+
+    ``start_line`` resumes a recording after that many finest lines; it must
+    fall on a tile boundary of the coarsest level so every level restarts
+    on a whole tile.
+    """
+
+    def __init__(self, channels, sample_rate, nperseg, overlap=0.5, window_type="Hanning",
+                 frequency_range=(0, 2000), max_bins=1024, levels=TILE_LEVELS, tile_lines=TILE_LINES, start_line=0):
+        self.channels = int(channels)
+        self.welch = StreamingWelch(channels, sample_rate, nperseg, overlap, window_type)
+        frequencies = self.welch.frequencies
+        start = int(np.searchsorted(frequencies, frequency_range[0], side='left'))
+        stop = int(np.searchsorted(frequencies, frequency_range[1], side='right'))
+        self.band = slice(start, max(stop, start + 1))
+        width = len(frequencies[self.band])
+        self.edges = uniform_edges(width, max_bins)
+        self.frequencies = frequencies[self.band][self.edges]
+        step = self.edges[1] - self.edges[0] if len(self.edges) > 1 else 1
+        self.frequency_step = float(frequencies[1] - frequencies[0]) * step
+        self.levels = tuple(levels)
+        self.tile_lines = int(tile_lines)
+        self._pending = {level: [] for level in self.levels}
+        self._lines = {level: [] for level in self.levels}
+        self._frames = {level: [] for level in self.levels}
+        self._tile_index = {level: int(start_line) // (level * self.tile_lines) for level in self.levels}
+
+    def add_frame(self, frame_index, block):
+        """Feed one (channels, n) frame in volts; return the tiles it completed."""
+        spectra = self.welch.process(block)
+        if spectra.shape[1] == 0:
+            return []
+        amplitudes = self.welch.amplitude(np.mean(np.abs(spectra) ** 2, axis=1))[:, self.band]
+        line = 20.0 * np.log10(np.maximum(np.maximum.reduceat(amplitudes, self.edges, axis=1), 1e-12))
+        tiles = []
+        for level in self.levels:
+            pending = self._pending[level]
+            pending.append((frame_index, line))
+            if len(pending) < level:
+                continue
+            self._push_line(level, pending)
+            self._pending[level] = []
+            if len(self._lines[level]) == self.tile_lines:
+                tiles.append(self._emit(level))
+        return tiles
+
+    def flush(self):
+        """Emit the partially filled tiles left at the end of a recording."""
+        tiles = []
+        for level in self.levels:
+            if self._pending[level]:
+                self._push_line(level, self._pending[level])
+                self._pending[level] = []
+            if self._lines[level]:
+                tiles.append(self._emit(level))
+        return tiles
+
+    def _push_line(self, level, pending):
+        self._lines[level].append(np.max([line for _, line in pending], axis=0))
+        self._frames[level].append((pending[0][0], pending[-1][0]))
+
+    def _emit(self, level):
+        lines = np.stack(self._lines[level], axis=1)
+        frames = self._frames[level]
+        tile = {
+            "level": level,
+            "tileIndex": self._tile_index[level],
+            "frameStart": frames[0][0],
+            "frameEnd": frames[-1][1],
+            "lineFrames": [start for start, _ in frames],
+            "channels": self.channels,
+            "lines": lines.shape[1],
+            "bins": lines.shape[2],
+            "freqStart": float(self.frequencies[0]),
+            "freqStep": self.frequency_step,
+            "dbFloor": DB_FLOOR,
+            "dbCeil": DB_CEIL,
+            "data": quantize_db(lines).tobytes(),
+        }
+        self._tile_index[level] += 1
+        self._lines[level] = []
+        self._frames[level] = []
+        return tile
@@ -0,0 +1,123 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.fft import rfft, rfftfreq
+from scipy.signal import get_window
+
+WINDOW_NAMES = {
+    "hamming": "hamming",
+    "hanning": "hann",
+    "hann": "hann",
+    "blackman": "blackman",
+    "flat-top": "flattop",
+    "flattop": "flattop",
+    "none": "boxcar",
+    "rectangular": "boxcar",
+}
+
+
+def next_pow2(n):
+    return 1 << max(0, int(np.ceil(np.log2(max(int(n), 1)))))
+
+
+@lru_cache(maxsize=32)
+def cached_window(window_type, n):
+    """Return a read-only window of length ``n`` for a settings-panel window name."""
+    name = WINDOW_NAMES.get(str(window_type).lower(), str(window_type).lower())
+    window = get_window(name, n)
+    window.setflags(write=False)
+    return window
+
+
+@lru_cache(maxsize=32)
+def frequency_axis(nfft, sample_rate):
+    freqs = rfftfreq(nfft, 1.0 / sample_rate)
+    freqs.setflags(write=False)
+    return freqs
+
+
+@lru_cache(maxsize=64)
+def band_slice(nfft, sample_rate, start_frequency, stop_frequency):
+    """Slice of rfft bins that fall inside [start_frequency, stop_frequency]."""
+    freqs = frequency_axis(nfft, sample_rate)
+    return slice(int(np.searchsorted(freqs, start_frequency, side='left')),
+                 int(np.searchsorted(freqs, stop_frequency, side='right')))
+
+
+def frame_spectrum(data, window_type, nfft=None):
+    """Windowed, zero-padded rfft along the last axis; works for one channel or (channels, n)."""
+    data = np.asarray(data)
+    n = data.shape[-1]
+    nfft = nfft or next_pow2(n)
+    return rfft(data * cached_window(window_type, n), n=nfft, axis=-1)
+
+
+def peak_indices(values, max_points):
+    """Indices of the largest value in each of at most ``max_points`` contiguous bins."""
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n)
+    size = -(-n // int(max_points))
+    rows = -(-n // size)
+    padded = np.full(rows * size, -np.inf)
+    padded[:n] = values
+    return np.arange(rows) * size + np.argmax(padded.reshape(rows, size), axis=1)
+
+
+class SpectrumAverager:
+    """Running magnitude/phase average over per-frame spectra.
+
+    ``Linear`` keeps the last ``count`` spectra in a ring with a running sum, so
+    each new frame costs one subtraction and one addition per bin.
+    ``Exponential`` keeps a single recursive average with alpha = 2 / (count + 1).
+    ``No Averaging`` simply holds the latest frame.
+    """
+
+    def __init__(self, mode="No Averaging", count=10):
+        self.mode = mode
+        self.count = max(1, int(count))
+        self.reset()
+
+    def configure(self, mode, count):
+        count = max(1, int(count))
+        if mode != self.mode or count != self.count:
+            self.mode = mode
+            self.count = count
+            self.reset()
+
+    def reset(self):
+        self.frames = 0
+        self.slot = 0
+        self.ring = None
+        self.sums = None
+        self.average = None
+
+    def add(self, spectrum, nfft):
+        """Accumulate one complex rfft; magnitudes are normalised by ``nfft``."""
+        frame = np.stack((np.abs(spectrum) / nfft, np.degrees(np.angle(spectrum))))
+        if self.average is not None and self.average.shape != frame.shape:
+            self.reset()
+        self.frames += 1
+
+        if self.mode == "Linear":
+            if self.ring is None:
+                self.ring = np.zeros((self.count,) + frame.shape)
+                self.sums = np.zeros(frame.shape)
+            self.sums += frame - self.ring[self.slot]
+            self.ring[self.slot] = frame
+            self.slot = (self.slot + 1) % self.count
+            if self.slot == 0:
+                # Re-derive the sum once per lap so rounding errors cannot accumulate.
+                self.sums = self.ring.sum(axis=0)
+            self.average = self.sums / min(self.frames, self.count)
+        elif self.mode == "Exponential" and self.average is not None:
+            alpha = 2.0 / (self.count + 1)
+            self.average += alpha * (frame - self.average)
+        else:
+            self.average = frame
+
+    def result(self):
+        """Return (magnitudes, phases) or None before the first frame."""
+        if self.average is None:
+            return None
+        return self.average[0], self.average[1]
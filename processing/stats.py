@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class RunningStats:
+    """Mean and variance over the last ``window`` samples of an array-valued stream.
+
+    Samples of a fixed ``shape`` are kept in a ring and the sum and sum of
+    squares are updated by adding the new sample and removing the one it
+    overwrites, so ``push``, ``mean`` and ``var`` are O(1) in the window
+    length.  The sums are recomputed from the ring each time it wraps so
+    floating-point drift cannot build up.
+    """
+
+    def __init__(self, shape, window=100):
+        self.shape = tuple(np.atleast_1d(shape))
+        self.window = max(1, int(window))
+        self.reset()
+
+    def reset(self):
+        self._ring = np.zeros((self.window,) + self.shape)
+        self._sum = np.zeros(self.shape)
+        self._sum_sq = np.zeros(self.shape)
+        self._slot = 0
+        self.count = 0
+
+    def push(self, values):
+        values = np.asarray(values, dtype=np.float64).reshape(self.shape)
+        old = self._ring[self._slot]
+        self._sum += values - old
+        self._sum_sq += values * values - old * old
+        self._ring[self._slot] = values
+        self._slot = (self._slot + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+        if self._slot == 0:
+            self._sum = self._ring.sum(axis=0)
+            self._sum_sq = np.square(self._ring).sum(axis=0)
+
+    def mean(self):
+        if self.count == 0:
+            return np.zeros(self.shape)
+        return self._sum / self.count
+
+    def var(self):
+        if self.count == 0:
+            return np.zeros(self.shape)
+        mean = self._sum / self.count
+        return np.maximum(self._sum_sq / self.count - mean * mean, 0.0)
+
+
+class CircularStats:
+    """Circular mean of angles in degrees over the last ``window`` samples.
+
+    Angles are averaged as unit vectors, so 359 and 1 degrees average to 0
+    rather than 180.  ``resultant`` is the mean resultant length (1 for a
+    steady phase, near 0 for a random one).
+    """
+
+    def __init__(self, shape, window=100):
+        self.cos = RunningStats(shape, window)
+        self.sin = RunningStats(shape, window)
+
+    @property
+    def count(self):
+        return self.cos.count
+
+    def reset(self):
+        self.cos.reset()
+        self.sin.reset()
+
+    def push(self, degrees):
+        radians = np.radians(np.asarray(degrees, dtype=np.float64))
+        self.cos.push(np.cos(radians))
+        self.sin.push(np.sin(radians))
+
+    def mean(self):
+        return np.degrees(np.arctan2(self.sin.mean(), self.cos.mean())) % 360.0
+
+    def resultant(self):
+        return np.hypot(self.sin.mean(), self.cos.mean())
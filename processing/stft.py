@@ -0,0 +1,96 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.fft import rfft
+from processing.spectrum import cached_window, frequency_axis
+
+
+class StreamingWelch:
+    """Overlapped, windowed STFT over a continuous multi-channel stream.
+
+    Frames are appended to a per-channel tail holding the samples that have not
+    yet completed a segment, so segments run across frame boundaries and each
+    call only touches the new samples plus at most one segment of tail.  All
+    segments completed by a call are transformed in one batched rfft, and the
+    power of the last ``averages`` segments is kept as a running sum for the
+    averaged PSD.
+    """
+
+    def __init__(self, channels, sample_rate, nperseg, overlap=0.5, window_type="Hanning", averages=1):
+        self.channels = int(channels)
+        self.sample_rate = float(sample_rate)
+        self.nperseg = int(nperseg)
+        self.overlap = min(max(float(overlap), 0.0), 0.999)
+        self.hop = max(1, int(round(self.nperseg * (1.0 - self.overlap))))
+        self.window_type = window_type
+        self.window = cached_window(window_type, self.nperseg)
+        self.averages = max(1, int(averages))
+        self.frequencies = frequency_axis(self.nperseg, self.sample_rate)
+        self.reset()
+
+    def reset(self):
+        self.tail = np.empty((self.channels, 0))
+        self.segments = 0
+        self._slot = 0
+        self._ring = np.zeros((self.averages, self.channels, len(self.frequencies)))
+        self._sum = np.zeros((self.channels, len(self.frequencies)))
+
+    def matches(self, channels, sample_rate, nperseg, overlap, window_type):
+        return (self.channels == int(channels) and self.sample_rate == float(sample_rate)
+                and self.nperseg == int(nperseg) and self.window_type == window_type
+                and self.hop == max(1, int(round(int(nperseg) * (1.0 - min(max(float(overlap), 0.0), 0.999))))))
+
+    def process(self, block):
+        """Feed a (channels, n) block; return the complex spectra of the segments it completed.
+
+        The result is (channels, segments, nperseg // 2 + 1) and may have zero segments.
+        """
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[np.newaxis, :]
+        data = np.concatenate((self.tail, block), axis=1) if self.tail.shape[1] else block
+        available = data.shape[1]
+        count = (available - self.nperseg) // self.hop + 1 if available >= self.nperseg else 0
+        if count <= 0:
+            self.tail = data.copy() if data is block else data
+            return np.empty((self.channels, 0, len(self.frequencies)), dtype=np.complex128)
+
+        segments = sliding_window_view(data, self.nperseg, axis=1)[:, :count * self.hop:self.hop]
+        spectra = rfft(segments * self.window, axis=-1)
+        self.tail = data[:, count * self.hop:].copy()
+        self._accumulate(np.abs(spectra) ** 2)
+        return spectra
+
+    def _accumulate(self, power):
+        for k in range(power.shape[1]):
+            self._sum += power[:, k] - self._ring[self._slot]
+            self._ring[self._slot] = power[:, k]
+            self._slot = (self._slot + 1) % self.averages
+            if self._slot == 0:
+                self._sum = self._ring.sum(axis=0)
+        self.segments += power.shape[1]
+
+    def mean_power(self):
+        """Mean |X|^2 over the last ``averages`` segments, or None before the first segment."""
+        if self.segments == 0:
+            return None
+        return self._sum / min(self.segments, self.averages)
+
+    def psd(self):
+        """One-sided power spectral density (units^2/Hz) averaged over the last segments."""
+        power = self.mean_power()
+        if power is None:
+            return None
+        density = power / (self.sample_rate * np.sum(self.window ** 2))
+        density[:, 1:-1 if self.nperseg % 2 == 0 else None] *= 2
+        return density
+
+    def amplitude(self, power=None):
+        """Peak amplitude spectrum from averaged (or given) power; a tone reads its amplitude."""
+        power = self.mean_power() if power is None else power
+        if power is None:
+            return None
+        amplitude = np.sqrt(power) * (2.0 / np.sum(self.window))
+        amplitude[..., 0] /= 2
+        if self.nperseg % 2 == 0:
+            amplitude[..., -1] /= 2
+        return amplitude
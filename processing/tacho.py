@@ -0,0 +1,113 @@
+import numpy as np
+
+
+def rising_edges(trigger, threshold=None):
+    """Indices where a tacho trigger channel crosses ``threshold`` upwards (mid-scale by default)."""
+    trigger = np.asarray(trigger, dtype=np.float64)
+    if trigger.size < 2:
+        return np.empty(0, dtype=np.intp)
+    low, high = trigger.min(), trigger.max()
+    if high <= low:
+        return np.empty(0, dtype=np.intp)
+    threshold = (low + high) / 2.0 if threshold is None else threshold
+    above = trigger > threshold
+    edges = np.flatnonzero(above[1:] & ~above[:-1]) + 1
+    if above[0]:
+        edges = np.concatenate(([0], edges))
+    return edges
+
+
+def debounced_edges(trigger, min_distance=5, threshold=None):
+    """Rising edges with chatter removed: an edge within ``min_distance`` samples of the previous raw edge is dropped.
+
+    A burst of closely spaced edges therefore collapses onto its first edge.
+    """
+    edges = rising_edges(trigger, threshold)
+    if len(edges) < 2 or min_distance <= 1:
+        return edges
+    keep = np.empty(len(edges), dtype=bool)
+    keep[0] = True
+    keep[1:] = np.diff(edges) >= min_distance
+    return edges[keep]
+
+
+class TachoFrame:
+    """Keyphasor results for one frame: trigger edges, per-revolution speed and phase reference.
+
+    ``edges`` are the debounced trigger indices, ``bounds`` the revolution
+    boundaries used by the harmonic kernels (the whole frame when fewer than
+    two edges were seen), and ``rpm`` holds one value per complete
+    revolution.  ``speed_hz`` is the frame's mean shaft speed; for slow
+    machines with fewer than two edges per frame it falls back to the
+    spacing between the last edge of the previous frame and the first edge
+    of this one.
+    """
+
+    def __init__(self, frame_index, sample_rate, length, edges, carried_period=None):
+        self.frame_index = frame_index
+        self.sample_rate = float(sample_rate)
+        self.length = int(length)
+        self.edges = edges
+        periods = np.diff(edges)
+        self.rpm = self.sample_rate * 60.0 / periods if len(periods) else np.empty(0)
+        if len(periods):
+            self.speed_hz = self.sample_rate / float(np.mean(periods))
+        elif carried_period:
+            self.speed_hz = self.sample_rate / float(carried_period)
+        else:
+            self.speed_hz = 0.0
+        self.bounds = edges if len(edges) >= 2 else np.array([0, self.length], dtype=np.intp)
+
+    @property
+    def has_revolutions(self):
+        return len(self.edges) >= 2
+
+    @property
+    def mean_rpm(self):
+        return self.speed_hz * 60.0
+
+    def phase_reference(self):
+        """Shaft angle in degrees (0 at each keyphasor edge) for every sample of the frame; NaN before the first edge."""
+        angles = np.full(self.length, np.nan)
+        if len(self.edges) < 2:
+            return angles
+        lengths = np.diff(self.edges)
+        start, stop = self.edges[0], self.edges[-1]
+        local = np.arange(stop - start) - np.repeat(self.edges[:-1] - start, lengths)
+        angles[start:stop] = 360.0 * local / np.repeat(lengths, lengths)
+        # Extrapolate the last revolution's speed to the samples after the final edge.
+        angles[stop:] = (360.0 * np.arange(self.length - stop) / lengths[-1]) % 360.0
+        return angles
+
+
+class TachoProcessor:
+    """Per-topic tacho stage run once per frame in the ingest thread.
+
+    It remembers how many samples followed each topic's last edge so the
+    revolution spanning two consecutive frames can still give a speed.
+    """
+
+    def __init__(self, min_distance=5):
+        self.min_distance = min_distance
+        self._tails = {}
+
+    def reset(self, topic=None):
+        if topic is None:
+            self._tails.clear()
+        else:
+            self._tails.pop(topic, None)
+
+    def process(self, topic, frame_index, trigger, sample_rate):
+        trigger = np.asarray(trigger, dtype=np.float64)
+        edges = debounced_edges(trigger, self.min_distance)
+        carried_period = None
+        previous = self._tails.get(topic)
+        if previous is not None and previous[0] == frame_index - 1 and len(edges):
+            carried_period = previous[1] + edges[0]
+        if len(edges):
+            self._tails[topic] = (frame_index, len(trigger) - edges[-1])
+        elif previous is not None and previous[0] == frame_index - 1:
+            self._tails[topic] = (frame_index, previous[1] + len(trigger))
+        else:
+            self._tails.pop(topic, None)
+        return TachoFrame(frame_index, sample_rate, len(trigger), edges, carried_period)
@@ -0,0 +1,70 @@
+import numpy as np
+from processing.ring_buffer import RingBuffer
+
+
+class TrendBuffer:
+    """Fixed-capacity columnar ring of (timestamp, one value per column) trend points.
+
+    Timestamps are stored as row 0 of a mirrored RingBuffer next to the value
+    columns, so appends are O(columns) and ``view``/``window`` return
+    contiguous arrays without copying.  Timestamps must be non-decreasing,
+    which lets ``window`` find a time range with ``searchsorted``.
+    """
+
+    def __init__(self, columns, capacity, dtype=np.float64):
+        self.columns = int(columns)
+        self.ring = RingBuffer(self.columns + 1, capacity, 1.0, dtype=dtype)
+
+    def __len__(self):
+        return len(self.ring)
+
+    @property
+    def capacity(self):
+        return self.ring.capacity
+
+    def clear(self):
+        self.ring.clear()
+
+    def resize(self, capacity):
+        """Change capacity, keeping the newest points that still fit."""
+        self.ring.resize(capacity)
+
+    def make_room(self, keep_since, max_capacity):
+        """Before an append: double capacity (up to ``max_capacity``) while the ring is full
+        and its oldest point is still at or after ``keep_since``; returns True when it grew."""
+        capacity = self.capacity
+        if len(self) < capacity or capacity >= max_capacity:
+            return False
+        if self.view(capacity)[0][0] < keep_since:
+            return False
+        self.resize(min(capacity * 2, max_capacity))
+        return True
+
+    def append(self, timestamp, values):
+        """Append one point: a timestamp and ``columns`` values."""
+        point = np.empty((self.columns + 1, 1), dtype=self.ring.dtype)
+        point[0, 0] = timestamp
+        point[1:, 0] = values
+        self.ring.append(point)
+
+    def extend(self, timestamps, values):
+        """Append n points: timestamps (n,) and values (columns, n)."""
+        timestamps = np.asarray(timestamps)
+        if timestamps.size == 0:
+            return
+        self.ring.append(np.vstack((timestamps[np.newaxis, :], np.asarray(values).reshape(self.columns, -1))))
+
+    def view(self, n=None):
+        """(timestamps, values) of the newest ``n`` points, oldest first."""
+        data = self.ring.view(n)
+        return data[0], data[1:]
+
+    def window(self, start, stop):
+        """(timestamps, values) of the points with ``start <= t <= stop``."""
+        times, values = self.view()
+        first = int(np.searchsorted(times, start, side='left'))
+        last = int(np.searchsorted(times, stop, side='right'))
+        return times[first:last], values[:, first:last]
+
+    def last_time(self):
+        return self.ring.view(1)[0, 0] if len(self.ring) else None
@@ -0,0 +1,15 @@
+"""Synthetic signals shared by the processing tests."""
+import numpy as np
+
+
+def tone(amplitude, frequency, sample_rate, samples, phase=0.0):
+    """``amplitude * sin(2*pi*frequency*t + phase)`` sampled at ``sample_rate``."""
+    return amplitude * np.sin(2.0 * np.pi * frequency * np.arange(samples) / sample_rate + phase)
+
+
+def pulse_train(length, period, offset=0, width=3):
+    """A 0/1 keyphasor trigger with a ``width``-sample pulse every ``period`` samples from ``offset``."""
+    trigger = np.zeros(length)
+    for start in range(offset, length, period):
+        trigger[start:start + width] = 1.0
+    return trigger
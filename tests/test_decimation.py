@@ -0,0 +1,31 @@
+import numpy as np
+
+from processing.decimation import minmax_decimate
+
+
+def test_short_input_is_returned_unchanged():
+    x = np.arange(10.0)
+    y = np.sin(x)
+    out_x, out_y = minmax_decimate(x, y, 20)
+    assert out_x is x and out_y is y
+
+
+def test_envelope_keeps_every_bucket_extreme_in_order(rng):
+    x = np.arange(10007, dtype=np.float64)
+    y = rng.standard_normal(len(x))
+    y[4321] = 50.0
+    y[9000] = -50.0
+    out_x, out_y = minmax_decimate(x, y, 200)
+    assert len(out_y) <= 200
+    assert np.all(np.diff(out_x) >= 0)
+    assert out_y.max() == 50.0 and out_y.min() == -50.0
+    np.testing.assert_array_equal(out_y, y[out_x.astype(int)])
+
+
+def test_buckets_match_reference_min_max():
+    # Descending data: each bucket's maximum comes first, its minimum last.
+    y = np.arange(100, dtype=np.float64)[::-1].copy()
+    _, out_y = minmax_decimate(np.arange(100.0), y, 20)
+    buckets = y.reshape(10, 10)
+    np.testing.assert_array_equal(out_y[0::2], buckets.max(axis=1))
+    np.testing.assert_array_equal(out_y[1::2], buckets.min(axis=1))
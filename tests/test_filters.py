@@ -0,0 +1,35 @@
+import numpy as np
+import scipy.signal as signal
+
+from processing.filters import FIRFilterBank, fir_design
+
+BANDS = {"low_pass": (20.0, True), "band_pass": ((50.0, 200.0), False)}
+
+
+def test_design_is_cached_and_read_only():
+    first = fir_design(31, 20.0, 1000.0)
+    assert fir_design(31, 20.0, 1000.0) is first
+    assert not first.flags.writeable
+
+
+def test_chunked_output_is_continuous(rng):
+    data = rng.standard_normal((3, 2000)) + 1.0
+    whole = FIRFilterBank(3, 1000.0, BANDS).process(data)
+    bank = FIRFilterBank(3, 1000.0, BANDS)
+    chunks = [bank.process(data[:, start:start + 250]) for start in range(0, 2000, 250)]
+    for name in BANDS:
+        np.testing.assert_allclose(np.concatenate([chunk[name] for chunk in chunks], axis=1), whole[name], atol=1e-12)
+
+
+def test_first_block_has_no_start_up_transient():
+    bank = FIRFilterBank(1, 1000.0, {"low_pass": (20.0, True)})
+    output = bank.process(np.full((1, 100), 2.0))["low_pass"]
+    np.testing.assert_allclose(output, 2.0)
+
+
+def test_matches_lfilter_with_steady_state_seed(rng):
+    data = rng.standard_normal((1, 500))
+    b = fir_design(31, (50.0, 200.0), 1000.0, False)
+    expected, _ = signal.lfilter(b, 1.0, data, axis=1, zi=signal.lfilter_zi(b, 1.0)[np.newaxis, :] * data[:, :1])
+    output = FIRFilterBank(1, 1000.0, {"band_pass": ((50.0, 200.0), False)}).process(data)["band_pass"]
+    np.testing.assert_allclose(output, expected)
@@ -0,0 +1,49 @@
+import numpy as np
+
+from processing.harmonics import harmonic_phasors, revolution_peak_to_peak
+
+
+def reference_phasors(data, bounds, orders):
+    """The per-sample loop harmonic_phasors replaced."""
+    result = np.zeros((data.shape[0], len(orders), len(bounds) - 1), dtype=np.complex128)
+    for ch in range(data.shape[0]):
+        for k, order in enumerate(orders):
+            for r in range(len(bounds) - 1):
+                start, stop = bounds[r], bounds[r + 1]
+                length = stop - start
+                cosine_sum = sine_sum = 0.0
+                for n in range(start, stop):
+                    angle = 2.0 * np.pi * order * (n - start) / length
+                    cosine_sum += data[ch, n] * np.cos(angle)
+                    sine_sum += data[ch, n] * np.sin(angle)
+                result[ch, k, r] = (sine_sum + 1j * cosine_sum) * 2.0 / length
+    return result
+
+
+def test_matches_per_sample_loop(rng):
+    data = rng.standard_normal((3, 700))
+    bounds = np.array([13, 110, 215, 318, 430, 529, 640])
+    orders = (1, 2, 3)
+    np.testing.assert_allclose(harmonic_phasors(data, bounds, orders), reference_phasors(data, bounds, orders), atol=1e-12)
+
+
+def test_tone_gives_amplitude_and_phase():
+    length, revolutions = 200, 5
+    theta = 2.0 * np.pi * np.arange(length * revolutions) / length
+    data = np.vstack((2.5 * np.sin(theta + 0.7), 1.5 * np.sin(2 * theta - 1.2)))
+    bounds = np.arange(0, length * revolutions + 1, length)
+    phasors = harmonic_phasors(data, bounds, orders=(1, 2))
+    np.testing.assert_allclose(phasors[0, 0], 2.5 * np.exp(0.7j), atol=1e-12)
+    np.testing.assert_allclose(phasors[1, 1], 1.5 * np.exp(-1.2j), atol=1e-12)
+    np.testing.assert_allclose(np.abs(phasors[0, 1]), 0.0, atol=1e-12)
+
+
+def test_degenerate_bounds_give_no_revolutions():
+    data = np.ones((2, 50))
+    assert harmonic_phasors(data, np.array([10]), orders=(1,)).shape == (2, 1, 0)
+    assert harmonic_phasors(data, np.array([10, 10, 20]), orders=(1,)).shape == (2, 1, 0)
+
+
+def test_revolution_peak_to_peak():
+    data = np.array([[0.0, 3.0, -1.0, 2.0, 5.0, 4.0, 9.0]])
+    np.testing.assert_array_equal(revolution_peak_to_peak(data, np.array([0, 3, 6])), [[4.0, 3.0]])
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from processing.history import TieredHistory
+
+SAMPLE_RATE = 100.0
+START = 100.0
+
+
+@pytest.fixture
+def history():
+    """20 s of a ramp (value = sample number) with a spike at sample 150, in 0.5 s blocks."""
+    history = TieredHistory(1, SAMPLE_RATE, full_seconds=1, tiers=((0.1, 10), (1.0, 100)), dtype=np.float64)
+    data = np.arange(2000, dtype=np.float64)
+    data[150] = 1e6
+    for start in range(0, 2000, 50):
+        history.append(data[np.newaxis, start:start + 50], timestamp=START + (start + 49) / SAMPLE_RATE)
+    return history
+
+
+def test_levels_roll_over_at_their_spans(history):
+    assert len(history.full) == 100  # 1 s of raw samples
+    assert len(history.tiers[0].ring) == 100  # 10 s of 0.1 s buckets
+    assert len(history.tiers[1].ring) == 20  # Everything, in 1 s buckets
+    oldest, newest = history.span()
+    assert newest == pytest.approx(START + 19.99)
+    assert oldest == pytest.approx(START + 0.99)  # End of the first 1 s bucket
+
+
+def test_recent_range_comes_back_at_full_resolution(history):
+    times, values = history.query(START + 19.2, START + 19.5, channel=0)
+    np.testing.assert_allclose(np.diff(times), 1.0 / SAMPLE_RATE)
+    np.testing.assert_allclose(values, np.round((times - START) * SAMPLE_RATE))
+
+
+def test_older_range_uses_finest_tier_that_reaches_back(history):
+    times, values = history.query(START + 12.0, START + 12.5, channel=0)
+    np.testing.assert_array_equal(times[0::2], times[1::2])  # Interleaved min/max envelope
+    np.testing.assert_allclose(np.diff(times[0::2]), 0.1)
+    np.testing.assert_array_equal(values[1::2] - values[0::2], 9.0)  # 10-sample buckets of a ramp
+
+
+def test_coarse_tier_keeps_bucket_min_and_max(history):
+    times, values = history.query(START, START + 3.0)
+    assert values.shape[0] == 1
+    lows, highs = values[0, 0::2], values[0, 1::2]
+    np.testing.assert_array_equal(lows[:3], [0.0, 100.0, 200.0])
+    np.testing.assert_array_equal(highs[:3], [99.0, 1e6, 299.0])
@@ -0,0 +1,42 @@
+import numpy as np
+
+from processing.ring_buffer import RingBuffer
+
+
+def test_view_is_contiguous_after_wraparound():
+    ring = RingBuffer(2, 8, 100.0)
+    samples = np.arange(2 * 21, dtype=np.float64).reshape(2, 21)
+    for start in range(0, 21, 3):
+        ring.append(samples[:, start:start + 3])
+    assert len(ring) == 8
+    assert ring.total_written == 21
+    view = ring.view()
+    assert np.shares_memory(view, ring.buffer)  # A view, not a copy
+    np.testing.assert_array_equal(view, samples[:, -8:])
+    np.testing.assert_array_equal(ring.view(3), samples[:, -3:])
+
+
+def test_block_larger_than_capacity_keeps_newest_samples():
+    ring = RingBuffer(1, 4, 10.0)
+    ring.append(np.arange(10.0))
+    np.testing.assert_array_equal(ring.view(), [[6.0, 7.0, 8.0, 9.0]])
+
+
+def test_times_follow_sample_clock_and_resync_after_gap():
+    ring = RingBuffer(1, 4, 10.0)
+    ring.append(np.zeros(2), timestamp=100.0)
+    ring.append(np.zeros(2), timestamp=100.21)
+    np.testing.assert_allclose(ring.times(), [99.9, 100.0, 100.1, 100.2])
+    ring.append(np.zeros(2), timestamp=200.0)
+    assert ring.times()[-1] == 200.0
+
+
+def test_resize_keeps_newest_samples():
+    ring = RingBuffer(1, 8, 10.0)
+    ring.append(np.arange(8.0), timestamp=5.0)
+    ring.resize(4)
+    np.testing.assert_array_equal(ring.view(), [[4.0, 5.0, 6.0, 7.0]])
+    assert ring.end_time == 5.0
+    ring.resize(16)
+    ring.append(np.array([8.0]))
+    np.testing.assert_array_equal(ring.view(), [[4.0, 5.0, 6.0, 7.0, 8.0]])
@@ -0,0 +1,75 @@
+import datetime
+
+import numpy as np
+
+from processing.rollups import RollupRecorder, frame_overalls, rollup_series
+
+
+def overalls(direct, rpm=None, phase=0.0):
+    direct = np.asarray(direct, dtype=np.float64)
+    return {"direct": direct, "amp1x": direct / 2, "phase1x": np.full(len(direct), phase),
+            "gap": direct * 0 + 1.0, "rpm": rpm}
+
+
+def test_frames_of_one_minute_share_a_bucket():
+    recorder = RollupRecorder()
+    assert recorder.add("model", 120.0, overalls([1.0, 4.0], rpm=1000.0)) == []
+    assert recorder.add("model", 179.9, overalls([3.0, 2.0], rpm=1200.0)) == []
+    completed = recorder.add("model", 180.0, overalls([5.0, 5.0]))
+    assert [rollup["interval"] for rollup in completed] == ["minute", "hour"]
+    minute, hour = completed
+    assert minute["bucket"] == datetime.datetime(1970, 1, 1, 0, 2, tzinfo=datetime.timezone.utc)
+    assert hour["bucket"] == datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+    assert minute["$min"]["c0.direct.min"] == 1.0 and minute["$max"]["c1.direct.max"] == 4.0
+    assert minute["$inc"]["c0.direct.sum"] == 4.0
+    assert minute["$inc"]["count"] == 2
+    assert minute["$inc"]["rpm.count"] == 2 and minute["$inc"]["rpm.sum"] == 2200.0
+    assert hour["$inc"] == minute["$inc"]
+
+
+def test_frames_without_tacho_leave_rpm_out():
+    recorder = RollupRecorder()
+    recorder.add("model", 60.0, overalls([1.0]))
+    minute = recorder.flush()["model"][0]
+    assert "rpm.min" not in minute["$min"] and "rpm.sum" not in minute["$inc"]
+    assert recorder.flush() == {}
+
+
+def test_keys_and_channel_count_changes_are_separate_buckets():
+    recorder = RollupRecorder()
+    recorder.add("a", 60.0, overalls([1.0]))
+    recorder.add("b", 60.0, overalls([1.0]))
+    assert len(recorder.add("a", 61.0, overalls([1.0, 2.0]))) == 2
+    assert sorted(recorder.flush()) == ["a", "b"]
+
+
+def test_series_from_merged_documents():
+    bucket = datetime.datetime(2024, 1, 1, 12, 0)
+    docs = [{"bucket": bucket, "count": 4,
+             "c0": {"direct": {"min": 1.0, "max": 3.0, "sum": 8.0}, "phase1x": {"cos": 0.0, "sin": 2.0}},
+             "rpm": {"min": 900.0, "max": 1100.0, "sum": 2000.0, "count": 2}}]
+    times, mean, minimum, maximum = rollup_series(docs, 0, "direct")
+    assert times[0] == bucket.replace(tzinfo=datetime.timezone.utc).timestamp()
+    assert (mean[0], minimum[0], maximum[0]) == (2.0, 1.0, 3.0)
+    assert rollup_series(docs, 0, "phase1x")[1][0] == 90.0
+    assert rollup_series(docs, 0, "rpm")[1][0] == 1000.0
+    assert np.isnan(rollup_series(docs, 1, "direct")[1][0])
+
+
+def test_frame_overalls_of_a_tone():
+    length = 100
+    theta = 2.0 * np.pi * np.arange(4 * length) / length
+    data = np.vstack((0.5 + 2.0 * np.sin(theta + np.pi / 2),))
+    result = frame_overalls(data, np.arange(0, 4 * length + 1, length), rpm=1500.0)
+    np.testing.assert_allclose(result["amp1x"], [4.0])
+    np.testing.assert_allclose(result["phase1x"], [90.0])
+    np.testing.assert_allclose(result["gap"], [0.5], atol=1e-12)
+    np.testing.assert_allclose(result["direct"], [4.0], rtol=1e-3)
+    assert result["rpm"] == 1500.0
+
+
+def test_frame_overalls_take_header_gap_when_given():
+    data = np.vstack((np.full(100, 0.5), np.full(100, -0.25)))
+    bounds = np.array([0, 100])
+    np.testing.assert_allclose(frame_overalls(data, bounds)["gap"], [0.5, -0.25])
+    np.testing.assert_array_equal(frame_overalls(data, bounds, gap=(812, 790))["gap"], [812.0, 790.0])
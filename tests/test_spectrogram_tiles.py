@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from processing.spectrogram_tiles import SpectrogramTileBuilder, decode_tile, dequantize_db, level_for_span, quantize_db
+from tests.signals import tone
+
+SAMPLE_RATE = 1024.0
+NPERSEG = 256
+
+
+def builder(**kwargs):
+    options = dict(frequency_range=(0, 300), levels=(1, 2), tile_lines=4)
+    options.update(kwargs)
+    return SpectrogramTileBuilder(2, SAMPLE_RATE, NPERSEG, 0.5, "Hanning", **options)
+
+
+def frames(count, start=0):
+    """(frameIndex, block) pairs of a 64 Hz, 1 V tone on channel 0 and silence on channel 1."""
+    for index in range(start, start + count):
+        block = np.zeros((2, NPERSEG))
+        block[0] = tone(1.0, 64.0, SAMPLE_RATE, NPERSEG * (index + 1))[-NPERSEG:]
+        yield index, block
+
+
+def build(tile_builder, count, start=0):
+    tiles = []
+    for index, block in frames(count, start):
+        tiles.extend(tile_builder.add_frame(index, block))
+    return tiles
+
+
+def test_tiles_are_emitted_per_level_as_they_fill():
+    tile_builder = builder()
+    tiles = build(tile_builder, 10)
+    assert [(t["level"], t["tileIndex"], t["frameStart"], t["frameEnd"]) for t in tiles] == [
+        (1, 0, 0, 3), (1, 1, 4, 7), (2, 0, 0, 7)]
+    assert tiles[2]["lineFrames"] == [0, 2, 4, 6]
+    flushed = tile_builder.flush()
+    assert [(t["level"], t["tileIndex"], t["lines"], t["frameStart"], t["frameEnd"]) for t in flushed] == [
+        (1, 2, 2, 8, 9), (2, 1, 1, 8, 9)]
+
+
+def test_tile_data_round_trips_and_shows_the_tone():
+    tile = build(builder(), 4)[0]
+    data = decode_tile(tile)
+    assert data.shape == (2, 4, tile["bins"])
+    peak = int(np.argmax(data[0, -1]))
+    assert tile["freqStart"] + peak * tile["freqStep"] == 64.0
+    assert data[0, -1, peak] == pytest.approx(0.0, abs=0.5)  # 1 V tone, within one quantization step
+    assert data[1].max() == pytest.approx(-120.0, abs=0.5)  # Silence clips at the floor
+
+
+def test_frequency_axis_of_a_uniform_band():
+    tile = build(builder(), 4)[0]
+    assert tile["freqStart"] == 0.0
+    assert tile["freqStep"] == SAMPLE_RATE / NPERSEG
+    assert tile["bins"] == int(300 // tile["freqStep"]) + 1
+
+
+def test_frequency_axis_stays_uniform_when_bins_are_merged():
+    tile_builder = builder(frequency_range=(0, 512), max_bins=50)
+    assert set(np.diff(tile_builder.edges)) == {3}  # 129 bins used to merge into uneven groups of 2 and 3
+    tile = build(tile_builder, 4)[0]
+    assert tile["freqStep"] == 3 * SAMPLE_RATE / NPERSEG
+    assert tile["bins"] == 43
+    peak = int(np.argmax(decode_tile(tile)[0, -1]))
+    assert tile["freqStart"] + peak * tile["freqStep"] <= 64.0 < tile["freqStart"] + (peak + 1) * tile["freqStep"]
+
+
+def test_quantization_and_level_choice():
+    codes = quantize_db([-200.0, -120.0, -60.0, 0.0, 10.0])
+    np.testing.assert_array_equal(codes, [0, 0, 128, 255, 255])
+    np.testing.assert_allclose(dequantize_db(codes)[2], -60.0, atol=0.5)
+    assert level_for_span(200, 256) == 1
+    assert level_for_span(2000, 256) == 8
+    assert level_for_span(10 ** 6, 256) == 64
+
+
+def test_resume_after_the_last_full_coarse_tile():
+    whole = build(builder(), 20)
+    coarse = [t for t in whole if t["level"] == 2][-1]
+    resumed = builder(start_line=(coarse["tileIndex"] + 1) * 2 * 4)
+    first = coarse["frameEnd"] + 1
+    tiles = build(resumed, 20 - first, start=first)
+    expected = [t for t in whole if t["frameStart"] >= first]
+    assert tiles and [(t["level"], t["tileIndex"], t["frameStart"], t["frameEnd"]) for t in tiles] == [
+        (t["level"], t["tileIndex"], t["frameStart"], t["frameEnd"]) for t in expected]
@@ -0,0 +1,25 @@
+import numpy as np
+
+from processing.spectrum import SpectrumAverager, frame_spectrum, peak_indices
+from tests.signals import tone
+
+
+def test_frame_spectrum_windows_and_zero_pads(rng):
+    data = rng.standard_normal((2, 48))
+    spectrum = frame_spectrum(data, "Hanning")
+    assert spectrum.shape == (2, 33)
+    np.testing.assert_allclose(spectrum, np.fft.rfft(data * np.hanning(49)[:48], n=64, axis=1))
+
+
+def test_linear_average_of_a_tone():
+    averager = SpectrumAverager("Linear", count=4)
+    for amplitude in (1.0, 2.0, 3.0, 4.0, 5.0):
+        averager.add(frame_spectrum(tone(amplitude, 8.0, 64.0, 64), "None"), 64)
+    magnitudes, _ = averager.result()
+    np.testing.assert_allclose(magnitudes[8], 3.5 / 2)  # Mean of the last four amplitudes; rfft/nfft halves a tone
+
+
+def test_peak_indices_keep_the_largest_of_each_bin():
+    values = np.array([0.0, 5.0, 1.0, 2.0, 9.0, 3.0, 4.0])
+    np.testing.assert_array_equal(peak_indices(values, 3), [1, 4, 6])
+    np.testing.assert_array_equal(peak_indices(values, 10), np.arange(7))
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from processing.stats import CircularStats, RunningStats
+
+
+def test_windowed_mean_and_variance(rng):
+    stats = RunningStats((2, 3), window=100)
+    samples = rng.normal(5.0, 2.0, size=(150, 2, 3))
+    for i, sample in enumerate(samples):
+        stats.push(sample)
+        recent = samples[max(0, i - 99):i + 1]
+        if i in (0, 49, 99, 149):
+            np.testing.assert_allclose(stats.mean(), recent.mean(axis=0))
+            np.testing.assert_allclose(stats.var(), recent.var(axis=0), atol=1e-9)
+
+
+def test_oldest_sample_is_evicted_at_the_window():
+    stats = RunningStats(1, window=100)
+    stats.push(1000.0)
+    for _ in range(99):
+        stats.push(1.0)
+    assert stats.count == 100
+    assert stats.mean()[0] == pytest.approx(10.99)
+    stats.push(1.0)  # Evicts the 1000
+    assert stats.count == 100
+    assert stats.mean()[0] == pytest.approx(1.0)
+    assert stats.var()[0] == pytest.approx(0.0, abs=1e-12)
+
+
+def test_empty_stats_are_zero():
+    stats = RunningStats(3)
+    np.testing.assert_array_equal(stats.mean(), np.zeros(3))
+    np.testing.assert_array_equal(stats.var(), np.zeros(3))
+
+
+def test_circular_mean_wraps_around_zero():
+    stats = CircularStats(2, window=100)
+    for offset in (-3.0, -1.0, 1.0, 3.0):
+        stats.push([offset % 360.0, 180.0 + offset])
+    mean = stats.mean()
+    assert min(mean[0], 360.0 - mean[0]) == pytest.approx(0.0, abs=1e-9)  # Not 180
+    assert mean[1] == pytest.approx(180.0)
+    assert stats.resultant()[0] == pytest.approx(np.mean(np.cos(np.radians([3.0, 1.0, 1.0, 3.0]))))
+
+
+def test_resultant_separates_steady_from_random_phase(rng):
+    stats = CircularStats(2, window=100)
+    for angle in rng.uniform(0.0, 360.0, size=100):
+        stats.push([359.5, angle])
+    steady, spread = stats.resultant()
+    assert steady == pytest.approx(1.0)
+    assert spread < 0.3
+    assert stats.mean()[0] == pytest.approx(359.5)
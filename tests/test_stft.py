@@ -0,0 +1,48 @@
+import numpy as np
+from scipy.signal import welch
+
+from processing.stft import StreamingWelch
+from tests.signals import tone
+
+
+def stream(welch_stage, data, sizes):
+    """Feed ``data`` in consecutive blocks of ``sizes``; returns the concatenated spectra and samples used."""
+    spectra = []
+    start = 0
+    for size in sizes:
+        spectra.append(welch_stage.process(data[:, start:start + size]))
+        start += size
+    return np.concatenate(spectra, axis=1), start
+
+
+def test_streamed_psd_matches_scipy_welch(rng):
+    sample_rate, nperseg = 1024.0, 256
+    data = rng.standard_normal((2, 4096)) + tone(1.0, 50.0, sample_rate, 4096)
+    segments = (4096 - nperseg) // (nperseg // 2) + 1
+    stage = StreamingWelch(2, sample_rate, nperseg, overlap=0.5, window_type="Hanning", averages=segments)
+    spectra, used = stream(stage, data, [300, 1000, 17, 2000, 779])
+    assert used == 4096
+    assert spectra.shape == (2, segments, nperseg // 2 + 1)
+    frequencies, expected = welch(data, sample_rate, window="hann", nperseg=nperseg, noverlap=nperseg // 2,
+                                  detrend=False, scaling="density", average="mean")
+    np.testing.assert_allclose(stage.frequencies, frequencies)
+    np.testing.assert_allclose(stage.psd(), expected, rtol=1e-10, atol=1e-14)
+
+
+def test_segments_span_frame_boundaries(rng):
+    data = rng.standard_normal((1, 1000))
+    whole = StreamingWelch(1, 1000.0, 128, overlap=0.75)
+    pieces = StreamingWelch(1, 1000.0, 128, overlap=0.75)
+    expected = whole.process(data)
+    actual, _ = stream(pieces, data, [100] * 10)
+    np.testing.assert_allclose(actual, expected)
+    np.testing.assert_array_equal(pieces.tail, whole.tail)
+
+
+def test_tone_amplitude_reads_its_peak():
+    sample_rate, nperseg = 1024.0, 1024
+    stage = StreamingWelch(1, sample_rate, nperseg, overlap=0.5, averages=4)
+    stage.process(tone(3.0, 64.0, sample_rate, 4 * nperseg))
+    amplitude = stage.amplitude()[0]
+    assert np.argmax(amplitude) == 64
+    np.testing.assert_allclose(amplitude[64], 3.0, rtol=1e-6)
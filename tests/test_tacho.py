@@ -0,0 +1,36 @@
+import numpy as np
+
+from processing.tacho import TachoProcessor, debounced_edges, rising_edges
+from tests.signals import pulse_train
+
+
+def test_rising_edges_of_pulse_train():
+    np.testing.assert_array_equal(rising_edges(pulse_train(100, 25, offset=5)), [5, 30, 55, 80])
+    assert len(rising_edges(np.ones(10))) == 0
+
+
+def test_chatter_collapses_onto_first_edge():
+    trigger = pulse_train(100, 40, offset=10, width=5)
+    trigger[12] = 0.0  # Bounce inside the first pulse
+    np.testing.assert_array_equal(rising_edges(trigger), [10, 13, 50, 90])
+    np.testing.assert_array_equal(debounced_edges(trigger, min_distance=5), [10, 50, 90])
+
+
+def test_processor_speed_and_bounds():
+    frame = TachoProcessor().process("topic", 0, pulse_train(1000, 100, offset=20), 1000.0)
+    assert frame.has_revolutions
+    np.testing.assert_array_equal(frame.bounds, np.arange(20, 1000, 100))
+    np.testing.assert_allclose(frame.rpm, 600.0)
+    assert frame.mean_rpm == 600.0
+
+
+def test_slow_shaft_speed_carried_across_frames():
+    processor = TachoProcessor()
+    processor.process("topic", 0, pulse_train(1000, 10000, offset=700), 1000.0)
+    frame = processor.process("topic", 1, pulse_train(1000, 10000, offset=500), 1000.0)
+    assert not frame.has_revolutions
+    np.testing.assert_array_equal(frame.bounds, [0, 1000])
+    assert frame.speed_hz == 1000.0 / 800.0
+    # A gap in frame indexes drops the carried tail.
+    frame = processor.process("topic", 5, pulse_train(1000, 10000, offset=500), 1000.0)
+    assert frame.speed_hz == 0.0
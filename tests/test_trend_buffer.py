@@ -0,0 +1,59 @@
+import numpy as np
+
+from processing.trend_buffer import TrendBuffer
+
+MAX_POINTS = 1048576  # TrendViewFeature.max_history_points
+
+
+def fill(trend, start):
+    """Top the ring up to capacity with one point per second from ``start``; returns the next time."""
+    missing = trend.capacity - len(trend)
+    trend.extend(start + np.arange(missing, dtype=np.float64), np.zeros((trend.columns, missing)))
+    return start + missing
+
+
+def test_capacity_doubles_up_to_the_limit_while_points_are_still_needed():
+    trend = TrendBuffer(1, 4096)
+    next_time = fill(trend, 0.0)
+    capacities = [trend.capacity]
+    while trend.make_room(-np.inf, MAX_POINTS):
+        capacities.append(trend.capacity)
+        assert trend.view()[0][0] == 0.0  # Nothing was dropped while growing
+        next_time = fill(trend, next_time)
+    assert capacities == [4096 * 2 ** i for i in range(9)]
+    assert capacities[-1] == MAX_POINTS
+    assert not trend.make_room(-np.inf, MAX_POINTS)
+    trend.append(next_time, [1.0])
+    assert len(trend) == MAX_POINTS and trend.view()[0][0] == 1.0  # Oldest point overwritten
+
+
+def test_ring_does_not_grow_once_its_oldest_point_is_stale():
+    trend = TrendBuffer(1, 8)
+    fill(trend, 0.0)
+    assert not trend.make_room(0.5, 64)
+    assert trend.capacity == 8
+    assert trend.make_room(0.0, 64)
+    assert trend.capacity == 16
+
+
+def test_window_edges_are_inclusive():
+    trend = TrendBuffer(2, 16)
+    times = np.array([0.0, 1.0, 1.0, 2.0, 3.0, 3.0, 4.0])
+    trend.extend(times, np.vstack((times * 10, -times)))
+    window_times, values = trend.window(1.0, 3.0)
+    np.testing.assert_array_equal(window_times, [1.0, 1.0, 2.0, 3.0, 3.0])
+    np.testing.assert_array_equal(values[0], window_times * 10)
+    np.testing.assert_array_equal(values[1], -window_times)
+    assert trend.window(4.5, 9.0)[0].size == 0
+    assert trend.window(-5.0, -1.0)[0].size == 0
+    np.testing.assert_array_equal(trend.window(-1.0, 0.0)[0], [0.0])
+
+
+def test_window_after_wraparound():
+    trend = TrendBuffer(1, 4)
+    for t in range(10):
+        trend.append(float(t), [t * 2.0])
+    times, values = trend.window(5.0, 8.0)
+    np.testing.assert_array_equal(times, [6.0, 7.0, 8.0])
+    np.testing.assert_array_equal(values[0], [12.0, 14.0, 16.0])
+    assert trend.last_time() == 9.0
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from processing.spectrum import frame_spectrum
+from processing.zoom_fft import ZoomFFT
+from tests.signals import tone
+
+SAMPLE_RATE = 4096.0
+
+
+def zoom():
+    return ZoomFFT(SAMPLE_RATE, 400.0, 500.0, 400, window_type="Hamming")
+
+
+def feed(stage, samples, block=1000):
+    for start in range(0, len(samples), block):
+        stage.process(samples[start:start + block])
+
+
+def test_band_centre_and_decimation():
+    stage = zoom()
+    assert stage.center == 450.0
+    assert stage.decimation == 32  # Largest factor keeping 1.25x the 100 Hz span
+    assert stage.output_rate == 128.0
+    assert stage.nfft == 512  # 400 lines over the span, rounded up to a power of two
+    assert stage.frequencies[stage.nfft // 2] == 450.0
+    np.testing.assert_allclose(np.diff(stage.frequencies), 0.25)
+
+
+def test_tone_in_band_reads_full_band_amplitude():
+    stage = zoom()
+    samples = tone(2.0, 440.0, SAMPLE_RATE, stage.nfft * stage.decimation + 4096)
+    feed(stage, samples)
+    assert stage.ready
+    frequencies, spectra = stage.spectrum()
+    magnitudes = np.abs(spectra[0])
+    peak = int(np.argmax(magnitudes))
+    assert frequencies[peak] == 440.0
+    # Same window and normalisation as the full-band view: the tone reads the same on both.
+    full_band = np.abs(frame_spectrum(samples[-4096:], "Hamming", 4096)) / 4096
+    assert magnitudes[peak] == pytest.approx(full_band[440], rel=0.01)
+    assert magnitudes[peak] == pytest.approx(1.0 * np.hamming(512).mean(), rel=0.01)
+
+
+def test_output_does_not_depend_on_block_size():
+    samples = tone(1.0, 470.0, SAMPLE_RATE, 20000) + tone(0.5, 1200.0, SAMPLE_RATE, 20000)
+    whole, pieces = zoom(), zoom()
+    whole.process(samples)
+    feed(pieces, samples, block=777)
+    np.testing.assert_allclose(pieces.ring.view(), whole.ring.view(), atol=1e-12)
+
+
+def test_out_of_band_tone_is_rejected():
+    stage = zoom()
+    feed(stage, tone(1.0, 1200.0, SAMPLE_RATE, stage.nfft * stage.decimation + 4096))
+    assert np.abs(stage.spectrum()[1]).max() < 1e-3